@@ -0,0 +1,10 @@
+"""
+Código compartilhado entre as tarefas de roteamento (tarefa_4 e tarefa_5).
+
+- metricas: contador de consultas e nós assentados pelos algoritmos de rota
+- emissoes: leitura incremental dos CSVs do CodeCarbon, normalização pelas
+  métricas de roteamento e gráficos comparativos
+
+Os scripts das tarefas rodam de dentro das suas pastas; para importar este
+pacote eles colocam a raiz do repositório no sys.path.
+"""
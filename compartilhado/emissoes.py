@@ -0,0 +1,352 @@
+"""
+Análise das emissões registradas pelo CodeCarbon (substitui os antigos
+tarefa_4/emissions_plot.py e tarefa_5/codecarbon_plot.py).
+
+Cada CSV da pasta é uma série de execuções de um algoritmo (o CodeCarbon
+acrescenta uma linha por execução). Os agregados de cada arquivo ficam em
+cache junto aos CSVs e só são recalculados quando o arquivo muda; se ele
+apenas cresceu, só as linhas novas são lidas. Com o JSON de métricas de
+roteamento (compartilhado.metricas) as emissões e a energia são normalizadas
+por consulta e por nó assentado.
+
+Uso:
+$ python -m compartilhado.emissoes tarefa_5/pegada_de_carbono
+$ python -m compartilhado.emissoes tarefa_4/emissions --saida comparativo.png --sem-janela
+"""
+
+import io
+import os
+import glob
+import json
+import argparse
+
+from compartilhado.metricas import carregar_metricas
+
+EMISSIONS_SCALE = 1000    # kg → g
+ENERGY_SCALE    = 1000    # kWh → Wh
+
+# Colunas lidas dos CSVs: as somadas e as que entram como média
+COLUNAS_SOMA = ['emissions', 'energy_consumed', 'duration']
+COLUNAS_MEDIA = ['cpu_power', 'ram_power']
+ARQUIVO_CACHE = '.agregados_emissoes.json'
+ARQUIVO_METRICAS = 'metricas.json'
+
+
+def _ler_parcial(caminho, inicio, cabecalho):
+    # Lê só as colunas usadas, a partir do byte `inicio` (0 = arquivo inteiro)
+    import pandas as pd
+
+    colunas = set(COLUNAS_SOMA + COLUNAS_MEDIA)
+    if inicio == 0:
+        return pd.read_csv(caminho, usecols=lambda c: c in colunas)
+    with open(caminho, encoding='utf-8') as f:
+        f.seek(inicio)
+        resto = f.read()
+    return pd.read_csv(io.StringIO(cabecalho + resto), usecols=lambda c: c in colunas)
+
+
+def _agregar(df):
+    somas = {c: float(df[c].sum()) if c in df.columns else 0.0 for c in COLUNAS_SOMA}
+    medias = {c: [float(df[c].sum()), int(df[c].count())] if c in df.columns else [0.0, 0]
+              for c in COLUNAS_MEDIA}
+    return {'linhas': len(df), 'somas': somas, 'medias': medias}
+
+
+def _somar_agregados(a, b):
+    return {
+        'linhas': a['linhas'] + b['linhas'],
+        'somas': {c: a['somas'][c] + b['somas'][c] for c in COLUNAS_SOMA},
+        'medias': {c: [a['medias'][c][0] + b['medias'][c][0], a['medias'][c][1] + b['medias'][c][1]]
+                   for c in COLUNAS_MEDIA},
+    }
+
+
+# Função para ler os CSVs de uma pasta de forma incremental
+def ingerir_csvs(folder_path, usar_cache=True):
+    """
+    Agrega cada CSV do CodeCarbon da pasta (somas de emissões, energia e
+    duração; médias das potências de CPU e RAM).
+
+    O cache guarda, por arquivo, o mtime, o tamanho em bytes, o cabeçalho e os
+    agregados. Arquivo com o mesmo mtime e tamanho não é lido; arquivo que só
+    cresceu (mesmo cabeçalho) tem apenas os bytes novos lidos.
+
+    Retorna:
+    - DataFrame indexado pelo nome do CSV (sem .csv), ou None se não houver CSVs
+    """
+    import pandas as pd
+
+    csv_files = sorted(glob.glob(os.path.join(folder_path, "*.csv")))
+    if not csv_files:
+        print("Nenhum CSV encontrado em:", os.path.abspath(folder_path))
+        return None
+
+    arquivo_cache = os.path.join(folder_path, ARQUIVO_CACHE)
+    cache = {}
+    if usar_cache and os.path.exists(arquivo_cache):
+        with open(arquivo_cache, encoding='utf-8') as f:
+            cache = json.load(f)
+
+    linhas, labels, novo_cache = [], [], {}
+    lidos = reaproveitados = 0
+    for file_path in csv_files:
+        nome = os.path.basename(file_path)
+        try:
+            estado = os.stat(file_path)
+            with open(file_path, encoding='utf-8') as f:
+                cabecalho = f.readline()
+            anterior = cache.get(nome)
+
+            if anterior and anterior['mtime'] == estado.st_mtime and anterior['tamanho'] == estado.st_size:
+                agregados = anterior['agregados']
+                reaproveitados += 1
+            elif anterior and anterior['cabecalho'] == cabecalho and estado.st_size > anterior['tamanho']:
+                # O CodeCarbon só acrescenta linhas: lê apenas o que veio depois
+                novos = _agregar(_ler_parcial(file_path, anterior['tamanho'], cabecalho))
+                agregados = _somar_agregados(anterior['agregados'], novos)
+                lidos += 1
+                print(f"Processado (incremental, +{novos['linhas']} linhas): {nome}")
+            else:
+                agregados = _agregar(_ler_parcial(file_path, 0, cabecalho))
+                lidos += 1
+                print(f"Processado: {nome}")
+        except Exception as e:
+            print(f"Erro ao processar {file_path}: {e}")
+            continue
+
+        novo_cache[nome] = {'mtime': estado.st_mtime, 'tamanho': estado.st_size,
+                            'cabecalho': cabecalho, 'agregados': agregados}
+        metrics = dict(agregados['somas'])
+        for c in COLUNAS_MEDIA:
+            soma, contagem = agregados['medias'][c]
+            metrics[c] = soma / contagem if contagem else 0.0
+        metrics['execucoes'] = agregados['linhas']
+        linhas.append(metrics)
+        labels.append(nome[:-len('.csv')])
+
+    if usar_cache and novo_cache != cache:
+        with open(arquivo_cache, 'w', encoding='utf-8') as f:
+            json.dump(novo_cache, f, indent=2)
+    print(f"{lidos} CSV(s) lidos, {reaproveitados} reaproveitados do cache")
+
+    comparison_df = pd.DataFrame(linhas, index=labels)
+    # Remove “None” como nome de índice
+    comparison_df.index.name = ''
+    return comparison_df
+
+
+# Função para normalizar emissões e energia pelo trabalho de roteamento
+def normalizar_por_trabalho(df, metricas):
+    """
+    Acrescenta ao DataFrame de ingerir_csvs as colunas consultas,
+    nos_assentados e, em kg/kWh, emissions_por_consulta,
+    energy_por_consulta, emissions_por_no e energy_por_no. Algoritmos sem
+    métricas (ex.: osmnx) ficam com NaN.
+
+    Parâmetros:
+    - metricas: dicionário {nome_csv: {consultas, nos_assentados, ...}} ou o
+      caminho do JSON salvo por Metricas.salvar
+    """
+    import numpy as np
+
+    if isinstance(metricas, str):
+        metricas = carregar_metricas(metricas)
+    df = df.copy()
+    df['consultas'] = [metricas.get(nome, {}).get('consultas', np.nan) for nome in df.index]
+    df['nos_assentados'] = [metricas.get(nome, {}).get('nos_assentados', np.nan) for nome in df.index]
+
+    consultas = df['consultas'].where(df['consultas'] > 0)
+    nos = df['nos_assentados'].where(df['nos_assentados'] > 0)
+    for coluna in ('emissions', 'energy_consumed'):
+        prefixo = coluna.split('_')[0]
+        df[f'{prefixo}_por_consulta'] = df[coluna] / consultas
+        df[f'{prefixo}_por_no'] = df[coluna] / nos
+    return df
+
+
+# Função para ordenar os algoritmos pela eficiência por unidade de trabalho
+def ranking_eficiencia(df, coluna='energy_por_no'):
+    """Imprime e retorna os algoritmos com métricas, do mais ao menos eficiente."""
+    if coluna not in df.columns:
+        return df.iloc[0:0]
+    ranking = df[df[coluna].notna()].sort_values(coluna)
+    print(f"\n=== RANKING DE EFICIÊNCIA ({coluna}) ===")
+    for posicao, (nome, linha) in enumerate(ranking.iterrows(), 1):
+        print(f"{posicao}. {nome}: {linha['energy_por_consulta'] * 1e6:.3f} mWh/consulta, "
+              f"{linha['energy_por_no'] * 1e12:.3f} mWh/milhão de nós, "
+              f"{linha['emissions_por_no'] * 1e12:.3f} mg CO2/milhão de nós "
+              f"({int(linha['consultas'])} consultas, {int(linha['nos_assentados'])} nós)")
+    return ranking
+
+
+def annotate_bars(ax, fmt="{:.2f}", pad=3, scale=1.10):
+    # seleciona apenas barras com altura > 0
+    bars = [b for b in ax.patches if b.get_height() > 0]
+    if not bars:
+        return
+    heights = [b.get_height() for b in bars]
+    ax.set_ylim(0, max(heights) * scale)
+    for bar in bars:
+        h = bar.get_height()
+        ax.annotate(
+            fmt.format(h),
+            xy=(bar.get_x() + bar.get_width() / 2, h),
+            xytext=(0, pad), textcoords='offset points',
+            ha='center', va='bottom'
+        )
+
+
+def _estilo():
+    import matplotlib as mpl
+    import seaborn as sns
+
+    mpl.rcParams['font.family'] = 'sans-serif'
+    mpl.rcParams['font.sans-serif'] = ['DejaVu Sans']
+    sns.set(style="whitegrid")
+
+
+def _finalizar_figura(plt, mostrar, arquivo_saida):
+    plt.tight_layout()
+    plt.subplots_adjust(top=0.90)
+    if arquivo_saida:
+        plt.savefig(arquivo_saida, dpi=150)
+        print(f"Figura salva em '{arquivo_saida}'")
+    if mostrar:
+        plt.show()
+    else:
+        plt.close()
+
+
+def plot_comparisons(df, mostrar=True, arquivo_saida=None):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # cria colunas escaladas
+    df = df.copy()
+    df['emissions_g'] = df['emissions'] * EMISSIONS_SCALE
+    df['energy_Wh']   = df['energy_consumed'] * ENERGY_SCALE
+
+    _estilo()
+    fig, axs = plt.subplots(2, 2, figsize=(14, 12), gridspec_kw={'hspace': 0.5})
+    fig.suptitle('Comparativo de Emissão de Carbono e Consumo de Energia', fontsize=16)
+
+    # 1. Emissões de Carbono (g CO₂eq)
+    sns.barplot(x=df.index, y='emissions_g', data=df, hue=df.index, palette='viridis', legend=False, ax=axs[0,0])
+    axs[0,0].set_title('Emissões de Carbono (g CO2)')
+    axs[0,0].set_ylabel('Emissões (g CO2)')
+    axs[0,0].set_xlabel('')
+    annotate_bars(axs[0,0])
+
+    # 2. Consumo de Energia (Wh)
+    sns.barplot(x=df.index, y='energy_Wh', data=df, hue=df.index, palette='viridis', legend=False, ax=axs[0,1])
+    axs[0,1].set_title('Consumo de Energia (Wh)')
+    axs[0,1].set_ylabel('Energia (Wh)')
+    axs[0,1].set_xlabel('')
+    annotate_bars(axs[0,1])
+
+    # 3. Duração da Execução (s)
+    sns.barplot(x=df.index, y='duration', data=df, hue=df.index, palette='viridis', legend=False, ax=axs[1,0])
+    axs[1,0].set_title('Duração da Execução (s)')
+    axs[1,0].set_ylabel('Duração (s)')
+    axs[1,0].set_xlabel('')
+    annotate_bars(axs[1,0])
+
+    # 4. Consumo de Potência por Componente (sem zeros)
+    power_data = (
+        df[['cpu_power','ram_power']]
+        .melt(ignore_index=False, var_name='Componente', value_name='Potência (W)')
+        .reset_index().rename(columns={'index': ''})
+    )
+    # Filtra para remover quaisquer valores zero
+    power_data = power_data[power_data['Potência (W)'] > 0]
+
+    sns.barplot(x='', y='Potência (W)', hue='Componente', data=power_data, ax=axs[1,1])
+    axs[1,1].set_title('Consumo de Potência por Componente (W)')
+    axs[1,1].set_ylabel('Potência (W)')
+    axs[1,1].set_xlabel('')
+    axs[1,1].legend(title='Componente')
+    annotate_bars(axs[1,1])
+
+    _finalizar_figura(plt, mostrar, arquivo_saida)
+
+
+# Função para plotar emissões e energia por consulta e por milhão de nós assentados
+def plotar_eficiencia(df, mostrar=True, arquivo_saida=None):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    df = df[df['energy_por_no'].notna()].copy()
+    if df.empty:
+        print("Nenhum CSV com métricas de roteamento: gráfico de eficiência não gerado")
+        return
+    df['emissoes_consulta'] = df['emissions_por_consulta'] * 1e6   # kg → mg
+    df['energia_consulta'] = df['energy_por_consulta'] * 1e6       # kWh → mWh
+    df['emissoes_no'] = df['emissions_por_no'] * 1e12              # kg/nó → mg/milhão de nós
+    df['energia_no'] = df['energy_por_no'] * 1e12                  # kWh/nó → mWh/milhão de nós
+
+    _estilo()
+    fig, axs = plt.subplots(2, 2, figsize=(14, 12), gridspec_kw={'hspace': 0.5})
+    fig.suptitle('Eficiência por Unidade de Trabalho de Roteamento', fontsize=16)
+
+    paineis = [
+        ('emissoes_consulta', 'Emissões por Consulta (mg CO2)'),
+        ('energia_consulta', 'Energia por Consulta (mWh)'),
+        ('emissoes_no', 'Emissões por Milhão de Nós Assentados (mg CO2)'),
+        ('energia_no', 'Energia por Milhão de Nós Assentados (mWh)'),
+    ]
+    for ax, (coluna, titulo) in zip(axs.ravel(), paineis):
+        sns.barplot(x=df.index, y=coluna, data=df, hue=df.index, palette='viridis', legend=False, ax=ax)
+        ax.set_title(titulo)
+        ax.set_ylabel(titulo.split(' (')[1].rstrip(')'))
+        ax.set_xlabel('')
+        annotate_bars(ax, fmt="{:.3g}")
+
+    _finalizar_figura(plt, mostrar, arquivo_saida)
+
+
+def analyze_codecarbon_data(folder_path, metricas=None, mostrar=True, arquivo_saida=None, usar_cache=True):
+    """
+    Lê os CSVs da pasta, normaliza pelas métricas de roteamento (padrão:
+    metricas.json na mesma pasta) e gera os gráficos comparativos.
+
+    Parâmetros:
+    - arquivo_saida: PNG do comparativo; o de eficiência recebe o sufixo
+      _eficiencia
+
+    Retorna:
+    - DataFrame com os agregados e as colunas normalizadas
+    """
+    print(f"Analisando dados em: {os.path.abspath(folder_path)}")
+    df = ingerir_csvs(folder_path, usar_cache=usar_cache)
+    if df is None:
+        return None
+
+    if metricas is None:
+        metricas = os.path.join(folder_path, ARQUIVO_METRICAS)
+    df = normalizar_por_trabalho(df, metricas)
+    ranking_eficiencia(df)
+
+    plot_comparisons(df, mostrar=mostrar, arquivo_saida=arquivo_saida)
+    saida_eficiencia = None
+    if arquivo_saida:
+        raiz, extensao = os.path.splitext(arquivo_saida)
+        saida_eficiencia = f"{raiz}_eficiencia{extensao or '.png'}"
+    plotar_eficiencia(df, mostrar=mostrar, arquivo_saida=saida_eficiencia)
+    return df
+
+
+def main(argv=None, pasta_padrao=None):
+    parser = argparse.ArgumentParser(description="Comparativo de emissões do CodeCarbon por algoritmo.")
+    parser.add_argument("pasta", nargs="?" if pasta_padrao else None, default=pasta_padrao,
+                        help="Pasta com os CSVs do CodeCarbon")
+    parser.add_argument("--metricas", help="JSON de métricas de roteamento (padrão: <pasta>/metricas.json)")
+    parser.add_argument("--saida", help="Salva os gráficos em PNG")
+    parser.add_argument("--sem-janela", action="store_true", help="Não abre as janelas dos gráficos")
+    parser.add_argument("--sem-cache", action="store_true", help="Relê todos os CSVs")
+    args = parser.parse_args(argv)
+    return analyze_codecarbon_data(args.pasta, metricas=args.metricas, mostrar=not args.sem_janela,
+                                   arquivo_saida=args.saida, usar_cache=not args.sem_cache)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import os
+import json
+
+
+class Metricas:
+    """
+    Contador do trabalho feito pelos algoritmos de rota: consultas (buscas de
+    caminho iniciadas) e nós assentados (retirados definitivamente da
+    fronteira). Serve para normalizar energia e emissões por unidade de
+    trabalho em vez de por execução do script.
+
+    Só usa a biblioteca padrão, para não pesar na importação do núcleo de
+    roteamento.
+    """
+
+    def __init__(self):
+        self.zerar()
+
+    def zerar(self):
+        self.consultas = 0
+        self.nos_assentados = 0
+
+    def registrar(self, nos_assentados, consultas=1):
+        self.consultas += consultas
+        self.nos_assentados += nos_assentados
+
+    def como_dict(self):
+        return {'consultas': self.consultas, 'nos_assentados': self.nos_assentados}
+
+    def salvar(self, arquivo, rotulo):
+        """
+        Acumula as contagens no JSON {rotulo: {consultas, nos_assentados,
+        execucoes}}. O rótulo deve ser o nome do CSV do CodeCarbon (sem .csv):
+        como o CodeCarbon acrescenta uma linha por execução ao mesmo CSV, as
+        contagens também são somadas a cada execução.
+        """
+        dados = carregar_metricas(arquivo)
+        atual = dados.get(rotulo, {'consultas': 0, 'nos_assentados': 0, 'execucoes': 0})
+        atual['consultas'] += self.consultas
+        atual['nos_assentados'] += self.nos_assentados
+        atual['execucoes'] += 1
+        dados[rotulo] = atual
+
+        pasta = os.path.dirname(arquivo)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        with open(arquivo, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, ensure_ascii=False, indent=2)
+        print(f"Métricas de roteamento salvas em '{arquivo}' ({rotulo}: {self.consultas} consultas, "
+              f"{self.nos_assentados} nós assentados)")
+        return atual
+
+
+# Função para ler o JSON de métricas (dicionário vazio se não existir)
+def carregar_metricas(arquivo):
+    if not arquivo or not os.path.exists(arquivo):
+        return {}
+    with open(arquivo, encoding='utf-8') as f:
+        return json.load(f)
+
+
+# Contador global usado pelos algoritmos de rota
+METRICAS = Metricas()
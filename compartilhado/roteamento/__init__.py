@@ -0,0 +1,40 @@
+"""
+Núcleo de roteamento compartilhado pela tarefa_4 e pela tarefa_5.
+
+- geo: haversine, heurística, nó mais próximo e projeção local
+- grafo: download do OpenStreetMap, criação do grafo, cache e subgrafos
+- snap: ajuste de vários pontos ao grafo com KD-tree (numpy/scipy sob demanda)
+- custos: tempo estimado, comprimento e reconstrução de caminhos
+- motores: registro dos algoritmos ('trad', 'heap', 'a_star') com a mesma
+  interface de consulta
+
+Importar o pacote só carrega a biblioteca padrão.
+"""
+
+from compartilhado.roteamento.geo import (
+    haversine,
+    heuristica,
+    encontrar_no_mais_proximo,
+    projetar_coordenadas
+)
+from compartilhado.roteamento.grafo import (
+    obter_dados_estradas,
+    chave_grafo,
+    carregar_grafo_com_cache,
+    criar_grafo,
+    get_default_speed,
+    extrair_subgrafo
+)
+from compartilhado.roteamento.custos import (
+    estimar_tempo,
+    distancia_caminho,
+    reconstruir_caminho
+)
+from compartilhado.roteamento.motores import (
+    MOTORES,
+    Motor,
+    registrar_motor,
+    obter_motor,
+    matriz_distancias_rede,
+    distancias_a_partir_de
+)
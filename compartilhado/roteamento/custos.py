@@ -0,0 +1,41 @@
+# Estimar tempo de percurso
+def estimar_tempo(graph, path, velocidade_padrao=40):
+    """
+    Tempo (em minutos) para percorrer o caminho, aresta por aresta, com a
+    velocidade de cada via (km/h). Arestas sem velocidade usam
+    velocidade_padrao.
+    """
+    tempo_total = 0
+
+    for n1, n2 in zip(path[:-1], path[1:]):
+        # Encontrar a aresta entre n1 e n2
+        for neighbor, distance, speed in graph[n1]:
+            if neighbor == n2:
+                # velocidade em km/h, distância em metros
+                tempo_total += (distance / 1000) / (speed or velocidade_padrao) * 60
+                break
+
+    return tempo_total
+
+# Função para somar o comprimento (em metros) de um caminho
+def distancia_caminho(graph, path):
+    total = 0.0
+    for n1, n2 in zip(path[:-1], path[1:]):
+        total += min((w for v, w, _ in graph[n1] if v == n2), default=float('infinity'))
+    return total
+
+# Função para reconstruir o caminho a partir do dicionário de predecessores
+def reconstruir_caminho(pred, destino):
+    """
+    Caminho da origem até 'destino' seguindo pred (a origem tem pred None).
+    Retorna [] se o destino não foi alcançado.
+    """
+    if destino not in pred:
+        return []
+    caminho = []
+    atual = destino
+    while atual is not None:
+        caminho.append(atual)
+        atual = pred[atual]
+    caminho.reverse()
+    return caminho
@@ -0,0 +1,61 @@
+import math
+
+# Função para calcular a distância haversine entre dois pontos em lat/long
+def haversine(lat1, lon1, lat2, lon2):
+    # Raio da Terra em metros
+    R = 6371000
+    # Converter coordenadas de graus para radianos
+    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
+    # Diferença de latitude e longitude
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    # Fórmula haversine
+    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
+    c = 2 * math.asin(math.sqrt(a))
+    # Distância em metros
+    distance = R * c
+    return distance
+
+# Função heurística para o A* (distância euclidiana estimada)
+# Calcula a heurística entre dois nós usando a fórmula haversine
+def heuristica(node1, node2, node_coords):
+    if node1 not in node_coords or node2 not in node_coords:
+        return 0
+    
+    lat1, lon1 = node_coords[node1]
+    lat2, lon2 = node_coords[node2]
+    return haversine(lat1, lon1, lat2, lon2)
+
+# Função para encontrar o nó mais próximo às coordenadas dadas
+def encontrar_no_mais_proximo(node_coords, lat, lon):
+    min_dist = float('infinity')
+    closest_node = None
+    
+    for node_id, (node_lat, node_lon) in node_coords.items():
+        dist = haversine(lat, lon, node_lat, node_lon)
+        if dist < min_dist:
+            min_dist = dist
+            closest_node = node_id
+    
+    return closest_node
+
+# Função para projetar coordenadas (lon, lat) em metros
+def projetar_coordenadas(coords):
+    """
+    Projeta coordenadas [lon, lat] em um plano local (x, y) em metros usando a
+    projeção equiretangular centrada na latitude média dos pontos. Para a área
+    de uma cidade o erro é desprezível em relação ao UTM e não exige pyproj.
+
+    Parâmetros:
+    - coords: array numpy (n x 2) com colunas [lon, lat]
+
+    Retorna:
+    - array numpy (n x 2) com colunas [x, y] em metros
+    """
+    import numpy as np
+
+    R = 6371000
+    lat0 = np.radians(coords[:, 1].mean())
+    x = R * np.radians(coords[:, 0]) * np.cos(lat0)
+    y = R * np.radians(coords[:, 1])
+    return np.column_stack([x, y])
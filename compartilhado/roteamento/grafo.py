@@ -0,0 +1,144 @@
+import os
+import pickle
+import hashlib
+from collections import defaultdict
+
+from compartilhado.roteamento.geo import haversine
+
+# Função para obter dados de ruas de uma área usando Overpass API
+def obter_dados_estradas(bounds):
+    import requests
+
+    min_lat, min_lon, max_lat, max_lon = bounds
+    overpass_url = "https://overpass-api.de/api/interpreter"
+    overpass_query = f"""
+    [out:json];
+    way[highway][!area]
+        ({min_lat},{min_lon},{max_lat},{max_lon});
+    (._;>;);
+    out body;
+    """
+    response = requests.get(overpass_url, params={"data": overpass_query})
+    return response.json()
+
+# Gera uma chave curta e estável para identificar o grafo de uma bounding box
+def chave_grafo(bounds):
+    return hashlib.sha1(repr(tuple(float(b) for b in bounds)).encode()).hexdigest()[:12]
+
+# Função para carregar o grafo do cache em disco ou baixá-lo e criá-lo
+def carregar_grafo_com_cache(bounds, pasta_cache='cache'):
+    """
+    Carrega o grafo da rede viária do cache ou, se ainda não existir, baixa os
+    dados do OpenStreetMap, cria o grafo e o salva em disco.
+
+    Parâmetros:
+    - bounds: limites da área (min_lat, min_lon, max_lat, max_lon)
+    - pasta_cache: pasta onde o grafo (e as tabelas derivadas) são salvos
+
+    Retorna:
+    - graph, node_coords: mesmo formato de criar_grafo
+    """
+    arquivo = os.path.join(pasta_cache, f"grafo_{chave_grafo(bounds)}.pkl")
+
+    if os.path.exists(arquivo):
+        print(f"Carregando grafo do cache: {arquivo}")
+        with open(arquivo, 'rb') as f:
+            return pickle.load(f)
+
+    print("Baixando dados do OpenStreetMap...")
+    data = obter_dados_estradas(bounds)
+    print("Criando grafo da rede viária...")
+    graph, node_coords = criar_grafo(data)
+
+    os.makedirs(pasta_cache, exist_ok=True)
+    with open(arquivo, 'wb') as f:
+        pickle.dump((graph, node_coords), f, protocol=pickle.HIGHEST_PROTOCOL)
+    print(f"Grafo salvo em cache: {arquivo}")
+
+    return graph, node_coords
+
+# Função para criar um grafo a partir dos dados do OpenStreetMap
+def criar_grafo(data):
+    nodes = {}
+    graph = defaultdict(list)
+    node_coords = {}
+    
+    # Extrair nós
+    for element in data["elements"]:
+        if element["type"] == "node":
+            node_id = element["id"]
+            lat = element["lat"]
+            lon = element["lon"]
+            nodes[node_id] = (lat, lon)
+            node_coords[node_id] = (lat, lon)
+            graph[node_id] = []
+    
+    # Extrair vias e conectar nós
+    for element in data["elements"]:
+        if element["type"] == "way" and "highway" in element["tags"]:
+            # Verificar se a via é acessível para carros
+            highway_type = element["tags"]["highway"]
+            if highway_type in ["motorway", "trunk", "primary", "secondary", "tertiary", 
+                               "unclassified", "residential", "service"]:
+                
+                # Obter velocidade máxima (padrão por tipo de via se não disponível)
+                if "maxspeed" in element["tags"]:
+                    try:
+                        speed = float(element["tags"]["maxspeed"].split()[0])
+                    except:
+                        speed = get_default_speed(highway_type)
+                else:
+                    speed = get_default_speed(highway_type)
+                
+                nodes_list = element["nodes"]
+                for i in range(len(nodes_list) - 1):
+                    n1 = nodes_list[i]
+                    n2 = nodes_list[i + 1]
+                    
+                    if n1 in nodes and n2 in nodes:
+                        # Calcular distância entre os nós
+                        lat1, lon1 = nodes[n1]
+                        lat2, lon2 = nodes[n2]
+                        distance = haversine(lat1, lon1, lat2, lon2)
+                        
+                        # Verificar sentido único
+                        oneway = element["tags"].get("oneway", "no")
+                        
+                        # Adicionar arestas
+                        graph[n1].append((n2, distance, speed))
+                        if oneway != "yes":
+                            graph[n2].append((n1, distance, speed))
+    
+    return graph, node_coords
+
+# Função para definir velocidade padrão por tipo de via
+def get_default_speed(highway_type):
+    speed_dict = {
+        "motorway": 100,
+        "trunk": 80,
+        "primary": 60,
+        "secondary": 50,
+        "tertiary": 40,
+        "unclassified": 30,
+        "residential": 30,
+        "service": 20
+    }
+    return speed_dict.get(highway_type, 40)  # Padrão para vias não especificadas
+
+# Função para extrair o subgrafo dentro da bounding box de um conjunto de nós
+def extrair_subgrafo(nos, node_coords, graph, margem=0.005):
+    """
+    Extrai de 'graph' apenas os nós e arestas que caem no bbox que envolve
+    'nos' (lat/lon em node_coords) com uma pequena margem, em graus.
+    """
+    lats = [node_coords[n][0] for n in nos]
+    lons = [node_coords[n][1] for n in nos]
+    min_lat, max_lat = min(lats) - margem, max(lats) + margem
+    min_lon, max_lon = min(lons) - margem, max(lons) + margem
+
+    nodes_ok = {
+        n for n, (lat, lon) in node_coords.items()
+        if min_lat <= lat <= max_lat and min_lon <= lon <= max_lon
+    }
+
+    return {n: [(v, w, s) for (v, w, s) in graph.get(n, []) if v in nodes_ok] for n in nodes_ok}
@@ -0,0 +1,241 @@
+"""
+Registro de motores de roteamento.
+
+Todo motor implementa a mesma interface sobre o grafo no formato
+{no: [(vizinho, distancia_m, velocidade_kmh), ...]}:
+
+- caminho(graph, origem, destino, node_coords=None) -> (caminho, distancia)
+  busca ponto a ponto, encerrada ao assentar o destino; ([], inf) se não
+  houver caminho
+- arvore(graph, origem, alvos=None) -> (dist, pred)
+  busca a partir de uma origem para todos os nós (ou até assentar todos os
+  alvos); dist e pred só têm os nós alcançados, pred[origem] é None
+
+Novos motores são registrados com o decorador @registrar_motor e escolhidos
+pelo nome com obter_motor. Cada busca soma seus nós assentados em
+compartilhado.metricas.METRICAS.
+"""
+
+import heapq
+
+from compartilhado.metricas import METRICAS
+from compartilhado.roteamento.geo import heuristica
+from compartilhado.roteamento.custos import reconstruir_caminho
+
+INFINITO = float('infinity')
+
+# nome -> instância do motor
+MOTORES = {}
+# Nomes alternativos usados nos scripts e nos CSVs de emissões
+APELIDOS = {
+    'dijkstra_trad': 'trad',
+    'tradicional': 'trad',
+    'min_heap': 'heap',
+    'dijkstra_min_heap': 'heap',
+    'astar': 'a_star',
+    'a*': 'a_star',
+}
+
+
+def registrar_motor(cls):
+    """Decorador: instancia a classe e a registra em MOTORES pelo atributo nome."""
+    MOTORES[cls.nome] = cls()
+    return cls
+
+
+def obter_motor(nome):
+    """Motor registrado com esse nome (ou apelido); ValueError se não existir."""
+    chave = APELIDOS.get(nome, nome)
+    if chave not in MOTORES:
+        raise ValueError(f"Motor de roteamento desconhecido: '{nome}'. "
+                         f"Disponíveis: {', '.join(sorted(MOTORES))}")
+    return MOTORES[chave]
+
+
+class Motor:
+    """Base dos motores: caminho ponto a ponto a partir da árvore de caminhos."""
+
+    nome = None
+    descricao = ''
+    # True para motores que dependem do destino (heurística): o planejamento
+    # faz uma busca por par de paradas em vez de uma árvore por parada
+    ponto_a_ponto = False
+
+    def arvore(self, graph, origem, alvos=None):
+        raise NotImplementedError
+
+    def caminho(self, graph, origem, destino, node_coords=None):
+        if origem == destino:
+            return [origem], 0
+        if origem not in graph or destino not in graph:
+            return [], INFINITO
+        dist, pred = self.arvore(graph, origem, alvos=(destino,))
+        if destino not in dist:
+            return [], INFINITO
+        return reconstruir_caminho(pred, destino), dist[destino]
+
+
+@registrar_motor
+class DijkstraTradicional(Motor):
+    """
+    Dijkstra sem fila de prioridade: a cada passo percorre todos os nós para
+    achar o de menor distância ainda não visitado, O(V²). Mantido assim de
+    propósito, é a linha de base das comparações.
+    """
+
+    nome = 'trad'
+    descricao = 'Dijkstra tradicional (busca linear, O(V²))'
+
+    def arvore(self, graph, origem, alvos=None):
+        dist = {n: INFINITO for n in graph}
+        dist[origem] = 0
+        pred = {n: None for n in graph}
+        visitados = set()
+        restantes = set(alvos) if alvos is not None else None
+
+        while True:
+            # Encontrar o nó não visitado com a menor distância
+            u, melhor = None, INFINITO
+            for n, d in dist.items():
+                if d < melhor and n not in visitados:
+                    u, melhor = n, d
+            if u is None:
+                break
+            visitados.add(u)
+            if restantes is not None:
+                restantes.discard(u)
+                if not restantes:
+                    break
+            for v, w, _ in graph.get(u, []):
+                if v not in visitados and melhor + w < dist.get(v, INFINITO):
+                    dist[v] = melhor + w
+                    pred[v] = u
+
+        METRICAS.registrar(len(visitados))
+        alcancados = {n: d for n, d in dist.items() if d < INFINITO}
+        return alcancados, {n: pred[n] for n in alcancados}
+
+
+@registrar_motor
+class DijkstraMinHeap(Motor):
+    """Dijkstra com min-heap (O((V + E) log V)) e dicionários preguiçosos."""
+
+    nome = 'heap'
+    descricao = 'Dijkstra com min-heap'
+
+    def arvore(self, graph, origem, alvos=None):
+        dist = {origem: 0}
+        pred = {origem: None}
+        visitados = set()
+        heap = [(0, origem)]
+        restantes = set(alvos) if alvos is not None else None
+
+        while heap:
+            d_u, u = heapq.heappop(heap)
+            if u in visitados:
+                continue
+            visitados.add(u)
+            if restantes is not None:
+                restantes.discard(u)
+                if not restantes:
+                    break
+            for v, w, _ in graph.get(u, []):
+                nd = d_u + w
+                if nd < dist.get(v, INFINITO):
+                    dist[v] = nd
+                    pred[v] = u
+                    heapq.heappush(heap, (nd, v))
+
+        METRICAS.registrar(len(visitados))
+        return dist, pred
+
+
+@registrar_motor
+class AEstrela(Motor):
+    """
+    A* com a distância haversine até o destino como heurística (admissível e
+    consistente, pois cada aresta mede a haversine entre suas pontas).
+    A árvore para todos os nós não tem destino para a heurística, então é a
+    mesma do Dijkstra com min-heap.
+    """
+
+    nome = 'a_star'
+    descricao = 'A* (heurística haversine)'
+    ponto_a_ponto = True
+
+    def arvore(self, graph, origem, alvos=None):
+        return MOTORES['heap'].arvore(graph, origem, alvos)
+
+    def caminho(self, graph, origem, destino, node_coords=None):
+        if node_coords is None:
+            raise ValueError("O A* precisa de node_coords para a heurística")
+        if origem == destino:
+            return [origem], 0
+        if origem not in graph or destino not in graph:
+            return [], INFINITO
+
+        g_score = {origem: 0}
+        pred = {origem: None}
+        fechados = set()
+        heap = [(heuristica(origem, destino, node_coords), origem)]
+
+        while heap:
+            _, u = heapq.heappop(heap)
+            if u in fechados:
+                continue
+            if u == destino:
+                METRICAS.registrar(len(fechados) + 1)
+                return reconstruir_caminho(pred, destino), g_score[destino]
+            fechados.add(u)
+            g_u = g_score[u]
+            for v, w, _ in graph.get(u, []):
+                if v in fechados:
+                    continue
+                tentativa = g_u + w
+                if tentativa < g_score.get(v, INFINITO):
+                    g_score[v] = tentativa
+                    pred[v] = u
+                    heapq.heappush(heap, (tentativa + heuristica(v, destino, node_coords), v))
+
+        METRICAS.registrar(len(fechados))
+        return [], INFINITO
+
+
+# Função para calcular a matriz de distâncias pela rede viária entre um conjunto de nós
+def matriz_distancias_rede(graph, nos, motor='heap'):
+    """
+    Calcula a matriz de distâncias (em metros) pela rede viária entre todos os
+    nós informados. Roda uma árvore do motor a partir de cada nó, encerrada
+    assim que todos os nós-alvo forem assentados.
+
+    Parâmetros:
+    - graph: grafo da rede viária {no: [(vizinho, distancia, velocidade), ...]}
+    - nos: lista de nós do grafo (origens e alvos ao mesmo tempo)
+    - motor: nome do motor registrado
+
+    Retorna:
+    - matriz numpy (len(nos) x len(nos)) com as distâncias em metros;
+      np.inf onde não existe caminho
+    """
+    import numpy as np
+
+    arvore = obter_motor(motor).arvore
+    n = len(nos)
+    matriz = np.full((n, n), np.inf)
+    alvos = set(nos)
+
+    for i, origem in enumerate(nos):
+        dist, _ = arvore(graph, origem, alvos)
+        matriz[i] = [dist.get(no, np.inf) for no in nos]
+
+    return matriz
+
+
+# Função para calcular as distâncias de um nó para todos os alcançáveis
+def distancias_a_partir_de(graph, origem, motor='heap'):
+    """
+    Retorna:
+    - dicionário {no: distancia} contendo apenas os nós alcançáveis
+    """
+    dist, _ = obter_motor(motor).arvore(graph, origem)
+    return dist
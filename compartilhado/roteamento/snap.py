@@ -0,0 +1,51 @@
+RAIO_TERRA = 6371000
+
+
+def _para_esfera(lat, lon):
+    # Pontos na esfera unitária: o vizinho mais próximo pela corda é o mesmo
+    # do vizinho mais próximo pela distância haversine
+    import numpy as np
+
+    lat, lon = np.radians(lat), np.radians(lon)
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+class IndiceNos:
+    """
+    KD-tree sobre os nós do grafo para ajustar (snap) pontos ao nó mais
+    próximo. Montar o índice custa O(n log n) uma vez; cada consulta é
+    O(log n), contra O(n) de encontrar_no_mais_proximo.
+
+    Parâmetros:
+    - node_coords: dicionário {no: (lat, lon)}
+    """
+
+    def __init__(self, node_coords):
+        import numpy as np
+        from scipy.spatial import cKDTree
+
+        self.ids = np.fromiter(node_coords.keys(), dtype=np.int64, count=len(node_coords))
+        coords = np.array(list(node_coords.values()), dtype=np.float64).reshape(-1, 2)
+        self.arvore = cKDTree(_para_esfera(coords[:, 0], coords[:, 1]))
+
+    def ajustar(self, lats, lons):
+        """
+        Nó mais próximo de cada ponto, numa única consulta à árvore.
+
+        Retorna:
+        - lista de nós e array com a distância (em metros) de cada ponto ao seu nó
+        """
+        import numpy as np
+
+        cordas, indices = self.arvore.query(_para_esfera(np.asarray(lats, dtype=np.float64),
+                                                        np.asarray(lons, dtype=np.float64)))
+        distancias = 2 * RAIO_TERRA * np.arcsin(np.minimum(cordas / 2, 1.0))
+        return self.ids[indices].tolist(), distancias
+
+
+# Função para ajustar vários pontos (lat, lon) ao grafo de uma vez
+def ajustar_pontos(node_coords, pontos):
+    """Atalho para IndiceNos(node_coords).ajustar com uma lista de (lat, lon)."""
+    lats = [lat for lat, _ in pontos]
+    lons = [lon for _, lon in pontos]
+    return IndiceNos(node_coords).ajustar(lats, lons)
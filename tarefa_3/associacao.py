@@ -0,0 +1,133 @@
+import numpy as np
+import networkx as nx
+
+ESCORES = ('peso', 'pmi', 'npmi', 'jaccard', 'lift')
+
+
+def escores_associacao(incidencia, peso_minimo=1):
+    """
+    Escores de associação de todos os pares que co-ocorrem, calculados em bloco
+    a partir da matriz de incidência (ver coocorrencia.Incidencia).
+
+    Com N receitas, f_i receitas com o ingrediente i e c_ij receitas com i e j:
+    - pmi = log(c_ij * N / (f_i * f_j))
+    - npmi = pmi / -log(c_ij / N), entre -1 e 1 (1 quando c_ij == N)
+    - jaccard = c_ij / (f_i + f_j - c_ij)
+    - lift = c_ij * N / (f_i * f_j)
+
+    Retorna:
+    - dicionário de arrays: origem, destino e os escores de ESCORES
+    """
+    origem, destino, peso = incidencia.lista_arestas(peso_minimo)
+    n_receitas = incidencia.B.shape[0]
+    f = incidencia.frequencia.astype(np.float64)
+    c = peso.astype(np.float64)
+    fi, fj = f[origem], f[destino]
+
+    lift = c * n_receitas / (fi * fj)
+    pmi = np.log(lift)
+    log_p = np.log(c / n_receitas)
+    npmi = np.divide(pmi, -log_p, out=np.ones_like(pmi), where=log_p < 0)
+
+    return {
+        'origem': origem,
+        'destino': destino,
+        'peso': peso,
+        'pmi': pmi,
+        'npmi': npmi,
+        'jaccard': c / (fi + fj - c),
+        'lift': lift,
+    }
+
+
+def filtro_disparidade(origem, destino, peso, n, alfa=0.05):
+    """
+    Filtro de disparidade (Serrano, Boguñá e Vespignani, 2009): mantém a aresta
+    se ela for significativa para pelo menos uma das pontas, isto é, se
+    (1 - w/s)^(k - 1) < alfa, com s a força e k o grau do nó.
+    Nós de grau 1 mantêm a sua única aresta.
+
+    Retorna:
+    - máscara booleana das arestas mantidas
+    """
+    peso = peso.astype(np.float64)
+    forca = np.bincount(origem, peso, n) + np.bincount(destino, peso, n)
+    grau = np.bincount(origem, minlength=n) + np.bincount(destino, minlength=n)
+
+    def significativa(no):
+        k = grau[no]
+        alfa_aresta = (1.0 - peso / forca[no]) ** (k - 1)
+        return (k == 1) | (alfa_aresta < alfa)
+
+    return significativa(origem) | significativa(destino)
+
+
+def top_k_por_no(origem, destino, escore, n, k=5):
+    """
+    Mantém a aresta se ela estiver entre as k de maior escore de pelo menos uma
+    das pontas (empates resolvidos pela ordem das arestas).
+
+    Retorna:
+    - máscara booleana das arestas mantidas
+    """
+    m = len(origem)
+    nos = np.concatenate([origem, destino])
+    arestas = np.concatenate([np.arange(m), np.arange(m)])
+    ordem = np.lexsort((arestas, -np.concatenate([escore, escore]), nos))
+
+    # Posição de cada aresta dentro da lista ordenada do seu nó
+    inicio = np.searchsorted(nos[ordem], np.arange(n))
+    posicao = np.arange(2 * m) - inicio[nos[ordem]]
+
+    mascara = np.zeros(m, dtype=bool)
+    mascara[arestas[ordem[posicao < k]]] = True
+    return mascara
+
+
+def backbone(incidencia, metodo='disparidade', escore='npmi', alfa=0.05, k=5, peso_minimo=1):
+    """
+    Extrai o backbone do grafo de co-ocorrência.
+
+    Parâmetros:
+    - metodo: 'disparidade' (sobre o peso bruto) ou 'topk' (sobre `escore`)
+    - escore: um de ESCORES, usado pelo 'topk'
+    - alfa: nível de significância do filtro de disparidade
+    - k: arestas por nó no 'topk'
+
+    Retorna:
+    - dicionário de arrays como em escores_associacao, só com as arestas mantidas
+    """
+    escores = escores_associacao(incidencia, peso_minimo)
+    n = len(incidencia.ingredientes)
+    if metodo == 'disparidade':
+        mascara = filtro_disparidade(escores['origem'], escores['destino'], escores['peso'], n, alfa)
+    elif metodo == 'topk':
+        mascara = top_k_por_no(escores['origem'], escores['destino'], escores[escore], n, k)
+    else:
+        raise ValueError(f"Método de backbone desconhecido: {metodo}")
+
+    print(f"Backbone ({metodo}): {int(mascara.sum())} de {len(mascara)} arestas mantidas")
+    return {chave: valores[mascara] for chave, valores in escores.items()}
+
+
+def grafo_associacao(incidencia, arestas, manter_isolados=False):
+    """
+    Grafo NetworkX com 'tipo' nos nós e os escores de ESCORES nas arestas.
+
+    Parâmetros:
+    - arestas: dicionário de arrays (escores_associacao ou backbone)
+    - manter_isolados: inclui ingredientes sem nenhuma aresta mantida
+    """
+    G = nx.Graph()
+    nomes = incidencia.ingredientes
+    if manter_isolados:
+        G.add_nodes_from((ing, {'tipo': tipo}) for ing, tipo in zip(nomes, incidencia.tipos))
+
+    origem, destino = arestas['origem'], arestas['destino']
+    usados = np.unique(np.concatenate([origem, destino])).tolist()
+    G.add_nodes_from((nomes[i], {'tipo': incidencia.tipos[i]}) for i in usados)
+
+    colunas = [arestas[e].tolist() for e in ESCORES]
+    for i, j, *valores in zip(origem.tolist(), destino.tolist(), *colunas):
+        G.add_edge(nomes[i], nomes[j], **dict(zip(ESCORES, valores)))
+    return G
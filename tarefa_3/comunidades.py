@@ -0,0 +1,229 @@
+import time
+import argparse
+
+import numpy as np
+import networkx as nx
+from scipy import sparse
+
+from coocorrencia import Incidencia
+
+
+def adjacencia(n, origem, destino, peso=None):
+    """
+    Matriz de adjacência simétrica (CSR) a partir de uma lista de arestas não
+    direcionadas, como a de Incidencia.lista_arestas ou a de associacao.backbone.
+    """
+    peso = np.ones(len(origem)) if peso is None else np.asarray(peso, dtype=np.float64)
+    A = sparse.coo_matrix((np.concatenate([peso, peso]),
+                           (np.concatenate([origem, destino]), np.concatenate([destino, origem]))),
+                          shape=(n, n))
+    return A.tocsr()
+
+
+def modularidade(A, rotulos, resolucao=1.0):
+    """Modularidade ponderada de uma partição (rótulos inteiros por nó)."""
+    A = A.tocoo()
+    dois_m = A.data.sum()
+    if dois_m == 0:
+        return 0.0
+    interna = rotulos[A.row] == rotulos[A.col]
+    n_com = int(rotulos.max()) + 1
+    dentro = np.bincount(rotulos[A.row[interna]], A.data[interna], n_com)
+    total = np.bincount(rotulos[A.row], A.data, n_com)
+    return float(dentro.sum() / dois_m - resolucao * ((total / dois_m) ** 2).sum())
+
+
+def _mover_nos(A, resolucao, rng, limiar=1e-7):
+    # Fase local do Louvain: cada nó vai para a comunidade vizinha de maior ganho.
+    # As passadas param quando o ganho de modularidade de uma passada é < limiar
+    n = A.shape[0]
+    indptr, indices, dados = A.indptr, A.indices, A.data
+    grau = np.asarray(A.sum(axis=1)).ravel()
+    dois_m = grau.sum()
+    comunidade = np.arange(n)
+    total = grau.copy()
+    ligacao = np.zeros(n)  # peso de i para cada comunidade (zerado após cada nó)
+
+    melhorou = False
+    ganho_passada = limiar
+    while ganho_passada >= limiar:
+        ganho_passada = 0.0
+        for i in rng.permutation(n).tolist():
+            inicio, fim = indptr[i], indptr[i + 1]
+            vizinhos = indices[inicio:fim]
+            fora = vizinhos != i
+            atual = comunidade[i]
+            total[atual] -= grau[i]
+
+            candidatas = comunidade[vizinhos[fora]]
+            np.add.at(ligacao, candidatas, dados[inicio:fim][fora])
+            # Candidatas repetidas não atrapalham o argmax
+            ganho = ligacao[candidatas] - resolucao * total[candidatas] * grau[i] / dois_m
+            ganho_atual = ligacao[atual] - resolucao * total[atual] * grau[i] / dois_m
+            melhor = atual
+            if len(ganho):
+                j = np.argmax(ganho)
+                if ganho[j] > ganho_atual + 1e-12:
+                    melhor = candidatas[j]
+                    ganho_passada += (ganho[j] - ganho_atual) * 2 / dois_m
+            ligacao[candidatas] = 0.0
+
+            total[melhor] += grau[i]
+            if melhor != atual:
+                comunidade[i] = melhor
+                melhorou = True
+
+    _, comunidade = np.unique(comunidade, return_inverse=True)
+    return comunidade, melhorou
+
+
+def louvain(A, resolucao=1.0, seed=42, max_niveis=20):
+    """
+    Comunidades por Louvain ponderado sobre a matriz de adjacência esparsa.
+    A fase local percorre os arrays CSR; a agregação de cada nível é o produto
+    esparso Pᵀ·A·P, com P a matriz de pertinência nó x comunidade.
+
+    Retorna:
+    - rotulos: comunidade de cada nó (inteiros de 0 a c-1)
+    - modularidade da partição final
+    """
+    rng = np.random.default_rng(seed)
+    A = sparse.csr_matrix(A, dtype=np.float64)
+    n = A.shape[0]
+    rotulos = np.arange(n)
+    if A.nnz == 0:
+        return rotulos, 0.0
+
+    atual = A
+    for _ in range(max_niveis):
+        comunidade, melhorou = _mover_nos(atual, resolucao, rng)
+        if not melhorou:
+            break
+        rotulos = comunidade[rotulos]
+        P = sparse.csr_matrix((np.ones(len(comunidade)), (np.arange(len(comunidade)), comunidade)))
+        atual = (P.T @ atual @ P).tocsr()
+
+    return rotulos, modularidade(A, rotulos, resolucao)
+
+
+def matriz_mistura(A, tipos, n_tipos=None):
+    """
+    Matriz de mistura por tipo: e[a, b] é a fração do peso das arestas que liga
+    um nó do tipo a a um do tipo b (cada aresta contada nos dois sentidos, como
+    no nx.attribute_mixing_matrix).
+
+    Parâmetros:
+    - A: adjacência simétrica esparsa
+    - tipos: código inteiro do tipo de cada nó
+    """
+    A = A.tocoo()
+    n_tipos = int(tipos.max()) + 1 if n_tipos is None else n_tipos
+    e = np.bincount(tipos[A.row] * n_tipos + tipos[A.col], A.data, n_tipos * n_tipos)
+    e = e.reshape(n_tipos, n_tipos)
+    return e / e.sum() if e.sum() else e
+
+
+def assortatividade(A, tipos, ponderada=True):
+    """
+    Coeficiente de assortatividade por atributo (Newman, 2003) a partir da
+    matriz de mistura. Com ponderada=False, cada aresta vale 1 e o resultado
+    coincide com nx.attribute_assortativity_coefficient.
+    """
+    if not ponderada:
+        A = A.copy()
+        A.data[:] = 1.0
+    e = matriz_mistura(A, tipos)
+    soma_ab = (e.sum(axis=1) * e.sum(axis=0)).sum()
+    return float((np.trace(e) - soma_ab) / (1 - soma_ab))
+
+
+def codigos_tipos(incidencia):
+    """Código inteiro do tipo de cada ingrediente e a lista de tipos."""
+    nomes, codigos = np.unique(np.array(incidencia.tipos, dtype=object), return_inverse=True)
+    return codigos, list(nomes)
+
+
+def analise_estrutural(incidencia, arestas=None, resolucao=1.0, seed=42):
+    """
+    Comunidades, matriz de mistura por tipo e assortatividade (ponderada e sem
+    peso) do grafo de co-ocorrência.
+
+    Parâmetros:
+    - incidencia: coocorrencia.Incidencia
+    - arestas: dicionário com origem, destino e peso (ex.: associacao.backbone);
+      padrão: todas as co-ocorrências
+    """
+    if arestas is None:
+        origem, destino, peso = incidencia.lista_arestas()
+    else:
+        origem, destino, peso = arestas['origem'], arestas['destino'], arestas['peso']
+    A = adjacencia(len(incidencia.ingredientes), origem, destino, peso)
+    tipos, nomes_tipos = codigos_tipos(incidencia)
+    rotulos, Q = louvain(A, resolucao, seed)
+
+    return {
+        'comunidades': rotulos,
+        'modularidade': Q,
+        'tipos': nomes_tipos,
+        'mistura': matriz_mistura(A, tipos, len(nomes_tipos)),
+        'assortatividade': assortatividade(A, tipos, ponderada=False),
+        'assortatividade_ponderada': assortatividade(A, tipos),
+    }
+
+
+# Função para gerar um corpus sintético de receitas (popularidade dos ingredientes em Zipf)
+def gerar_receitas(n_receitas, n_ingredientes=5000, tipos=('carboidrato', 'proteína', 'gordura', 'vegetal',
+                                                          'fruta', 'laticínio', 'tempero'), seed=42):
+    rng = np.random.default_rng(seed)
+    popularidade = 1.0 / np.arange(1, n_ingredientes + 1) ** 0.9
+    popularidade /= popularidade.sum()
+    tipo_ingrediente = rng.integers(0, len(tipos), n_ingredientes)
+    tamanhos = rng.integers(3, 12, n_receitas)
+    sorteio = rng.choice(n_ingredientes, tamanhos.sum(), p=popularidade)
+    inicio = 0
+    for r, tamanho in enumerate(tamanhos.tolist()):
+        categorias = {}
+        for ing in sorteio[inicio:inicio + tamanho].tolist():
+            categorias.setdefault(tipos[tipo_ingrediente[ing]], []).append(f"ingrediente {ing}")
+        inicio += tamanho
+        yield f"receita {r}", categorias
+
+
+def benchmark(tamanhos=(10_000, 100_000, 1_000_000), limite_networkx=100_000, seed=42):
+    """
+    Compara esta implementação (Louvain + assortatividade sobre arrays esparsos)
+    com o NetworkX (louvain_communities + attribute_assortativity_coefficient)
+    em corpora sintéticos. Acima de limite_networkx receitas, só a versão
+    esparsa é executada.
+    """
+    print(f"{'receitas':>10} {'arestas':>10} {'esparso (s)':>12} {'Q':>7} {'networkx (s)':>13} {'Q nx':>7} "
+          f"{'r':>8} {'r nx':>8}")
+    for n_receitas in tamanhos:
+        incidencia = Incidencia.de_receitas(gerar_receitas(n_receitas, seed=seed))
+        origem, destino, peso = incidencia.lista_arestas()
+
+        inicio = time.perf_counter()
+        resultado = analise_estrutural(incidencia, seed=seed)
+        t_esparso = time.perf_counter() - inicio
+
+        t_nx = q_nx = r_nx = float('nan')
+        if n_receitas <= limite_networkx:
+            G = incidencia.para_networkx()
+            inicio = time.perf_counter()
+            particao = nx.community.louvain_communities(G, weight='peso', seed=seed)
+            q_nx = nx.community.modularity(G, particao, weight='peso')
+            r_nx = nx.attribute_assortativity_coefficient(G, 'tipo')
+            t_nx = time.perf_counter() - inicio
+
+        print(f"{n_receitas:>10} {len(peso):>10} {t_esparso:>12.2f} {resultado['modularidade']:>7.4f} "
+              f"{t_nx:>13.2f} {q_nx:>7.4f} {resultado['assortatividade']:>8.4f} {r_nx:>8.4f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de comunidades e assortatividade contra o NetworkX.")
+    parser.add_argument("-r", "--receitas", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="Tamanhos dos corpora sintéticos")
+    parser.add_argument("--limite-networkx", type=int, default=100_000,
+                        help="Maior corpus em que o NetworkX também é executado")
+    args = parser.parse_args()
+    benchmark(args.receitas, args.limite_networkx)
@@ -0,0 +1,102 @@
+import json
+
+import numpy as np
+import networkx as nx
+from scipy import sparse
+
+
+# Função para carregar o banco de receitas no formato {receita: {tipo: [ingredientes]}}
+def carregar_receitas(arquivo):
+    with open(arquivo, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class Incidencia:
+    """
+    Receitas codificadas como uma matriz esparsa receita x ingrediente (CSR, 0/1).
+    Cada ingrediente conta uma única vez por receita, mesmo que apareça em mais
+    de uma categoria.
+
+    Atributos:
+    - B: matriz (n_receitas x n_ingredientes)
+    - receitas: nomes das receitas (linhas)
+    - ingredientes: nomes dos ingredientes (colunas)
+    - tipos: tipo de cada ingrediente (o da primeira receita em que aparece)
+    """
+
+    def __init__(self, B, receitas, ingredientes, tipos):
+        self.B = B
+        self.receitas = receitas
+        self.ingredientes = ingredientes
+        self.tipos = tipos
+
+    @classmethod
+    def de_receitas(cls, receitas):
+        """
+        Monta a matriz a partir de um dicionário {receita: {tipo: [ingredientes]}}
+        ou de um iterável de pares (receita, categorias), que pode ser lido sob
+        demanda para bancos grandes.
+        """
+        if isinstance(receitas, dict):
+            receitas = receitas.items()
+
+        indice, tipos, nomes = {}, [], []
+        indptr, indices = [0], []
+        for receita, categorias in receitas:
+            colunas = set()
+            for tipo, ingredientes in categorias.items():
+                for ingrediente in ingredientes:
+                    j = indice.get(ingrediente)
+                    if j is None:
+                        j = indice[ingrediente] = len(tipos)
+                        tipos.append(tipo)
+                    colunas.add(j)
+            indices.extend(sorted(colunas))
+            indptr.append(len(indices))
+            nomes.append(receita)
+
+        indices = np.array(indices, dtype=np.int32)
+        B = sparse.csr_matrix((np.ones(len(indices), dtype=np.int32), indices, np.array(indptr, dtype=np.int64)),
+                              shape=(len(nomes), len(tipos)))
+        return cls(B, nomes, list(indice), tipos)
+
+    @property
+    def frequencia(self):
+        """Número de receitas em que cada ingrediente aparece."""
+        return np.asarray(self.B.sum(axis=0)).ravel()
+
+    def coocorrencia(self):
+        """
+        Matriz de co-ocorrência C = Bᵀ·B (uma multiplicação esparsa), apenas o
+        triângulo superior sem a diagonal: C[i, j] = receitas com i e j.
+        """
+        C = (self.B.T @ self.B).tocoo()
+        acima = C.row < C.col
+        return sparse.coo_matrix((C.data[acima], (C.row[acima], C.col[acima])), shape=C.shape)
+
+    def lista_arestas(self, peso_minimo=1):
+        """
+        Lista compacta de arestas em arrays NumPy.
+
+        Retorna:
+        - origem, destino: índices dos ingredientes (origem < destino)
+        - peso: número de receitas em comum
+        """
+        C = self.coocorrencia()
+        manter = C.data >= peso_minimo
+        return C.row[manter], C.col[manter], C.data[manter]
+
+    def para_networkx(self, peso_minimo=1):
+        """Grafo de co-ocorrência com atributo 'tipo' nos nós e 'peso' nas arestas."""
+        G = nx.Graph()
+        G.add_nodes_from((ing, {'tipo': tipo}) for ing, tipo in zip(self.ingredientes, self.tipos))
+        origem, destino, peso = self.lista_arestas(peso_minimo)
+        nomes = self.ingredientes
+        G.add_edges_from((nomes[i], nomes[j], {'peso': int(p)})
+                         for i, j, p in zip(origem.tolist(), destino.tolist(), peso.tolist()))
+        return G
+
+
+# Função para construir o grafo de co-ocorrência direto do arquivo JSON
+def grafo_coocorrencia(arquivo, peso_minimo=1):
+    return Incidencia.de_receitas(carregar_receitas(arquivo)).para_networkx(peso_minimo)
@@ -1,41 +1,38 @@
-import json
 import networkx as nx
-import itertools
 import matplotlib.pyplot as plt
 
+from coocorrencia import carregar_receitas, Incidencia
+from associacao import backbone, grafo_associacao
+from layout import layout_em_cache
+from comunidades import analise_estrutural
+
 # Carregar o JSON
-with open('comidas_db.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+data = carregar_receitas('igredientes.json')
 
-# Criar o grafo
-G = nx.Graph()
+# Receitas como matriz esparsa receita x ingrediente; os pesos das arestas
+# (receitas em comum) saem de uma única multiplicação Bᵀ·B
+incidencia = Incidencia.de_receitas(data)
 
-# Construir o grafo
-for receita, categorias in data.items():
-    ingredientes_na_receita = []
+# Comunidades (Louvain ponderado), matriz de mistura e assortatividade por tipo
+estrutura = analise_estrutural(incidencia)
+print(f"Assortatividade por tipo de ingrediente: {estrutura['assortatividade']:.4f}")
+print(f"Assortatividade ponderada pelo número de receitas: {estrutura['assortatividade_ponderada']:.4f}")
+print(f"Comunidades: {estrutura['comunidades'].max() + 1} (modularidade {estrutura['modularidade']:.4f})")
 
-    # Para cada categoria, adiciona o ingrediente e o tipo
-    for tipo, ingredientes in categorias.items():
-        for ingrediente in ingredientes:
-            if not G.has_node(ingrediente):
-                G.add_node(ingrediente, tipo=tipo)
-            ingredientes_na_receita.append(ingrediente)
-    
-    # Conectar todos os ingredientes entre si na mesma receita
-    for ing1, ing2 in itertools.combinations(ingredientes_na_receita, 2):
-        if G.has_edge(ing1, ing2):
-            G[ing1][ing2]["peso"] += 1
-        else:
-            G.add_edge(ing1, ing2, peso=1)
+# Backbone: para cada ingrediente, as 3 associações de maior NPMI. Reduz o peso
+# de ingredientes onipresentes (sal, óleo) antes do layout e da assortatividade
+arestas_backbone = backbone(incidencia, metodo='topk', escore='npmi', k=3)
+G = grafo_associacao(incidencia, arestas_backbone)
 
-assortatividade = nx.attribute_assortativity_coefficient(G, 'tipo')
-print(f"Assortatividade por tipo de ingrediente: {assortatividade:.4f}")
+estrutura_backbone = analise_estrutural(incidencia, arestas_backbone)
+print(f"Assortatividade por tipo de ingrediente (backbone): {estrutura_backbone['assortatividade']:.4f}")
 
 # Agora vamos plotar
 plt.figure(figsize=(22, 22))  # Deixar o gráfico grande
 
-# Layout
-pos = nx.spring_layout(G, seed=42)
+# Layout de forças vetorizado, com cache em disco por hash do grafo: se as
+# receitas mudarem, parte das posições anteriores
+pos = layout_em_cache(G, seed=42)
 
 # Nova paleta suave
 tipo_to_color = {
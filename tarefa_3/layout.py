@@ -0,0 +1,196 @@
+import os
+import glob
+import pickle
+import hashlib
+
+import numpy as np
+
+# Acima deste número de nós a repulsão usa a grade (só vizinhos a até 2k)
+LIMITE_EXATO = 1000
+
+
+def _repulsao_exata(pos, k):
+    # Todos os pares: sum_j f_ij * (p_i - p_j) = p_i * sum_j f_ij - (F @ P)_i,
+    # em blocos de linhas para limitar a memória
+    n = len(pos)
+    quadrados = (pos ** 2).sum(axis=1)
+    deslocamento = np.empty_like(pos)
+    bloco = max(1, 4_000_000 // n)
+    for inicio in range(0, n, bloco):
+        fim = min(inicio + bloco, n)
+        dist2 = quadrados[inicio:fim, None] + quadrados[None, :] - 2 * pos[inicio:fim] @ pos.T
+        forca = k * k / np.maximum(dist2, 1e-4)
+        forca[np.arange(fim - inicio), np.arange(inicio, fim)] = 0.0
+        deslocamento[inicio:fim] = pos[inicio:fim] * forca.sum(axis=1)[:, None] - forca @ pos
+    return deslocamento
+
+
+def _repulsao_grade(pos, k):
+    # Variante em grade de Fruchterman-Reingold: cada nó só é repelido pelos nós
+    # das 9 células vizinhas (células de lado 2k), o que torna a iteração ~O(n)
+    n = len(pos)
+    lado = 2 * k
+    celula_xy = np.floor((pos - pos.min(axis=0)) / lado).astype(np.int64)
+    largura = int(celula_xy[:, 0].max()) + 3
+    altura = int(celula_xy[:, 1].max()) + 3
+    celula_xy += 1  # borda vazia: vizinhos nunca saem da grade
+    celula = celula_xy[:, 0] * altura + celula_xy[:, 1]
+
+    ordem = np.argsort(celula, kind='stable')
+    contagem = np.bincount(celula, minlength=largura * altura)
+    inicio = np.concatenate([[0], np.cumsum(contagem)[:-1]])
+
+    deslocamento = np.zeros_like(pos)
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            vizinha = celula + dx * altura + dy
+            quantos = contagem[vizinha]
+            i = np.repeat(np.arange(n), quantos)
+            deslocamento_local = np.arange(len(i)) - np.repeat(np.cumsum(quantos) - quantos, quantos)
+            j = ordem[np.repeat(inicio[vizinha], quantos) + deslocamento_local]
+
+            delta = pos[i] - pos[j]
+            dist2 = (delta ** 2).sum(axis=1)
+            valido = (i != j) & (dist2 < lado * lado)
+            forca = np.where(valido, k * k / np.maximum(dist2, 1e-4), 0.0)
+            deslocamento[:, 0] += np.bincount(i, delta[:, 0] * forca, n)
+            deslocamento[:, 1] += np.bincount(i, delta[:, 1] * forca, n)
+    return deslocamento
+
+
+def layout_forca(origem, destino, n, pesos=None, pos_inicial=None, iteracoes=50, seed=42,
+                 temperatura=None, gravidade=0.01):
+    """
+    Layout de forças (Fruchterman-Reingold) vetorizado com NumPy.
+
+    Parâmetros:
+    - origem, destino: arrays de índices das arestas
+    - n: número de nós
+    - pesos: peso de cada aresta (multiplica a atração); padrão 1
+    - pos_inicial: array (n x 2) para começar de um layout anterior
+    - iteracoes: número de iterações
+    - temperatura: deslocamento máximo inicial (padrão 0.1, ou 0.02 com pos_inicial)
+    - gravidade: atração para o centro, mantém componentes desconexos juntos
+
+    Retorna:
+    - array (n x 2) com as posições reescaladas para [-1, 1]
+    """
+    rng = np.random.default_rng(seed)
+    pos = rng.random((n, 2)) if pos_inicial is None else np.array(pos_inicial, dtype=np.float64)
+    if n <= 1:
+        return np.zeros((n, 2))
+
+    # Trabalha no quadrado unitário, como o spring_layout do NetworkX
+    pos = (pos - pos.min(axis=0)) / np.maximum(np.ptp(pos, axis=0), 1e-9)
+    pesos = np.ones(len(origem)) if pesos is None else np.asarray(pesos, dtype=np.float64)
+    k = np.sqrt(1.0 / n)
+    repulsao = _repulsao_exata if n <= LIMITE_EXATO else _repulsao_grade
+
+    if temperatura is None:
+        temperatura = 0.1 if pos_inicial is None else 0.02
+    passo = temperatura / (iteracoes + 1)
+
+    for _ in range(iteracoes):
+        deslocamento = repulsao(pos, k)
+
+        delta = pos[origem] - pos[destino]
+        dist = np.maximum(np.sqrt((delta ** 2).sum(axis=1)), 0.01)
+        atracao = delta * (pesos * dist / k)[:, None]
+        for eixo in (0, 1):
+            deslocamento[:, eixo] -= np.bincount(origem, atracao[:, eixo], n)
+            deslocamento[:, eixo] += np.bincount(destino, atracao[:, eixo], n)
+
+        deslocamento -= gravidade * (pos - pos.mean(axis=0)) / k
+
+        tamanho = np.maximum(np.sqrt((deslocamento ** 2).sum(axis=1)), 0.01)
+        pos += deslocamento * (temperatura / tamanho)[:, None]
+        temperatura -= passo
+
+    pos -= pos.mean(axis=0)
+    return pos / max(np.abs(pos).max(), 1e-9)
+
+
+def _hash_grafo(nos, arestas):
+    h = hashlib.sha1()
+    for no in nos:
+        h.update(repr(no).encode())
+        h.update(b'\0')
+    h.update(b'|')
+    for u, v, p in arestas:
+        h.update(repr((u, v, p)).encode())
+    return h.hexdigest()[:16]
+
+
+def _layout_anterior(pasta_cache):
+    # Layout mais recente do cache (para começar dele quando o grafo muda)
+    arquivos = glob.glob(os.path.join(pasta_cache, 'layout_*.pkl'))
+    if not arquivos:
+        return {}
+    with open(max(arquivos, key=os.path.getmtime), 'rb') as f:
+        return pickle.load(f)
+
+
+def layout_em_cache(G, peso=None, pasta_cache='cache', iteracoes=50, seed=42):
+    """
+    Posições dos nós de G com cache em disco identificado pelo hash do grafo.
+
+    - Grafo já visto: as posições são lidas do cache.
+    - Grafo novo: o layout parte do último layout salvo; nós que já existiam
+      mantêm a posição e nós novos começam na média dos vizinhos já posicionados.
+      Nesse caso bastam poucas iterações com temperatura baixa.
+
+    Parâmetros:
+    - G: grafo NetworkX
+    - peso: atributo de aresta usado como peso da atração (padrão: sem peso)
+    - pasta_cache: pasta do cache (None desativa)
+
+    Retorna:
+    - dicionário {nó: array([x, y])}, como o nx.spring_layout
+    """
+    nos = sorted(G.nodes, key=repr)
+    indice = {no: i for i, no in enumerate(nos)}
+    arestas = sorted(((*sorted((indice[u], indice[v])), 1.0 if peso is None else float(d.get(peso, 1.0)))
+                      for u, v, d in G.edges(data=True) if u != v))
+
+    arquivo = None
+    if pasta_cache is not None:
+        arquivo = os.path.join(pasta_cache, f"layout_{_hash_grafo(nos, arestas)}.pkl")
+        if os.path.exists(arquivo):
+            print(f"Layout carregado do cache: {arquivo}")
+            with open(arquivo, 'rb') as f:
+                return {no: np.array(xy) for no, xy in pickle.load(f).items()}
+
+    n = len(nos)
+    origem = np.array([a[0] for a in arestas], dtype=np.int64)
+    destino = np.array([a[1] for a in arestas], dtype=np.int64)
+    pesos = np.array([a[2] for a in arestas], dtype=np.float64)
+    if peso is not None and len(pesos):
+        pesos = pesos / pesos.max()
+
+    anterior = _layout_anterior(pasta_cache) if pasta_cache is not None else {}
+    conhecidos = np.array([no in anterior for no in nos], dtype=bool)
+    pos_inicial = None
+    if conhecidos.any():
+        pos_inicial = np.random.default_rng(seed).uniform(-1, 1, (n, 2))
+        pos_inicial[conhecidos] = [anterior[no] for no in nos if no in anterior]
+        # Nós novos: média dos vizinhos já posicionados
+        novos = ~conhecidos
+        soma = np.zeros((n, 2))
+        vizinhos = np.zeros(n)
+        for a, b in ((origem, destino), (destino, origem)):
+            usar = conhecidos[b] & novos[a]
+            np.add.at(soma, a[usar], pos_inicial[b[usar]])
+            vizinhos += np.bincount(a[usar], minlength=n)
+        com_vizinhos = vizinhos > 0
+        pos_inicial[com_vizinhos] = soma[com_vizinhos] / vizinhos[com_vizinhos, None]
+        iteracoes = max(10, iteracoes // 3) if conhecidos.mean() > 0.9 else iteracoes
+        print(f"Layout partindo do anterior: {int(conhecidos.sum())} de {n} nós já posicionados")
+
+    pos = layout_forca(origem, destino, n, pesos, pos_inicial, iteracoes, seed)
+    resultado = {no: pos[i] for i, no in enumerate(nos)}
+
+    if arquivo is not None:
+        os.makedirs(pasta_cache, exist_ok=True)
+        with open(arquivo, 'wb') as f:
+            pickle.dump({no: xy.tolist() for no, xy in resultado.items()}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return resultado
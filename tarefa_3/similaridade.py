@@ -0,0 +1,268 @@
+import sys
+
+import numpy as np
+from scipy import sparse
+
+from coocorrencia import Incidencia, carregar_receitas
+
+PRIMO = (1 << 31) - 1
+# Limite de elementos da matriz de hashes calculada de uma vez
+ELEMENTOS_POR_BLOCO = 8_000_000
+
+
+def assinaturas_minhash(B, n_permutacoes=128, seed=42):
+    """
+    Assinaturas MinHash das linhas de uma matriz de incidência CSR, com as
+    permutações aproximadas por h(x) = (a*x + b) mod p. Receitas vazias ficam
+    com assinatura PRIMO em todas as posições.
+
+    Retorna:
+    - array (n_linhas x n_permutacoes) de int64
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, PRIMO, n_permutacoes, dtype=np.int64)[:, None]
+    b = rng.integers(0, PRIMO, n_permutacoes, dtype=np.int64)[:, None]
+
+    n = B.shape[0]
+    assinaturas = np.full((n, n_permutacoes), PRIMO, dtype=np.int64)
+    indptr, indices = B.indptr, B.indices.astype(np.int64)
+    linhas_por_bloco = max(1, ELEMENTOS_POR_BLOCO // max(n_permutacoes * max(B.nnz // max(n, 1), 1), 1))
+
+    for inicio in range(0, n, linhas_por_bloco):
+        fim = min(inicio + linhas_por_bloco, n)
+        tamanhos = np.diff(indptr[inicio:fim + 1])
+        cheias = np.flatnonzero(tamanhos > 0)
+        if not len(cheias):
+            continue
+        hashes = (a * indices[indptr[inicio]:indptr[fim]][None, :] + b) % PRIMO
+        posicoes = indptr[inicio:fim][cheias] - indptr[inicio]
+        assinaturas[inicio + cheias] = np.minimum.reduceat(hashes, posicoes, axis=1).T
+    return assinaturas
+
+
+class IndiceReceitas:
+    """
+    Índice de busca sobre as receitas: MinHash + LSH para "receitas parecidas
+    com esta" e similaridade de cosseno entre perfis de co-ocorrência para
+    substituição de ingredientes.
+
+    O LSH divide cada assinatura em `bandas` faixas; duas receitas viram
+    candidatas se coincidirem em alguma faixa. Cada faixa guarda as chaves
+    ordenadas, então uma consulta é uma busca binária por faixa e a
+    similaridade de Jaccard exata só é calculada para os candidatos.
+
+    Com r = n_permutacoes / bandas linhas por faixa, o LSH passa a achar os
+    pares a partir de Jaccard ~ (1/bandas)^(1/r). Nas receitas os vizinhos
+    mais próximos costumam ficar entre 0.2 e 0.3, por isso o padrão é
+    64 faixas de 2 linhas (~0.125); 32 faixas de 4 linhas (~0.42) perdem a
+    maioria deles.
+
+    Com limiar tão baixo, uma faixa sozinha também junta muitos pares pouco
+    parecidos (~11% do catálogo em 100 mil receitas sintéticas). Por isso o
+    Jaccard exato só é calculado para quem coincide em pelo menos min_colisoes
+    faixas, limitado às max_candidatos receitas com mais colisões. Em 100 mil
+    receitas (comunidades.gerar_receitas) isso dá recall@5 de 0.96 com ~400
+    candidatos e 1 a 2 ms por consulta, contra 11 ms da varredura exata; com
+    min_colisoes=1 e sem limite, o recall sobe para 0.99, mas cada consulta
+    compara ~11 mil receitas (~2 ms).
+
+    Parâmetros:
+    - incidencia: coocorrencia.Incidencia
+    - n_permutacoes: tamanho das assinaturas MinHash
+    - bandas: número de faixas do LSH (deve dividir n_permutacoes)
+    - limite_exato: catálogos com até essa quantidade de receitas são sempre
+      comparados por inteiro (mais rápido e exato nesse tamanho)
+    - min_colisoes: faixas coincidentes exigidas de um candidato
+    - max_candidatos: máximo de candidatos por consulta (None para não limitar)
+    """
+
+    def __init__(self, incidencia, n_permutacoes=128, bandas=64, seed=42, limite_exato=5000,
+                 min_colisoes=2, max_candidatos=500):
+        if n_permutacoes % bandas:
+            raise ValueError("n_permutacoes deve ser múltiplo de bandas")
+
+        self.incidencia = incidencia
+        self.B = incidencia.B.tocsr().astype(np.float64)
+        self.tamanhos = np.diff(self.B.indptr)
+        self.indice_receita = {r: i for i, r in enumerate(incidencia.receitas)}
+        self.indice_ingrediente = {ing: j for j, ing in enumerate(incidencia.ingredientes)}
+        self.seed = seed
+        self.n_permutacoes = n_permutacoes
+        self.bandas = bandas
+        self.limite_exato = limite_exato
+        self.min_colisoes = min_colisoes
+        self.max_candidatos = max_candidatos
+
+        self.assinaturas = assinaturas_minhash(incidencia.B, n_permutacoes, seed)
+        linhas = n_permutacoes // bandas
+        multiplicadores = np.random.default_rng(seed + 1).integers(
+            1, np.iinfo(np.int64).max, linhas, dtype=np.int64).astype(np.uint64)
+        self._multiplicadores = multiplicadores
+
+        self.chaves = np.empty((bandas, self.B.shape[0]), dtype=np.uint64)
+        self.ordem = np.empty((bandas, self.B.shape[0]), dtype=np.int64)
+        for banda, chaves in enumerate(self._chaves_bandas(self.assinaturas)):
+            self.ordem[banda] = np.argsort(chaves, kind='stable')
+            self.chaves[banda] = chaves[self.ordem[banda]]
+
+        self._perfis = None
+
+    def _chaves_bandas(self, assinaturas):
+        # Uma chave de 64 bits por faixa (combinação linear com estouro)
+        linhas = self.n_permutacoes // self.bandas
+        faixas = assinaturas.astype(np.uint64).reshape(len(assinaturas), self.bandas, linhas)
+        return (faixas * self._multiplicadores).sum(axis=2).T
+
+    def _vetor(self, receita):
+        # Linha da receita ou vetor de um conjunto de ingredientes
+        if isinstance(receita, str):
+            i = self.indice_receita[receita]
+            return self.B[i], self.assinaturas[i:i + 1], i
+        colunas = sorted({self.indice_ingrediente[ing] for ing in receita if ing in self.indice_ingrediente})
+        linha = sparse.csr_matrix((np.ones(len(colunas)), colunas, [0, len(colunas)]),
+                                  shape=(1, self.B.shape[1]))
+        return linha, assinaturas_minhash(linha, self.n_permutacoes, self.seed), None
+
+    def candidatos(self, assinatura, min_colisoes=1, maximo=None):
+        """
+        Receitas que coincidem com a assinatura em pelo menos min_colisoes faixas
+        do LSH. O número de faixas coincidentes cresce com o Jaccard, então com
+        maximo ficam só as receitas com mais colisões.
+        """
+        encontrados = []
+        for banda, chave in enumerate(self._chaves_bandas(assinatura)[:, 0]):
+            a = np.searchsorted(self.chaves[banda], chave, side='left')
+            b = np.searchsorted(self.chaves[banda], chave, side='right')
+            encontrados.append(self.ordem[banda, a:b])
+        if not encontrados:
+            return np.array([], dtype=np.int64)
+        receitas, colisoes = np.unique(np.concatenate(encontrados), return_counts=True)
+        manter = colisoes >= min_colisoes
+        receitas, colisoes = receitas[manter], colisoes[manter]
+        if maximo is not None and len(receitas) > maximo:
+            receitas = np.sort(receitas[np.argpartition(-colisoes, maximo - 1)[:maximo]])
+        return receitas
+
+    def similares(self, receita, k=5, exato=False):
+        """
+        Receitas mais parecidas (Jaccard dos conjuntos de ingredientes).
+
+        Parâmetros:
+        - receita: nome de uma receita do banco ou um conjunto de ingredientes
+        - k: quantidade de resultados
+        - exato: compara com todas as receitas em vez de só com os candidatos do LSH;
+          também é usado em catálogos pequenos (limite_exato) e quando o LSH
+          devolve menos de k candidatos, mesmo aceitando uma única colisão
+
+        Retorna:
+        - lista de (receita, jaccard) em ordem decrescente
+        """
+        linha, assinatura, propria = self._vetor(receita)
+        todos = np.arange(self.B.shape[0])
+        exato = exato or self.B.shape[0] <= self.limite_exato
+        if exato:
+            candidatos = todos
+        else:
+            candidatos = self.candidatos(assinatura, self.min_colisoes, self.max_candidatos)
+        if propria is not None:
+            candidatos = candidatos[candidatos != propria]
+        if not exato and len(candidatos) < k and self.min_colisoes > 1:
+            # Poucos candidatos fortes: aceita quem coincide em uma faixa só
+            candidatos = self.candidatos(assinatura)
+            if propria is not None:
+                candidatos = candidatos[candidatos != propria]
+        if not exato and len(candidatos) < k:
+            candidatos = todos if propria is None else todos[todos != propria]
+        if not len(candidatos):
+            return []
+
+        intersecao = np.asarray((self.B[candidatos] @ linha.T).todense()).ravel()
+        uniao = self.tamanhos[candidatos] + linha.nnz - intersecao
+        jaccard = np.divide(intersecao, uniao, out=np.zeros_like(intersecao), where=uniao > 0)
+
+        melhores = np.argsort(-jaccard, kind='stable')[:k]
+        receitas = self.incidencia.receitas
+        return [(receitas[candidatos[i]], float(jaccard[i])) for i in melhores if jaccard[i] > 0]
+
+    def _perfis_coocorrencia(self):
+        # Linhas de Bᵀ·B (sem a diagonal) normalizadas: produto interno = cosseno
+        if self._perfis is None:
+            C = (self.B.T @ self.B).tocsr()
+            C.setdiag(0)
+            C.eliminate_zeros()
+            normas = np.sqrt(np.asarray(C.multiply(C).sum(axis=1)).ravel())
+            normas[normas == 0] = 1.0
+            self._perfis = sparse.diags(1.0 / normas) @ C
+            self._perfis_t = self._perfis.T.tocsr()
+        return self._perfis
+
+    def substitutos(self, ingrediente, k=5, mesmo_tipo=False, excluir_coocorrentes=False):
+        """
+        Ingredientes com vizinhança de co-ocorrência parecida (cosseno entre as
+        linhas de Bᵀ·B). Só os ingredientes que compartilham algum vizinho com o
+        consultado são tocados pelo produto esparso.
+
+        Parâmetros:
+        - ingrediente: nome do ingrediente
+        - mesmo_tipo: restringe ao mesmo tipo (proteína, tempero...)
+        - excluir_coocorrentes: descarta ingredientes que já aparecem junto com ele
+
+        Retorna:
+        - lista de (ingrediente, cosseno) em ordem decrescente
+        """
+        perfis = self._perfis_coocorrencia()
+        j = self.indice_ingrediente[ingrediente]
+        escores = (perfis[j] @ self._perfis_t).tocoo()
+        colunas, valores = escores.col, escores.data
+
+        manter = colunas != j
+        tipos = self.incidencia.tipos
+        if mesmo_tipo:
+            manter &= np.array([tipos[c] == tipos[j] for c in colunas.tolist()], dtype=bool)
+        if excluir_coocorrentes:
+            manter &= ~np.isin(colunas, perfis[j].indices)
+        colunas, valores = colunas[manter], valores[manter]
+
+        melhores = np.argsort(-valores, kind='stable')[:k]
+        nomes = self.incidencia.ingredientes
+        return [(nomes[colunas[i]], float(valores[i])) for i in melhores]
+
+    def similaridade_em_lote(self, limiar=0.5, bloco=1024):
+        """
+        Compara o catálogo inteiro consigo mesmo: Jaccard exato de todos os pares
+        via produtos esparsos B[bloco]·Bᵀ, um bloco de receitas por vez.
+
+        Retorna:
+        - origem, destino, jaccard: arrays dos pares (origem < destino) com
+          jaccard >= limiar
+        """
+        BT = self.B.T.tocsr()
+        partes = []
+        for inicio in range(0, self.B.shape[0], bloco):
+            intersecao = (self.B[inicio:inicio + bloco] @ BT).tocoo()
+            linhas = intersecao.row + inicio
+            acima = intersecao.col > linhas
+            linhas, colunas, inter = linhas[acima], intersecao.col[acima], intersecao.data[acima]
+            jaccard = inter / (self.tamanhos[linhas] + self.tamanhos[colunas] - inter)
+            manter = jaccard >= limiar
+            partes.append((linhas[manter], colunas[manter], jaccard[manter]))
+
+        if not partes:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.int64), np.array([])
+        return tuple(np.concatenate(p) for p in zip(*partes))
+
+
+if __name__ == "__main__":
+    # Uso: python similaridade.py "nome da receita" [ingrediente]
+    incidencia = Incidencia.de_receitas(carregar_receitas('igredientes.json'))
+    indice = IndiceReceitas(incidencia)
+
+    receita = sys.argv[1] if len(sys.argv) > 1 else incidencia.receitas[0]
+    print(f"Receitas parecidas com '{receita}':")
+    for nome, jaccard in indice.similares(receita, k=5):
+        print(f"  {nome}: {jaccard:.3f}")
+
+    if len(sys.argv) > 2:
+        print(f"Substitutos para '{sys.argv[2]}':")
+        for nome, cosseno in indice.substitutos(sys.argv[2], k=5, mesmo_tipo=True):
+            print(f"  {nome}: {cosseno:.3f}")
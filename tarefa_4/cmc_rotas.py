@@ -0,0 +1,168 @@
+# Rotas do Hospital Walfredo Gurgel para bairros de Natal, com o motor de
+# roteamento escolhido pelo nome (núcleo em compartilhado/roteamento).
+# cmc_dijkstra_trad.py e cmc_dijkstra_min_heap.py chamam executar() com o
+# motor de cada um; as emissões de cada execução ficam em emissions/.
+#
+# Uso (de dentro de tarefa_4/):
+# $ python cmc_rotas.py --motor heap
+# $ python cmc_rotas.py --motor a_star --saida rotas.png --sem-janela
+
+import argparse
+import os
+import sys
+import time
+
+# Raiz do repositório no path para importar o pacote compartilhado
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from compartilhado.metricas import METRICAS
+from compartilhado.roteamento import (
+    MOTORES,
+    obter_motor,
+    obter_dados_estradas,
+    criar_grafo,
+    encontrar_no_mais_proximo,
+    estimar_tempo
+)
+
+# Coordenadas dos bairros
+hospital = (-5.8098114, -35.2028957)  # Hospital Walfredo Gurgel
+destinos = {
+    "Lagoa Nova": (-5.8258482, -35.2351506),
+    "Tirol": (-5.799086, -35.2204163),
+    "Capim Macio": (-5.8565295, -35.2184822),
+    "Alecrim": (-5.7970756, -35.2287974),
+    "Potengi": (-5.7521007, -35.2674567),
+}
+
+# Definir limites para extrair dados do OpenStreetMap (bounding box para Natal-RN)
+bounds = (-5.87, -35.28, -5.73, -35.19)
+
+# Cores para as rotas
+cores = ['red', 'blue', 'green', 'orange', 'purple']
+
+# Função para plotar o grafo e as rotas
+# Com mostrar=False a figura não abre janela (útil em lote / sem display);
+# com arquivo_saida ela é salva em PNG
+def plotar_grafo_e_rotas(graph, node_coords, rotas, cores, mostrar=True, arquivo_saida=None):
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+
+    plt.figure(figsize=(15, 15))
+
+    # Plotar arestas
+    # (todas as arestas numa única LineCollection em vez de um plt.plot por aresta)
+    segmentos = [[(node_coords[node][1], node_coords[node][0]),  # lon, lat
+                  (node_coords[neighbor][1], node_coords[neighbor][0])]
+                 for node in graph if node in node_coords
+                 for neighbor, _, _ in graph[node] if neighbor in node_coords]
+    plt.gca().add_collection(LineCollection(segmentos, colors='k', linewidths=0.2, alpha=0.3))
+
+    # Plotar rotas
+    for i, (rota, cor) in enumerate(zip(rotas, cores)):
+        x_coords = [node_coords[node][1] for node in rota]  # lon
+        y_coords = [node_coords[node][0] for node in rota]  # lat
+        plt.plot(x_coords, y_coords, color=cor, linewidth=2, label=list(destinos.keys())[i])
+
+    # Plotar o hospital
+    plt.plot(hospital[1], hospital[0], 'ro', markersize=10, label='Hospital')
+
+    # Plotar destinos
+    for bairro, (lat, lon) in destinos.items():
+        plt.plot(lon, lat, 'go', markersize=8)
+        plt.text(lon, lat, bairro, fontsize=12)
+
+    plt.title("Rotas do Hospital Walfredo Gurgel para diferentes bairros de Natal")
+    plt.legend()
+    plt.xlabel("Longitude")
+    plt.ylabel("Latitude")
+    plt.grid(True)
+    plt.tight_layout()
+    if arquivo_saida:
+        plt.savefig(arquivo_saida, dpi=150)
+        print(f"Figura salva em '{arquivo_saida}'")
+    if mostrar:
+        plt.show()
+    else:
+        plt.close()
+
+# Função para calcular e plotar as rotas com um motor, medindo as emissões
+def executar(motor, rotulo=None, mostrar=True, arquivo_saida=None):
+    """
+    Baixa a rede viária, calcula a rota do hospital até cada bairro com o
+    motor escolhido e plota todas no mesmo mapa.
+
+    Parâmetros:
+    - motor: nome do motor registrado ('trad', 'heap', 'a_star')
+    - rotulo: nome da execução (CSV do CodeCarbon em emissions/ e chave em
+      emissions/metricas.json); padrão é o nome do motor
+    - mostrar / arquivo_saida: repassados para plotar_grafo_e_rotas
+
+    Retorna:
+    - lista com a rota (lista de nós) de cada bairro
+    """
+    from codecarbon import EmissionsTracker
+
+    motor = obter_motor(motor)
+    rotulo = rotulo or motor.nome
+
+    # Iniciar o rastreador de emissões
+    tracker = EmissionsTracker(output_dir='emissions', output_file=f"{rotulo}.csv")
+    tracker.start()
+
+    print("Baixando dados do OpenStreetMap...")
+    data = obter_dados_estradas(bounds)
+
+    print("Criando grafo da rede viária...")
+    graph, node_coords = criar_grafo(data)
+
+    print(f"Grafo criado com {len(graph)} nós.")
+
+    # Encontrar o nó mais próximo ao hospital
+    no_hospital = encontrar_no_mais_proximo(node_coords, hospital[0], hospital[1])
+    print(f"Nó mais próximo ao hospital: {no_hospital}")
+
+    # Calcular rotas, distâncias e tempos estimados
+    rotas = []
+    print(f"\nCalculando rotas, distâncias e tempos estimados ({motor.descricao}):")
+    for bairro, coords in destinos.items():
+        # Encontrar o nó mais próximo ao destino
+        no_destino = encontrar_no_mais_proximo(node_coords, coords[0], coords[1])
+
+        print(f"Calculando rota para {bairro}...")
+        inicio = time.time()
+        path, distancia = motor.caminho(graph, no_hospital, no_destino, node_coords)
+        fim = time.time()
+
+        # Estimar tempo de deslocamento
+        tempo_min = estimar_tempo(graph, path)
+
+        print(f"{bairro}: {distancia:.2f} metros, tempo estimado = {tempo_min:.2f} minutos")
+        print(f"Tempo de cálculo: {(fim - inicio):.2f} segundos, Nós na rota: {len(path)}")
+
+        rotas.append(path)
+
+    # Plotar todas as rotas no mesmo mapa
+    print("\nPlotando rotas...")
+    plotar_grafo_e_rotas(graph, node_coords, rotas, cores, mostrar, arquivo_saida)
+
+    # Parar o rastreador e exibir as emissões
+    emissions = tracker.stop()
+    print(f"\nEmissões de CO2 estimadas: {emissions:.6f} kg")
+
+    # Consultas e nós assentados, para normalizar as emissões (python emissions_plot.py)
+    METRICAS.salvar("emissions/metricas.json", rotulo)
+
+    return rotas
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rotas do Hospital Walfredo Gurgel para bairros de Natal")
+    parser.add_argument("--motor", default="heap", help=f"motor de roteamento ({', '.join(sorted(MOTORES))})")
+    parser.add_argument("--rotulo", help="nome da execução em emissions/ (padrão: nome do motor)")
+    parser.add_argument("--saida", help="salva a figura neste PNG")
+    parser.add_argument("--sem-janela", action="store_true", help="não abre a janela do matplotlib")
+    args = parser.parse_args(argv)
+
+    executar(args.motor, args.rotulo, mostrar=not args.sem_janela, arquivo_saida=args.saida)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+import numpy as np
+
+from geo_functions import projetar_coordenadas
+from graph_functions import matriz_distancias_rede
+
+# Atribui cada ponto a um centro respeitando a capacidade máxima de cada cluster
+def _atribuir_balanceado(distancias, capacidade):
+    """
+    Atribuição gulosa com capacidade: percorre os pares (ponto, centro) em ordem
+    crescente de distância e aloca o ponto ao centro se ainda houver vaga.
+
+    Parâmetros:
+    - distancias: array numpy (n_pontos x n_clusters)
+    - capacidade: número máximo de pontos por cluster
+
+    Retorna:
+    - array numpy com o cluster de cada ponto
+    """
+    n_pontos, n_clusters = distancias.shape
+    labels = np.full(n_pontos, -1)
+    ocupacao = np.zeros(n_clusters, dtype=int)
+
+    for idx in np.argsort(distancias, axis=None, kind='stable'):
+        ponto, cluster = divmod(int(idx), n_clusters)
+        if labels[ponto] == -1 and ocupacao[cluster] < capacidade:
+            labels[ponto] = cluster
+            ocupacao[cluster] += 1
+
+    return labels
+
+# Agrupa os pontos com k-medoids sobre uma matriz de distâncias pré-calculada
+def _k_medoids(matriz, n_clusters, capacidade=None, max_iter=100, seed=42):
+    """
+    K-medoids (iteração alternada, estilo Voronoi) sobre uma matriz de distâncias.
+
+    Parâmetros:
+    - matriz: array numpy (n x n) simétrico com as distâncias entre os pontos
+    - n_clusters: número de clusters desejado
+    - capacidade: se informado, limita a quantidade de pontos por cluster
+    - max_iter: número máximo de iterações
+    - seed: semente para a inicialização (k-medoids++)
+
+    Retorna:
+    - labels: array numpy com o cluster de cada ponto
+    - medoids: lista com o índice do ponto medoide de cada cluster
+    """
+    n = len(matriz)
+    rng = np.random.default_rng(seed)
+
+    # Inicialização k-medoids++: o primeiro medoide é o ponto mais central
+    medoids = [int(np.argmin(matriz.sum(axis=1)))]
+    while len(medoids) < n_clusters:
+        pesos = matriz[:, medoids].min(axis=1) ** 2
+        if pesos.sum() == 0:
+            candidatos = [i for i in range(n) if i not in medoids]
+            medoids.append(int(rng.choice(candidatos)))
+        else:
+            medoids.append(int(rng.choice(n, p=pesos / pesos.sum())))
+
+    labels = None
+    for _ in range(max_iter):
+        distancias = matriz[:, medoids]
+        if capacidade is None:
+            labels = np.argmin(distancias, axis=1)
+        else:
+            labels = _atribuir_balanceado(distancias, capacidade)
+
+        # Novo medoide: ponto que minimiza a soma das distâncias dentro do cluster
+        novos_medoids = []
+        for c in range(n_clusters):
+            membros = np.flatnonzero(labels == c)
+            if len(membros) == 0:
+                novos_medoids.append(medoids[c])
+                continue
+            sub = matriz[np.ix_(membros, membros)]
+            novos_medoids.append(int(membros[np.argmin(sub.sum(axis=1))]))
+
+        if novos_medoids == medoids:
+            break
+        medoids = novos_medoids
+
+    return labels, medoids
+
+# Função para avaliar a qualidade dos clusters em quilômetros de rede viária
+def relatorio_clusters_km(labels_clusters, nomes, matriz):
+    """
+    Avalia a qualidade dos clusters usando distâncias pela rede viária. Para cada
+    cluster, calcula o medoide e a distância média/máxima dos pontos até ele.
+    Pares sem caminho pela rede (np.inf) ficam fora das médias e são contados
+    em 'pares_sem_caminho'.
+
+    Parâmetros:
+    - labels_clusters: dicionário {nome: cluster_id}
+    - nomes: lista com os nomes dos destinos na mesma ordem da matriz
+    - matriz: matriz de distâncias pela rede em metros (ver matriz_distancias_rede)
+
+    Retorna:
+    - dicionário {cluster_id: {'pontos', 'medoide', 'media_km', 'max_km', 'soma_km',
+      'pares_sem_caminho'}}
+    """
+    # Distância simétrica: média ida/volta (vias de mão única)
+    simetrica = (matriz + matriz.T) / 2
+    labels = np.array([labels_clusters[nome] for nome in nomes])
+
+    print("\n=== QUALIDADE DOS CLUSTERS (distância pela rede viária) ===")
+    relatorio = {}
+    for cluster_id in sorted(set(labels.tolist())):
+        membros = np.flatnonzero(labels == cluster_id)
+        sub = simetrica[np.ix_(membros, membros)]
+        finitos = np.isfinite(sub)
+        pares_sem_caminho = int((~finitos).sum() // 2)
+
+        # Medoide: o ponto que alcança mais membros e, entre esses, com a menor soma
+        sem_caminho = (~finitos).sum(axis=1)
+        soma = np.where(finitos, sub, 0).sum(axis=1)
+        i_medoide = np.lexsort((soma, sem_caminho))[0]
+        medoide = membros[i_medoide]
+        dists_km = sub[i_medoide][finitos[i_medoide]] / 1000
+
+        relatorio[cluster_id] = {
+            'pontos': len(membros),
+            'medoide': nomes[medoide],
+            'media_km': float(dists_km.mean()),
+            'max_km': float(dists_km.max()),
+            'soma_km': float(dists_km.sum()),
+            'pares_sem_caminho': pares_sem_caminho
+        }
+        aviso = f", {pares_sem_caminho} par(es) sem caminho" if pares_sem_caminho else ""
+        print(f"Cluster {cluster_id + 1}: {len(membros)} pontos, medoide '{nomes[medoide]}', "
+              f"média {dists_km.mean():.2f} km, máx {dists_km.max():.2f} km{aviso}")
+
+    soma_total = sum(r['soma_km'] for r in relatorio.values())
+    print(f"Soma das distâncias aos medoides: {soma_total:.2f} km")
+    total_sem_caminho = sum(r['pares_sem_caminho'] for r in relatorio.values())
+    if total_sem_caminho:
+        print(f"Pares sem caminho pela rede (fora das médias): {total_sem_caminho}")
+    return relatorio
+
+# Função para dividir os destinos em clusters (subgrafos)
+def dividir_destinos_em_clusters(destinos, n_clusters=10, plotar=True, modo='kmeans',
+                                 graph=None, node_coords=None, balancear=False, folga=0, tabela=None):
+    """
+    Divide os destinos em clusters.
+
+    Modos disponíveis:
+    - 'kmeans': K-Means diretamente sobre [lon, lat] (comportamento original)
+    - 'projetado': K-Means sobre coordenadas projetadas em metros
+    - 'rede': k-medoids sobre a matriz de distâncias pela rede viária
+      (exige graph e node_coords)
+
+    Parâmetros:
+    - destinos: dicionário {nome: (lon, lat)}
+    - n_clusters: número de clusters desejado
+    - plotar: se True, exibe um gráfico dos clusters
+    - modo: 'kmeans', 'projetado' ou 'rede'
+    - graph, node_coords: rede viária; se informados, a qualidade dos clusters
+      é reportada em km pela rede em qualquer modo
+    - balancear: se True, cada cluster recebe no máximo ceil(n/k) + folga pontos
+    - folga: pontos extras permitidos por cluster quando balancear=True
+    - tabela: destinos já ajustados ao grafo (snap_functions); se informada, os
+      nós da matriz de distâncias são lidos dela em vez de ajustados de novo
+
+    Retorna:
+    - labels_clusters: dicionário {nome: cluster_id}
+    """
+    if modo not in ('kmeans', 'projetado', 'rede'):
+        raise ValueError(f"Modo de clusterização desconhecido: {modo}")
+    if modo == 'rede' and (graph is None or node_coords is None):
+        raise ValueError("O modo 'rede' exige graph e node_coords")
+
+    # Preparar os dados em formato adequado
+    if hasattr(destinos, 'lonlat'):
+        # DestinosColunares: usa a visão [lon, lat] diretamente, sem cópia
+        coords = destinos.lonlat
+        nomes = destinos.nomes
+    else:
+        coords = []
+        nomes = []
+        for nome, (lon, lat) in destinos.items():
+            coords.append([lon, lat])
+            nomes.append(nome)
+
+        coords = np.array(coords)
+    capacidade = -(-len(nomes) // n_clusters) + folga if balancear else None
+
+    # Matriz de distâncias pela rede (necessária no modo 'rede' e no relatório)
+    matriz = None
+    if graph is not None and node_coords is not None:
+        print("Calculando matriz de distâncias pela rede viária...")
+        if tabela is not None:
+            nos = [tabela['destinos'][nome]['no'] for nome in nomes]
+        else:
+            # Todos os destinos em uma única consulta à KD-tree
+            from compartilhado.roteamento.snap import IndiceNos
+            nos, _ = IndiceNos(node_coords).ajustar(coords[:, 1], coords[:, 0])
+        matriz = matriz_distancias_rede(graph, nos)
+
+    if modo == 'rede':
+        simetrica = (matriz + matriz.T) / 2
+        # Pares sem caminho recebem uma penalidade maior que qualquer distância real
+        finitos = simetrica[np.isfinite(simetrica)]
+        penalidade = (finitos.max() if finitos.size else 1.0) * 10
+        simetrica = np.where(np.isfinite(simetrica), simetrica, penalidade)
+        labels, _ = _k_medoids(simetrica, n_clusters, capacidade=capacidade)
+    else:
+        pontos = projetar_coordenadas(coords) if modo == 'projetado' else coords
+
+        # Rodar o K-Means (import tardio: o sklearn é pesado)
+        from sklearn.cluster import KMeans
+
+        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
+        kmeans.fit(pontos)
+        labels = kmeans.labels_
+
+        if capacidade is not None:
+            distancias = np.linalg.norm(
+                pontos[:, None, :] - kmeans.cluster_centers_[None, :, :], axis=2
+            )
+            labels = _atribuir_balanceado(distancias, capacidade)
+
+    # Construir dicionário de resultado
+    labels_clusters = {nome: int(label) for nome, label in zip(nomes, labels)}
+
+    if matriz is not None:
+        relatorio_clusters_km(labels_clusters, nomes, matriz)
+
+    # Plotar se desejado
+    if plotar:
+        import matplotlib.pyplot as plt
+
+        plt.figure(figsize=(10, 8))
+        cores = plt.cm.tab10(np.linspace(0, 1, n_clusters))
+        for i in range(n_clusters):
+            cluster_coords = coords[labels == i]
+            plt.scatter(cluster_coords[:,0], cluster_coords[:,1],
+                        color=cores[i], label=f'Cluster {i+1}', s=80, edgecolor='k')
+
+        plt.title(f"Clusters dos Destinos ({modo}, k={n_clusters})", fontsize=14)
+        plt.xlabel("Longitude")
+        plt.ylabel("Latitude")
+        plt.legend()
+        plt.grid(True)
+        plt.tight_layout()
+        plt.show()
+
+    return labels_clusters
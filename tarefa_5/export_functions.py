@@ -0,0 +1,172 @@
+import json
+import math
+
+import numpy as np
+
+# Metros por pixel no equador no zoom 0 (tiles de 256 px, Web Mercator)
+METROS_POR_PIXEL_Z0 = 156543.03392
+METROS_POR_GRAU = 111320.0
+
+# Função para calcular a tolerância do Douglas-Peucker (em graus) para um zoom
+def tolerancia_para_zoom(zoom, latitude, pixels=0.5):
+    """
+    Tolerância em graus equivalente a `pixels` pixels no nível de zoom dado:
+    desvios menores que isso não aparecem na tela até esse zoom.
+    """
+    metros_por_pixel = METROS_POR_PIXEL_Z0 * math.cos(math.radians(latitude)) / 2 ** zoom
+    return pixels * metros_por_pixel / METROS_POR_GRAU
+
+# Função para simplificar uma polilinha com Douglas-Peucker
+def douglas_peucker(coords, tolerancia):
+    """
+    Simplifica uma sequência de pontos (lat, lon) mantendo os que se afastam
+    mais que `tolerancia` (graus) da reta entre os pontos mantidos. A longitude
+    é escalada por cos(lat) para que a tolerância valha nas duas direções.
+
+    Retorna:
+    - array (k x 2) com os pontos mantidos (primeiro e último sempre ficam)
+    """
+    pontos = np.asarray(coords, dtype=np.float64)
+    if len(pontos) < 3:
+        return pontos
+
+    xy = np.column_stack([pontos[:, 1] * math.cos(math.radians(pontos[:, 0].mean())), pontos[:, 0]])
+    manter = np.zeros(len(pontos), dtype=bool)
+    manter[[0, -1]] = True
+
+    pilha = [(0, len(pontos) - 1)]
+    while pilha:
+        inicio, fim = pilha.pop()
+        if fim - inicio < 2:
+            continue
+        a, b = xy[inicio], xy[fim]
+        meio = xy[inicio + 1:fim]
+        ab = b - a
+        comprimento2 = ab @ ab
+        if comprimento2 == 0:
+            dist = np.sqrt(((meio - a) ** 2).sum(axis=1))
+        else:
+            # Distância de cada ponto ao segmento a-b
+            t = np.clip(((meio - a) @ ab) / comprimento2, 0.0, 1.0)
+            dist = np.sqrt(((meio - (a + t[:, None] * ab)) ** 2).sum(axis=1))
+        k = int(np.argmax(dist))
+        if dist[k] > tolerancia:
+            indice = inicio + 1 + k
+            manter[indice] = True
+            pilha.append((inicio, indice))
+            pilha.append((indice, fim))
+
+    return pontos[manter]
+
+# Função para codificar uma polilinha no formato "encoded polyline" do Google
+def codificar_polyline(coords, precisao=5):
+    """Codifica pontos (lat, lon) como encoded polyline (precisão de 1e-5 graus)."""
+    fator = 10 ** precisao
+    inteiros = np.round(np.asarray(coords, dtype=np.float64) * fator).astype(np.int64)
+    if not len(inteiros):
+        return ''
+    deltas = np.diff(inteiros, axis=0, prepend=[[0, 0]]).ravel()
+
+    partes = []
+    for valor in deltas.tolist():
+        valor = ~(valor << 1) if valor < 0 else valor << 1
+        while valor >= 0x20:
+            partes.append(chr((0x20 | (valor & 0x1f)) + 63))
+            valor >>= 5
+        partes.append(chr(valor + 63))
+    return ''.join(partes)
+
+# Função para decodificar uma encoded polyline
+def decodificar_polyline(texto, precisao=5):
+    valores, atual, deslocamento = [], 0, 0
+    for caractere in texto:
+        b = ord(caractere) - 63
+        atual |= (b & 0x1f) << deslocamento
+        deslocamento += 5
+        if b < 0x20:
+            valores.append(~(atual >> 1) if atual & 1 else atual >> 1)
+            atual, deslocamento = 0, 0
+    return (np.cumsum(np.array(valores, dtype=np.int64).reshape(-1, 2), axis=0) / 10 ** precisao).tolist()
+
+# Função para montar a polilinha simplificada de uma rota
+def coordenadas_rota(rota, node_coords, tolerancia):
+    coords = [node_coords[n] for n in rota if n in node_coords]
+    return douglas_peucker(coords, tolerancia) if tolerancia > 0 else np.asarray(coords, dtype=np.float64)
+
+# Função para gerar um GeoJSON compacto com as rotas simplificadas
+def rotas_para_geojson(rotas, node_coords, zoom_detalhe=16, casas=5):
+    """
+    Monta uma FeatureCollection com uma LineString por rota, simplificada com
+    Douglas-Peucker na tolerância de meio pixel no zoom `zoom_detalhe` e com
+    coordenadas arredondadas (5 casas ~ 1 m).
+
+    Parâmetros:
+    - rotas: lista de (rota_nodes, propriedades), propriedades é um dicionário
+      copiado para a feature (ex.: cor, popup)
+    - node_coords: {nó: (lat, lon)}
+
+    Retorna:
+    - dicionário GeoJSON e o número de pontos antes/depois da simplificação
+    """
+    if not rotas:
+        return {"type": "FeatureCollection", "features": []}, (0, 0)
+
+    latitude_media = np.mean([c[0] for c in node_coords.values()]) if node_coords else 0.0
+    tolerancia = tolerancia_para_zoom(zoom_detalhe, latitude_media)
+
+    features, antes, depois = [], 0, 0
+    for rota, propriedades in rotas:
+        antes += sum(1 for n in rota if n in node_coords)
+        coords = coordenadas_rota(rota, node_coords, tolerancia)
+        depois += len(coords)
+        features.append({
+            "type": "Feature",
+            "properties": propriedades,
+            # GeoJSON usa (lon, lat)
+            "geometry": {"type": "LineString",
+                         "coordinates": np.round(coords[:, ::-1], casas).tolist() if len(coords) else []},
+        })
+    return {"type": "FeatureCollection", "features": features}, (antes, depois)
+
+# Função para salvar o GeoJSON em disco sem espaços desnecessários
+def salvar_geojson(geojson, arquivo):
+    with open(arquivo, 'w', encoding='utf-8') as f:
+        json.dump(geojson, f, ensure_ascii=False, separators=(',', ':'))
+
+# Função para adicionar rotas e destinos compactos a um mapa folium
+def adicionar_camadas_compactas(mapa, rotas, node_coords, pontos, zoom_detalhe=16):
+    """
+    Adiciona ao mapa folium:
+    - uma única camada GeoJson com todas as rotas simplificadas (cor e popup
+      lidos das propriedades 'cor' e 'popup' de cada feature)
+    - uma única camada FastMarkerCluster com todos os destinos, desenhados
+      como círculos coloridos no navegador a partir de um array compacto
+
+    Parâmetros:
+    - rotas: lista de (rota_nodes, {'cor': ..., 'popup': ...})
+    - pontos: lista de (lat, lon, cor, popup)
+    """
+    import folium
+    from folium.plugins import FastMarkerCluster
+
+    geojson, (antes, depois) = rotas_para_geojson(rotas, node_coords, zoom_detalhe)
+    if geojson["features"]:
+        folium.GeoJson(
+            geojson,
+            name="Rotas",
+            style_function=lambda f: {"color": f["properties"]["cor"], "weight": 3, "opacity": 0.8},
+            popup=folium.GeoJsonPopup(fields=["popup"], labels=False),
+        ).add_to(mapa)
+    print(f"Rotas simplificadas: {antes} -> {depois} pontos (zoom de detalhe {zoom_detalhe})")
+
+    callback = """
+    function (row) {
+        var marker = L.circleMarker(new L.LatLng(row[0], row[1]),
+            {radius: 5, color: row[2], fillColor: row[2], fillOpacity: 1});
+        marker.bindPopup(row[3]);
+        return marker;
+    };
+    """
+    dados = [[round(lat, 6), round(lon, 6), cor, popup] for lat, lon, cor, popup in pontos]
+    FastMarkerCluster(dados, callback=callback, name="Destinos",
+                      options={"disableClusteringAtZoom": 15}).add_to(mapa)
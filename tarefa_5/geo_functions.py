@@ -0,0 +1,17 @@
+# As funções geográficas ficam no núcleo de roteamento compartilhado
+# (compartilhado/roteamento/geo.py); este módulo só as reexporta.
+
+import os
+import sys
+
+# Raiz do repositório no path para importar o pacote compartilhado
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _RAIZ not in sys.path:
+    sys.path.append(_RAIZ)
+
+from compartilhado.roteamento.geo import (
+    haversine,
+    heuristica,
+    encontrar_no_mais_proximo,
+    projetar_coordenadas
+)
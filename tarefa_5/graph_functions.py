@@ -0,0 +1,38 @@
+# O grafo, os custos e os algoritmos de rota ficam no núcleo de roteamento
+# compartilhado (compartilhado/roteamento); este módulo reexporta o que a
+# tarefa 5 usa e mantém a assinatura antiga do a_star.
+
+import os
+import sys
+
+# Raiz do repositório no path para importar o pacote compartilhado
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _RAIZ not in sys.path:
+    sys.path.append(_RAIZ)
+
+from compartilhado.metricas import METRICAS
+from compartilhado.roteamento import (
+    obter_dados_estradas,
+    chave_grafo,
+    carregar_grafo_com_cache,
+    criar_grafo,
+    get_default_speed,
+    estimar_tempo,
+    matriz_distancias_rede,
+    distancias_a_partir_de,
+    obter_motor
+)
+
+# Implementação do algoritmo A* para encontrar o caminho mais curto
+# entre dois nós usando uma heurística baseada na distância haversine
+def a_star(graph, start_node, end_node, node_coords):
+    if start_node != end_node and (start_node not in graph or end_node not in graph):
+        print(f"Erro: Nó inicial ({start_node}) ou final ({end_node}) não existe no grafo")
+        return [], float('infinity')
+
+    path, total_distance = obter_motor('a_star').caminho(graph, start_node, end_node, node_coords)
+    if path:
+        print(f"A* encontrou caminho com {len(path)} nós, distância: {total_distance:.2f} metros")
+    else:
+        print("A* não encontrou caminho para o destino.")
+    return path, total_distance
@@ -0,0 +1,180 @@
+import os
+import re
+import csv
+import json
+from array import array
+from collections.abc import Mapping
+
+TAMANHO_BLOCO_LEITURA = 1 << 16
+
+# Armazenamento colunar dos destinos
+class DestinosColunares(Mapping):
+    """
+    Armazena os destinos em colunas: código do bairro (int32), lon/lat (float64)
+    e um ID inteiro estável (posição no arquivo de origem).
+
+    As coordenadas ficam em um único array numpy (n x 2) com colunas [lon, lat];
+    `lonlat`, `lon` e `lat` são visões desse array, sem cópia, e podem ser
+    passadas diretamente para clusterização, ajuste ao grafo e plotagem.
+
+    Também se comporta como o antigo dicionário {nome: (lon, lat)}, em que o
+    nome é o bairro seguido de sufixo _2, _3, ... nas ocorrências repetidas,
+    para que o código que itera sobre destinos continue funcionando.
+    """
+
+    def __init__(self, bairros, codigos_bairro, lonlat):
+        import numpy as np
+
+        self.bairros = list(bairros)
+        self.codigos_bairro = np.asarray(codigos_bairro, dtype=np.int32)
+        self.lonlat = np.asarray(lonlat, dtype=np.float64).reshape(-1, 2)
+        self.ids = np.arange(len(self.codigos_bairro), dtype=np.int64)
+        self._nomes = None
+        self._indice_por_nome = None
+
+    @property
+    def lon(self):
+        return self.lonlat[:, 0]
+
+    @property
+    def lat(self):
+        return self.lonlat[:, 1]
+
+    @property
+    def nomes(self):
+        # Nomes com sufixo gerados apenas quando alguém precisa deles
+        if self._nomes is None:
+            contador = [0] * len(self.bairros)
+            nomes = []
+            for codigo in self.codigos_bairro.tolist():
+                contador[codigo] += 1
+                bairro = self.bairros[codigo]
+                nomes.append(bairro if contador[codigo] == 1 else f"{bairro}_{contador[codigo]}")
+            self._nomes = nomes
+        return self._nomes
+
+    def indice(self, nome):
+        if self._indice_por_nome is None:
+            self._indice_por_nome = {nome: i for i, nome in enumerate(self.nomes)}
+        return self._indice_por_nome[nome]
+
+    def contagem_por_bairro(self):
+        import numpy as np
+
+        contagem = np.bincount(self.codigos_bairro, minlength=len(self.bairros))
+        return dict(zip(self.bairros, contagem.tolist()))
+
+    # Interface de dicionário {nome: (lon, lat)}
+    def __getitem__(self, nome):
+        lon, lat = self.lonlat[self.indice(nome)].tolist()
+        return lon, lat
+
+    def __iter__(self):
+        return iter(self.nomes)
+
+    def __len__(self):
+        return len(self.codigos_bairro)
+
+    @classmethod
+    def vazio(cls):
+        return cls([], [], [])
+
+    @classmethod
+    def _de_registros(cls, registros):
+        # Acumula em buffers do módulo array; o numpy reaproveita a memória no final
+        import numpy as np
+
+        codigos = {}
+        buffer_codigos = array('i')
+        buffer_coords = array('d')
+        for bairro, lon, lat in registros:
+            codigo = codigos.setdefault(bairro, len(codigos))
+            buffer_codigos.append(codigo)
+            buffer_coords.append(lon)
+            buffer_coords.append(lat)
+
+        return cls(
+            list(codigos),
+            np.frombuffer(buffer_codigos, dtype=np.int32) if buffer_codigos else [],
+            np.frombuffer(buffer_coords, dtype=np.float64) if buffer_coords else []
+        )
+
+    @classmethod
+    def de_json(cls, arquivo_json):
+        """Lê um arquivo JSON no formato do db.json (lista de objetos) sem carregá-lo inteiro."""
+        return cls._de_registros(
+            (e['Neighborhood'], float(e['Lon']), float(e['Lat']))
+            for e in _iterar_objetos_json(arquivo_json)
+        )
+
+    @classmethod
+    def de_csv(cls, arquivo_csv):
+        """Lê um CSV com as colunas Neighborhood, Lon e Lat, linha a linha."""
+        with open(arquivo_csv, 'r', encoding='utf-8', newline='') as file:
+            return cls._de_registros(
+                (linha['Neighborhood'], float(linha['Lon']), float(linha['Lat']))
+                for linha in csv.DictReader(file)
+            )
+
+# Percorre os objetos de uma lista JSON de nível superior lendo o arquivo em blocos
+def _iterar_objetos_json(arquivo_json):
+    decoder = json.JSONDecoder()
+    separadores = re.compile(r'[\s,]*')
+
+    with open(arquivo_json, 'r', encoding='utf-8') as file:
+        buffer = file.read(TAMANHO_BLOCO_LEITURA).lstrip()
+        if not buffer.startswith('['):
+            raise json.JSONDecodeError("Esperada uma lista de objetos", buffer, 0)
+        pos = 1
+        fim_arquivo = False
+
+        while True:
+            pos = separadores.match(buffer, pos).end()
+            if buffer.startswith(']', pos):
+                return
+            try:
+                objeto, pos_fim = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if fim_arquivo:
+                    raise
+                # Objeto incompleto: descartar o que já foi lido e trazer mais um bloco
+                bloco = file.read(TAMANHO_BLOCO_LEITURA)
+                fim_arquivo = not bloco
+                buffer = buffer[pos:] + bloco
+                pos = 0
+                continue
+            yield objeto
+            pos = pos_fim
+
+# Função para carregar destinos do arquivo JSON
+def carregar_destinos(arquivo_json):
+    """
+    Carrega os destinos do arquivo db.json (ou de um .csv) mantendo todas as ocorrências
+    Formato: "Neighborhood_ID": (Lon, Lat) ou usando lista de coordenadas por bairro
+
+    Retorna um DestinosColunares, que pode ser usado como o antigo dicionário
+    {nome: (lon, lat)} e também expõe os arrays de coordenadas sem cópia.
+    """
+    try:
+        if os.path.splitext(arquivo_json)[1].lower() == '.csv':
+            destinos = DestinosColunares.de_csv(arquivo_json)
+        else:
+            destinos = DestinosColunares.de_json(arquivo_json)
+
+        print(f"Carregados {len(destinos)} destinos do arquivo {arquivo_json}")
+        print(f"Distribuição por bairro:")
+        for bairro, count in destinos.contagem_por_bairro().items():
+            if count > 1:
+                print(f"  {bairro}: {count} ocorrências")
+
+        return destinos
+
+    except FileNotFoundError:
+        print(f"Erro: Arquivo {arquivo_json} não encontrado!")
+        return DestinosColunares.vazio()
+    except json.JSONDecodeError:
+        print(f"Erro: Arquivo {arquivo_json} contém JSON inválido!")
+        return DestinosColunares.vazio()
+    except Exception as e:
+        print(f"Erro ao carregar destinos: {e}")
+        return DestinosColunares.vazio()
@@ -6,221 +6,465 @@ estando dentro da pasta do projeto:
 $ python -m venv venv
 $ source venv/bin/activate
 $ pip install -r requirements.txt
-"""
-
-from aux_functions import (
-  carregar_destinos,
-  obter_dados_estradas,
-  criar_grafo,
-  dividir_destinos_em_clusters,
-  imprimir_resumo_detalhado,
-  diagnosticar_conectividade_grafo
-)
-
-from plot_functions import(
-  plotar_mapa_com_clusters,
-  plotar_mapa_natal_com_destinos,
-  plotar_mapa_com_rotas,
-  plotar_mapa_rotas_operadores
-)
-
-from routes_functions import(
-planejar_rotas_para_todos_os_clusters_dijkstra_trad,
-  planejar_rotas_para_todos_os_clusters_min_heap,
-  planejar_rotas_para_todos_os_clusters_a_star,
-  gerar_rotas_aleatorias_a_star
-)
-
-from codecarbon import EmissionsTracker
-
-# Iniciando o rastreador de emissões do code carbon
-# Descomente o bloco a seguir e o último bloco do código para calcular a pegada de corbono
-
-tracker = EmissionsTracker()       
-tracker.start()  
-          
-
-# Carregar destinos do arquivo JSON
-destinos = carregar_destinos('db.json')
-
-# Define as coordenadas do centro de zoonoses
-czoonoses = (-5.7532189, -35.2621815)
-
-# Define os limites para extrair dados do OpenStreetMap (bounding box para Natal-RN)
-min_lat = -5.8850
-min_lon = -35.3150
-max_lat = -5.7000
-max_lon = -35.1700
-bounds = (min_lat, min_lon, max_lat, max_lon)
- 
-print("Baixando dados do OpenStreetMap...")
-data = obter_dados_estradas(bounds)
-
-print("Criando grafo da rede viária...")
-graph, node_coords = criar_grafo(data)
-print(f"Grafo criado com {len(graph)} nós.")
-
-# Plot do mapa com os pontos de destino e o centro de zoonoses
-# Descomente esse bloco para plotar mapa com todos os pontos de interesse
-
-"""
-print("Plotando mapa natal com destinos...")
-plotar_mapa_natal_com_destinos(graph, node_coords, destinos, czoonoses, bounds=None)
-"""
-
-################### Diagnosticar Conectividade entra nós ###################
-# Descomente esse bloco para plotar mapa com todos os pontos de interesse
-
-""" 
-destinos_ok, destinos_problematicos = diagnosticar_conectividade_grafo(
-    graph, node_coords, destinos, czoonoses
-) 
-"""
-
-################### Dividir os destinos em clusters ###################
-
-print("Dividindo destinos em 10 clusters...")
-labels_clusters = dividir_destinos_em_clusters(destinos, n_clusters=10, plotar=False)
-
-# Exemplo: imprimir quais destinos ficaram em cada cluster
-clusters = {}
-for nome, cluster_id in labels_clusters.items():
-    clusters.setdefault(cluster_id, []).append(nome)
-
-for cluster_id, nomes in clusters.items():
-    print(f"\nCluster {cluster_id+1} ({len(nomes)} pontos):")
-    for nome in nomes:
-        print(f"  - {nome}")
-
-
-###################### Plota mapa com clusters ######################
-# Descomente esse bloco para plotar o mapa com os pontos clusterizados
 
-""" 
-print("\nPlotando mapa com destinos coloridos por cluster...")
-mapa_cores, estatisticas_clusters = plotar_mapa_com_clusters(
-    graph=graph, 
-    node_coords=node_coords, 
-    destinos=destinos, 
-    labels_clusters=labels_clusters, 
-    czoonoses=czoonoses, 
-    bounds=bounds
-)
+Uso (de dentro de tarefa_5/), um subcomando por etapa:
+$ python main.py baixar                          # grafo e destinos ajustados em cache/
+$ python main.py clusterizar --clusters 12       # salva cache/clusters_12.json
+$ python main.py planejar --motor a_star         # rotas por cluster (padrão sem subcomando)
+$ python main.py planejar --motor heap --operadores 10   # operadores sem clustering
+$ python main.py renderizar --rotas cache/rotas_dijkstra_min_heap.json --workers 4
 
-print("\nCores utilizadas para cada cluster:")
-for cluster_id, cor in mapa_cores.items():
-    print(f"Cluster {cluster_id + 1}: RGB{tuple(cor[:3])}")
-
-print("\nEstatísticas finais:")
-print(f"Total de clusters: {len(mapa_cores)}")
-print(f"Total de destinos plotados: {sum(estatisticas_clusters.values())}") 
-"""
-
-
-######## Planejar e Salvar Rotas para Todos os Clusters usado A* ######## 
-# Chama a função principal que gerencia o planejamento para todos os clusters
-
-"""
-rotas_salvas = planejar_rotas_para_todos_os_clusters_a_star(
-    destinos=destinos,
-    labels_clusters=labels_clusters,
-    czoonoses_coords=czoonoses,
-    graph=graph,
-    node_coords=node_coords
-)
-"""
-
-######## Planejar e Salvar Rotas para Todos os Clusters usado Dijkstra ######## 
-"""
-rotas_salvas = planejar_rotas_para_todos_os_clusters_dijkstra_trad(
-    destinos=destinos,
-    labels_clusters=labels_clusters,
-    czoonoses_coords=czoonoses,
-    graph=graph,
-    node_coords=node_coords
-)
+Cada subcomando termina imprimindo um resumo em JSON (uma linha); com
+--resumo ARQUIVO o resumo também é acrescentado a um arquivo JSON Lines,
+para comparar várias configurações em scripts.
 """
 
-######## Planejar e Salvar Rotas para Todos os Clusters usado Dijkstra Min-Heap ######## 
-
-rotas_salvas = planejar_rotas_para_todos_os_clusters_min_heap(
-    destinos=destinos,
-    labels_clusters=labels_clusters,
-    czoonoses_coords=czoonoses,
-    graph=graph,
-    node_coords=node_coords
-)
-
-
-
-# Chama a nova função dedicada a imprimir os resultados de forma organizada
-imprimir_resumo_detalhado(
-    rotas_salvas=rotas_salvas,
-    destinos=destinos,
-    node_coords=node_coords,
-    labels_clusters=labels_clusters
-)
-
-if rotas_salvas:
-    plotar_mapa_com_rotas(
-        rotas_salvas=rotas_salvas,
-        node_coords=node_coords,
-        destinos=destinos,
-        labels_clusters=labels_clusters,
-        czoonoses_coords=czoonoses
+import os
+import sys
+import json
+import time
+import argparse
+
+# Raiz do repositório no path para importar o pacote compartilhado
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _RAIZ not in sys.path:
+    sys.path.append(_RAIZ)
+
+# Valores padrão: Natal-RN
+# Limites para extrair dados do OpenStreetMap (min_lat, min_lon, max_lat, max_lon)
+BOUNDS_PADRAO = (-5.8850, -35.3150, -5.7000, -35.1700)
+# Coordenadas do centro de zoonoses (lat, lon)
+CZOONOSES_PADRAO = (-5.7532189, -35.2621815)
+
+# Nome da execução por motor: é o nome do CSV do CodeCarbon em pegada_de_carbono/
+# e a chave das métricas de roteamento em pegada_de_carbono/metricas.json.
+# Sem clustering (--operadores) o rótulo é '<motor>_random'
+ROTULOS_MOTORES = {'a_star': 'a_star', 'trad': 'emissions_djikstra_trad', 'heap': 'dijkstra_min_heap'}
+PASTA_EMISSOES = 'pegada_de_carbono'
+
+
+# Função para imprimir o resumo da execução em JSON (e acrescentá-lo ao arquivo, se houver)
+def emitir_resumo(resumo, arquivo=None):
+    linha = json.dumps(resumo, ensure_ascii=False)
+    print("\n=== Resumo da execução (JSON) ===")
+    print(linha)
+    if arquivo:
+        pasta = os.path.dirname(arquivo)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        with open(arquivo, 'a', encoding='utf-8') as f:
+            f.write(linha + "\n")
+    return resumo
+
+
+# Função para carregar os destinos, o grafo (em cache) e a tabela de destinos ajustados
+def carregar_cenario(args, tempos):
+    from aux_functions import carregar_destinos, carregar_grafo_com_cache
+    from snap_functions import carregar_tabela_destinos
+
+    inicio = time.perf_counter()
+    destinos = carregar_destinos(args.destinos)
+    tempos['destinos'] = time.perf_counter() - inicio
+
+    # O grafo é baixado apenas na primeira execução e depois lido da pasta de cache
+    inicio = time.perf_counter()
+    graph, node_coords = carregar_grafo_com_cache(args.bbox, pasta_cache=args.cache)
+    print(f"Grafo criado com {len(graph)} nós.")
+    tempos['grafo'] = time.perf_counter() - inicio
+
+    # Ajusta todos os destinos ao grafo uma única vez (salvo junto ao cache do grafo)
+    inicio = time.perf_counter()
+    tabela = carregar_tabela_destinos(graph, node_coords, destinos, args.deposito,
+                                      bounds=args.bbox, pasta_cache=args.cache)
+    tempos['ajuste_destinos'] = time.perf_counter() - inicio
+
+    return destinos, graph, node_coords, tabela
+
+
+# Função para dividir os destinos em clusters (ou lê-los de um JSON salvo por 'clusterizar')
+def obter_clusters(args, destinos, graph, node_coords, tabela=None):
+    arquivo = getattr(args, 'usar_clusters', None)
+    if arquivo:
+        print(f"Lendo clusters de '{arquivo}'...")
+        with open(arquivo, encoding='utf-8') as f:
+            return {nome: int(c) for nome, c in json.load(f)['labels'].items()}
+
+    from aux_functions import dividir_destinos_em_clusters
+
+    print(f"Dividindo destinos em {args.clusters} clusters...")
+    rede = args.modo_cluster == 'rede'
+    labels = dividir_destinos_em_clusters(
+        destinos, n_clusters=args.clusters, plotar=False, modo=args.modo_cluster,
+        graph=graph if rede else None, node_coords=node_coords if rede else None,
+        balancear=args.balancear, tabela=tabela
+    )
+    return {nome: int(c) for nome, c in labels.items()}
+
+
+def _tamanhos(labels):
+    tamanhos = {}
+    for cluster_id in labels.values():
+        tamanhos[cluster_id] = tamanhos.get(cluster_id, 0) + 1
+    return {str(c): n for c, n in sorted(tamanhos.items())}
+
+
+def _arredondar(tempos):
+    return {etapa: round(t, 3) for etapa, t in tempos.items()}
+
+
+################### Subcomando: baixar ###################
+
+def cmd_baixar(args):
+    from compartilhado.roteamento import chave_grafo
+
+    tempos = {}
+    destinos, graph, node_coords, tabela = carregar_cenario(args, tempos)
+
+    if args.diagnostico:
+        from aux_functions import diagnosticar_conectividade_grafo
+        diagnosticar_conectividade_grafo(graph, node_coords, destinos, args.deposito, tabela=tabela)
+
+    if args.figura:
+        from plot_functions import plotar_mapa_natal_com_destinos
+        print("Plotando mapa natal com destinos...")
+        plotar_mapa_natal_com_destinos(graph, node_coords, destinos, args.deposito, bounds=None,
+                                       mostrar=False, arquivo_saida=args.figura)
+
+    return emitir_resumo({
+        'comando': 'baixar',
+        'bbox': list(args.bbox),
+        'arquivo_grafo': os.path.join(args.cache, f"grafo_{chave_grafo(args.bbox)}.pkl"),
+        'nos': len(graph),
+        'arestas': sum(len(vizinhos) for vizinhos in graph.values()),
+        'destinos': len(destinos),
+        'destinos_alcancaveis': sum(1 for info in tabela['destinos'].values() if info['alcancavel']),
+        'tempos_s': _arredondar(tempos),
+    }, args.resumo)
+
+
+################### Subcomando: clusterizar ###################
+
+def cmd_clusterizar(args):
+    from aux_functions import carregar_destinos
+
+    tempos = {}
+    graph = node_coords = tabela = None
+    if args.modo_cluster == 'rede' or args.figura:
+        destinos, graph, node_coords, tabela = carregar_cenario(args, tempos)
+    else:
+        inicio = time.perf_counter()
+        destinos = carregar_destinos(args.destinos)
+        tempos['destinos'] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    labels = obter_clusters(args, destinos, graph, node_coords, tabela)
+    tempos['clusterizacao'] = time.perf_counter() - inicio
+
+    # Imprimir quais destinos ficaram em cada cluster
+    clusters = {}
+    for nome, cluster_id in labels.items():
+        clusters.setdefault(cluster_id, []).append(nome)
+    for cluster_id, nomes in sorted(clusters.items()):
+        print(f"\nCluster {cluster_id+1} ({len(nomes)} pontos):")
+        for nome in nomes:
+            print(f"  - {nome}")
+
+    saida = args.saida or os.path.join(args.cache, f"clusters_{args.clusters}.json")
+    pasta = os.path.dirname(saida)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    with open(saida, 'w', encoding='utf-8') as f:
+        json.dump({'n_clusters': args.clusters, 'modo': args.modo_cluster, 'labels': labels},
+                  f, ensure_ascii=False)
+    print(f"\nClusters salvos em '{saida}'")
+
+    if args.figura:
+        from plot_functions import plotar_mapa_com_clusters
+        print("\nPlotando mapa com destinos coloridos por cluster...")
+        plotar_mapa_com_clusters(graph=graph, node_coords=node_coords, destinos=destinos,
+                                 labels_clusters=labels, czoonoses=args.deposito, bounds=args.bbox,
+                                 mostrar=False, arquivo_saida=args.figura)
+
+    return emitir_resumo({
+        'comando': 'clusterizar',
+        'n_clusters': args.clusters,
+        'modo': args.modo_cluster,
+        'balancear': args.balancear,
+        'arquivo_clusters': saida,
+        'tamanhos': _tamanhos(labels),
+        'tempos_s': _arredondar(tempos),
+    }, args.resumo)
+
+
+################### Subcomando: planejar ###################
+
+def cmd_planejar(args):
+    from graph_functions import METRICAS
+    from aux_functions import imprimir_resumo_detalhado, imprimir_resumo_operadores
+
+    if args.operadores:
+        rotulo = args.rotulo or f"{args.motor}_random"
+    else:
+        rotulo = args.rotulo or ROTULOS_MOTORES.get(args.motor, args.motor)
+
+    # Iniciando o rastreador de emissões do code carbon
+    tracker = None
+    if not args.sem_emissoes:
+        from codecarbon import EmissionsTracker
+        tracker = EmissionsTracker(output_dir=PASTA_EMISSOES, output_file=f"{rotulo}.csv")
+        tracker.start()
+    METRICAS.zerar()
+
+    tempos = {}
+    destinos, graph, node_coords, tabela = carregar_cenario(args, tempos)
+
+    if args.diagnostico:
+        from aux_functions import diagnosticar_conectividade_grafo
+        diagnosticar_conectividade_grafo(graph, node_coords, destinos, args.deposito, tabela=tabela)
+
+    if args.operadores:
+        ######## Rotas para os operadores sem clustering ########
+        from routes_functions import gerar_rotas_aleatorias_a_star
+
+        inicio = time.perf_counter()
+        rotas_por_operador = gerar_rotas_aleatorias_a_star(
+            destinos=destinos,
+            czoonoses_coords=args.deposito,
+            graph=graph,
+            node_coords=node_coords,
+            num_operadores=args.operadores,
+            seed=args.seed,
+            tabela=tabela,
+            motor=args.motor
+        )
+        tempos['planejamento'] = time.perf_counter() - inicio
+        imprimir_resumo_operadores(rotas_por_operador)
+
+        # Mesmo formato das rotas por cluster: operador N -> rota N-1
+        rotas_salvas = {op_id - 1: (info['rota_nodes'], info['dist_m'])
+                        for op_id, info in rotas_por_operador.items()}
+        labels = {nome: op_id - 1 for op_id, info in rotas_por_operador.items()
+                  for nome in info['destinos']}
+
+        if rotas_salvas and not args.sem_mapa:
+            from plot_functions import plotar_mapa_rotas_operadores
+            plotar_mapa_rotas_operadores(rotas_por_operador, node_coords=node_coords,
+                                         destinos=destinos, czoonoses_coords=args.deposito,
+                                         compacto=True)
+    else:
+        ######## Rotas para todos os clusters ########
+        # O algoritmo é escolhido pelo nome (ver compartilhado/roteamento/motores.py)
+        from routes_functions import planejar_rotas_para_todos_os_clusters
+
+        inicio = time.perf_counter()
+        labels = obter_clusters(args, destinos, graph, node_coords, tabela)
+        tempos['clusterizacao'] = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        rotas_salvas = planejar_rotas_para_todos_os_clusters(
+            args.motor,
+            destinos=destinos,
+            labels_clusters=labels,
+            czoonoses_coords=args.deposito,
+            graph=graph,
+            node_coords=node_coords,
+            tabela=tabela
+        )
+        tempos['planejamento'] = time.perf_counter() - inicio
+
+        imprimir_resumo_detalhado(rotas_salvas=rotas_salvas, destinos=destinos,
+                                  node_coords=node_coords, labels_clusters=labels, tabela=tabela)
+
+        if rotas_salvas and not args.sem_mapa:
+            from plot_functions import plotar_mapa_com_rotas
+            plotar_mapa_com_rotas(rotas_salvas=rotas_salvas, node_coords=node_coords,
+                                  destinos=destinos, labels_clusters=labels,
+                                  czoonoses_coords=args.deposito, compacto=True)
+
+    # Destinos de cada rota que ficaram fora dela (isolados na rede viária)
+    nos_por_rota = {rota_id: set(rota) for rota_id, (rota, _) in rotas_salvas.items()}
+    nao_visitados = sum(
+        1 for nome, rota_id in labels.items()
+        if tabela['destinos'][nome]['no'] not in nos_por_rota.get(rota_id, ())
     )
 
-
-######## Planejar e Salvar Rotas para os operadores usado A* sem clustering ######## 
-""" 
-# Gera as 10 rotas
-rotas_por_operador = gerar_rotas_aleatorias_a_star(
-    destinos=destinos,
-    czoonoses_coords=czoonoses,
-    graph=graph,
-    node_coords=node_coords,
-    num_operadores=10,
-    seed=123
-)
-
-# --- Resumo detalhado por Operador, com total geral ---
-print("\n=== Resumo detalhado por Operador ===")
-dist_total = 0.0
-
-for op_id, info in rotas_por_operador.items():
-    rota = info['rota_nodes']
-    distancia = info['dist_m']
-    destinos_vis = info['destinos']
-    
-    dist_total += distancia
-    
-    print("\n" + "-"*41)
-    print(f"| Rota para o Operador {op_id:<2}               |")
-    print("-"*41)
-    print(f"  -> Distância Total: {distancia/1000:.2f} km")
-    print(f"  -> Número de nós na rota: {len(rota)}")
-    print(f"  -> Destinos Visitados ({len(destinos_vis)}):")
-    for i, nome in enumerate(destinos_vis, start=1):
-        print(f"     {i:2d}. {nome}")
-
-# Depois de listar todos, imprime o total
-print("\n" + "="*41)
-print(f"Distância TOTAL percorrida por todos os operadores: {dist_total/1000:.2f} km")
-print("="*41 + "\n")
-
-
-# Plota o mapa
-plotar_mapa_rotas_operadores(
-    rotas_por_operador,
-    node_coords=node_coords,
-    destinos=destinos,
-    czoonoses_coords=czoonoses
-) 
-"""
-
- 
-# Finalizando reastreador de emissões de carbono
-# Precisa descomentar para calcular pegada de carbono
-
-emissions = tracker.stop()
-print(f"\nEmissões de CO2 estimadas: {emissions:.6f} kg")
+    # Rotas em JSON, para o subcomando 'renderizar' e para análises posteriores
+    saida = args.saida or os.path.join(args.cache, f"rotas_{rotulo}.json")
+    pasta = os.path.dirname(saida)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    with open(saida, 'w', encoding='utf-8') as f:
+        json.dump({
+            'motor': args.motor,
+            'rotulo': rotulo,
+            'bbox': list(args.bbox),
+            'deposito': list(args.deposito),
+            'destinos': args.destinos,
+            'labels': labels,
+            'rotas': {str(rota_id): {'nos': rota, 'dist_m': dist}
+                      for rota_id, (rota, dist) in sorted(rotas_salvas.items())},
+        }, f, ensure_ascii=False)
+    print(f"Rotas salvas em '{saida}'")
+
+    # Finalizando o rastreador de emissões de carbono
+    emissoes = None
+    if tracker is not None:
+        emissoes = tracker.stop()
+        print(f"\nEmissões de CO2 estimadas: {emissoes:.6f} kg")
+
+    # Consultas e nós assentados desta execução, para normalizar as emissões
+    # (python codecarbon_plot.py); sem o CodeCarbon, só se --metricas for informado
+    trabalho = METRICAS.como_dict()
+    if tracker is not None or args.metricas:
+        METRICAS.salvar(args.metricas or f"{PASTA_EMISSOES}/metricas.json", rotulo)
+
+    return emitir_resumo({
+        'comando': 'planejar',
+        'motor': args.motor,
+        'rotulo': rotulo,
+        'modo': 'operadores' if args.operadores else 'clusters',
+        'n_rotas': len(rotas_salvas),
+        'distancia_total_km': round(sum(dist for _, dist in rotas_salvas.values()) / 1000, 3),
+        'distancias_km': {str(rota_id): round(dist / 1000, 3)
+                          for rota_id, (_, dist) in sorted(rotas_salvas.items())},
+        'destinos': len(labels),
+        'destinos_nao_visitados': nao_visitados,
+        'consultas': trabalho['consultas'],
+        'nos_assentados': trabalho['nos_assentados'],
+        'emissoes_kg': emissoes,
+        'arquivo_rotas': saida,
+        'tempos_s': _arredondar(tempos),
+    }, args.resumo)
+
+
+################### Subcomando: renderizar ###################
+
+def cmd_renderizar(args):
+    from aux_functions import carregar_destinos, carregar_grafo_com_cache
+    from render_functions import trabalho_rotas, renderizar_em_lote
+
+    with open(args.rotas, encoding='utf-8') as f:
+        dados = json.load(f)
+    rotas_salvas = {int(rota_id): (rota['nos'], rota['dist_m']) for rota_id, rota in dados['rotas'].items()}
+    labels = dados['labels']
+    bounds = tuple(dados['bbox'])
+    deposito = tuple(dados['deposito'])
+
+    tempos = {}
+    inicio = time.perf_counter()
+    destinos = carregar_destinos(dados['destinos'])
+    graph, node_coords = carregar_grafo_com_cache(bounds, pasta_cache=args.cache)
+    tempos['grafo'] = time.perf_counter() - inicio
+
+    pasta_saida = args.pasta_saida or os.path.join('imgs', dados['rotulo'])
+    trabalhos = [trabalho_rotas(os.path.join(pasta_saida, 'todas.png'), rotas_salvas, node_coords,
+                                destinos, labels, deposito, titulo=f"{dados['motor']}: todas as rotas")]
+    if args.por_rota:
+        for rota_id in sorted(rotas_salvas):
+            trabalhos.append(trabalho_rotas(os.path.join(pasta_saida, f"rota_{rota_id + 1:02d}.png"),
+                                            rotas_salvas, node_coords, destinos, labels, deposito,
+                                            titulo=f"{dados['motor']}: rota {rota_id + 1}",
+                                            clusters={rota_id}))
+
+    inicio = time.perf_counter()
+    arquivos = renderizar_em_lote(graph, node_coords, bounds, trabalhos, workers=args.workers,
+                                  largura_px=args.largura, pasta_cache=args.cache)
+    tempos['renderizacao'] = time.perf_counter() - inicio
+
+    return emitir_resumo({
+        'comando': 'renderizar',
+        'arquivo_rotas': args.rotas,
+        'imagens': arquivos,
+        'workers': args.workers,
+        'tempos_s': _arredondar(tempos),
+    }, args.resumo)
+
+
+################### Linha de comando ###################
+
+def _motor(nome):
+    from compartilhado.roteamento import obter_motor
+    try:
+        return obter_motor(nome).nome
+    except ValueError as erro:
+        raise argparse.ArgumentTypeError(str(erro))
+
+
+def criar_parser():
+    from compartilhado.roteamento import MOTORES
+
+    comum = argparse.ArgumentParser(add_help=False)
+    comum.add_argument("--cache", default="cache", help="pasta do cache do grafo e das tabelas (padrão: cache)")
+    comum.add_argument("--resumo", help="acrescenta o resumo JSON da execução a este arquivo (JSON Lines)")
+
+    cenario = argparse.ArgumentParser(add_help=False)
+    cenario.add_argument("--destinos", default="db.json", help="JSON com os destinos (padrão: db.json)")
+    cenario.add_argument("--bbox", nargs=4, type=float, default=BOUNDS_PADRAO,
+                         metavar=("MIN_LAT", "MIN_LON", "MAX_LAT", "MAX_LON"),
+                         help="limites da área no OpenStreetMap (padrão: Natal-RN)")
+    cenario.add_argument("--deposito", nargs=2, type=float, default=CZOONOSES_PADRAO, metavar=("LAT", "LON"),
+                         help="coordenadas do depósito (padrão: Centro de Zoonoses)")
+
+    clusters = argparse.ArgumentParser(add_help=False)
+    clusters.add_argument("--clusters", type=int, default=10, help="número de clusters (padrão: 10)")
+    clusters.add_argument("--modo-cluster", choices=("kmeans", "projetado", "rede"), default="kmeans",
+                          help="clusterização (ver cluster_functions; padrão: kmeans)")
+    clusters.add_argument("--balancear", action="store_true", help="limita o tamanho dos clusters")
+
+    parser = argparse.ArgumentParser(description="Planejamento de rotas do Centro de Zoonoses de Natal")
+    sub = parser.add_subparsers(dest="comando")
+
+    p = sub.add_parser("baixar", parents=[comum, cenario],
+                       help="baixa a rede viária e ajusta os destinos ao grafo (em cache)")
+    p.add_argument("--diagnostico", action="store_true", help="diagnostica a conectividade dos destinos")
+    p.add_argument("--figura", help="salva o mapa com todos os destinos neste PNG")
+    p.set_defaults(funcao=cmd_baixar)
+
+    p = sub.add_parser("clusterizar", parents=[comum, cenario, clusters],
+                       help="divide os destinos em clusters e salva em JSON")
+    p.add_argument("--saida", help="JSON de saída (padrão: <cache>/clusters_<n>.json)")
+    p.add_argument("--figura", help="salva o mapa dos clusters neste PNG")
+    p.set_defaults(funcao=cmd_clusterizar)
+
+    p = sub.add_parser("planejar", parents=[comum, cenario, clusters],
+                       help="planeja as rotas (por cluster ou por operador)")
+    p.add_argument("--motor", type=_motor, default="heap",
+                   help=f"motor de roteamento ({', '.join(sorted(MOTORES))}; padrão: heap)")
+    p.add_argument("--usar-clusters", metavar="ARQUIVO", help="usa os clusters salvos por 'clusterizar'")
+    p.add_argument("--operadores", type=int, default=0,
+                   help="sem clustering: divide os destinos ao acaso entre N operadores")
+    p.add_argument("--seed", type=int, default=123, help="semente da divisão entre operadores (padrão: 123)")
+    p.add_argument("--rotulo", help="nome da execução em pegada_de_carbono/ (padrão: pelo motor)")
+    p.add_argument("--metricas", help="JSON das métricas de roteamento (padrão: pegada_de_carbono/metricas.json)")
+    p.add_argument("--saida", help="JSON das rotas (padrão: <cache>/rotas_<rotulo>.json)")
+    p.add_argument("--sem-emissoes", action="store_true", help="não mede a pegada de carbono")
+    p.add_argument("--sem-mapa", action="store_true", help="não gera o mapa HTML (Folium)")
+    p.add_argument("--diagnostico", action="store_true", help="diagnostica a conectividade dos destinos")
+    p.set_defaults(funcao=cmd_planejar)
+
+    p = sub.add_parser("renderizar", parents=[comum],
+                       help="gera PNGs das rotas salvas por 'planejar'")
+    p.add_argument("--rotas", required=True, help="JSON salvo por 'planejar'")
+    p.add_argument("--workers", type=int, default=None, help="processos de renderização (padrão: CPUs)")
+    p.add_argument("--largura", type=int, default=2000, help="largura das imagens em pixels (padrão: 2000)")
+    p.add_argument("--pasta-saida", help="pasta das imagens (padrão: imgs/<rotulo>)")
+    p.add_argument("--por-rota", action="store_true", help="gera também uma imagem por rota")
+    p.set_defaults(funcao=cmd_renderizar)
+
+    return parser
+
+
+def main(argv=None):
+    parser = criar_parser()
+    # Sem subcomando, planeja as rotas com os valores padrão (comportamento original)
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0].startswith('-') and argv[0] not in ('-h', '--help'):
+        argv = ['planejar'] + argv
+    args = parser.parse_args(argv)
+    if hasattr(args, 'bbox'):
+        args.bbox, args.deposito = tuple(args.bbox), tuple(args.deposito)
+    return args.funcao(args)
+
+
+if __name__ == "__main__":
+    main()
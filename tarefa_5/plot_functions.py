@@ -1,9 +1,18 @@
-import matplotlib.pyplot as plt
-import numpy as np
-
+# As bibliotecas de plotagem são importadas dentro de cada função para que
+# importar este módulo não carregue matplotlib/folium sem necessidade.
 
+# Função para salvar e/ou mostrar a figura atual (mostrar=False permite execução em lote)
+def _finalizar_figura(plt, mostrar, arquivo_saida):
+    if arquivo_saida:
+        plt.savefig(arquivo_saida, dpi=150, bbox_inches='tight')
+        print(f"Figura salva em '{arquivo_saida}'")
+    if mostrar:
+        plt.show()
+    else:
+        plt.close()
 
-def plotar_mapa_com_clusters(graph, node_coords, destinos, labels_clusters, czoonoses, bounds=None):
+def plotar_mapa_com_clusters(graph, node_coords, destinos, labels_clusters, czoonoses, bounds=None,
+                             mostrar=True, arquivo_saida=None):
     """
     Plota um mapa da cidade de Natal mostrando a rede viária e os pontos de destino
     coloridos por cluster.
@@ -15,9 +24,13 @@ def plotar_mapa_com_clusters(graph, node_coords, destinos, labels_clusters, czoo
     - labels_clusters: dicionário com os clusters {nome: cluster_id}
     - czoonoses: coordenadas do centro de zoonoses (lat, lon)
     - bounds: limites da área (min_lat, min_lon, max_lat, max_lon) - opcional
+    - mostrar: se False, não abre a janela (plt.show) e fecha a figura
+    - arquivo_saida: se informado, salva a figura nesse arquivo (PNG)
     """
     import matplotlib.pyplot as plt
     import numpy as np
+    from matplotlib.collections import LineCollection
+    from render_functions import segmentos_rede
 
     plt.figure(figsize=(16, 12))
     
@@ -53,23 +66,11 @@ def plotar_mapa_com_clusters(graph, node_coords, destinos, labels_clusters, czoo
     
     print("Plotando rede viária de Natal...")
     
-    # Plotar arestas do grafo (rede viária)
-    edges_plotted = 0
-    for node in graph:
-        if node in node_coords:
-            lat1, lon1 = node_coords[node]  # lat, lon
-            x1, y1 = lon1, lat1  # converter para x, y (lon, lat)
-            
-            for neighbor, distance, speed in graph[node]:
-                if neighbor in node_coords:
-                    lat2, lon2 = node_coords[neighbor]
-                    x2, y2 = lon2, lat2
-                    
-                    # Plotar apenas se as coordenadas estão dentro dos limites
-                    if (min_lat <= lat1 <= max_lat and min_lon <= lon1 <= max_lon and
-                        min_lat <= lat2 <= max_lat and min_lon <= lon2 <= max_lon):
-                        plt.plot([x1, x2], [y1, y2], 'gray', linewidth=0.6, alpha=0.9)
-                        edges_plotted += 1
+    # Plotar arestas do grafo (rede viária) numa única coleção, só as que estão
+    # dentro dos limites
+    segmentos = segmentos_rede(graph, node_coords, (min_lat, min_lon, max_lat, max_lon))
+    plt.gca().add_collection(LineCollection(segmentos, colors='gray', linewidths=0.6, alpha=0.9))
+    edges_plotted = len(segmentos)
     
     print(f"Plotadas {edges_plotted} arestas da rede viária")
     
@@ -207,11 +208,12 @@ def plotar_mapa_com_clusters(graph, node_coords, destinos, labels_clusters, czoo
         print(f"Cluster {cluster_id + 1}: {count} destinos")
     
     print("Mapa com clusters plotado com sucesso!")
-    plt.show()
+    _finalizar_figura(plt, mostrar, arquivo_saida)
     
     return mapa_cores, destinos_por_cluster
 
-def plotar_mapa_natal_com_destinos(graph, node_coords, destinos, czoonoses, bounds=None):
+def plotar_mapa_natal_com_destinos(graph, node_coords, destinos, czoonoses, bounds=None,
+                                   mostrar=True, arquivo_saida=None):
     """
     Plota um mapa da cidade de Natal mostrando a rede viária e os pontos de destino.
     
@@ -221,7 +223,13 @@ def plotar_mapa_natal_com_destinos(graph, node_coords, destinos, czoonoses, boun
     - destinos: dicionário com destinos carregados do JSON
     - czoonoses: coordenadas do centro de zoonoses (lat, lon)
     - bounds: limites da área (min_lat, min_lon, max_lat, max_lon) - opcional
+    - mostrar: se False, não abre a janela (plt.show) e fecha a figura
+    - arquivo_saida: se informado, salva a figura nesse arquivo (PNG)
     """
+    import matplotlib.pyplot as plt
+    import numpy as np
+    from matplotlib.collections import LineCollection
+    from render_functions import segmentos_rede
 
     plt.figure(figsize=(16, 12))
     
@@ -258,23 +266,11 @@ def plotar_mapa_natal_com_destinos(graph, node_coords, destinos, czoonoses, boun
     
     print("Plotando rede viária de Natal...")
     
-    # Plotar arestas do grafo (rede viária)
-    edges_plotted = 0
-    for node in graph:
-        if node in node_coords:
-            lat1, lon1 = node_coords[node]  # lat, lon
-            x1, y1 = lon1, lat1  # converter para x, y (lon, lat)
-            
-            for neighbor, distance, speed in graph[node]:
-                if neighbor in node_coords:
-                    lat2, lon2 = node_coords[neighbor]
-                    x2, y2 = lon2, lat2
-                    
-                    # Plotar apenas se as coordenadas estão dentro dos limites
-                    if (min_lat <= lat1 <= max_lat and min_lon <= lon1 <= max_lon and
-                        min_lat <= lat2 <= max_lat and min_lon <= lon2 <= max_lon):
-                        plt.plot([x1, x2], [y1, y2], 'gray', linewidth=0.6, alpha=0.9)
-                        edges_plotted += 1
+    # Plotar arestas do grafo (rede viária) numa única coleção, só as que estão
+    # dentro dos limites
+    segmentos = segmentos_rede(graph, node_coords, (min_lat, min_lon, max_lat, max_lon))
+    plt.gca().add_collection(LineCollection(segmentos, colors='gray', linewidths=0.6, alpha=0.9))
+    edges_plotted = len(segmentos)
     
     print(f"Plotadas {edges_plotted} arestas da rede viária")
     
@@ -385,15 +381,11 @@ def plotar_mapa_natal_com_destinos(graph, node_coords, destinos, czoonoses, boun
              bbox=dict(boxstyle='round,pad=0.5', facecolor='lightblue', alpha=0.8))
     
     print("Mapa plotado com sucesso!")
-    plt.show()
-
+    _finalizar_figura(plt, mostrar, arquivo_saida)
 
-# Em plot_functions.py
-import folium
-import matplotlib.pyplot as plt
-import numpy as np
 
-def plotar_mapa_com_rotas(rotas_salvas, node_coords, destinos, labels_clusters, czoonoses_coords):
+def plotar_mapa_com_rotas(rotas_salvas, node_coords, destinos, labels_clusters, czoonoses_coords,
+                          compacto=False, zoom_detalhe=16):
     """
     Gera e salva um mapa interativo com Folium que exibe os pontos de destino,
     o Centro de Zoonoses e as rotas planejadas para cada cluster.
@@ -404,7 +396,15 @@ def plotar_mapa_com_rotas(rotas_salvas, node_coords, destinos, labels_clusters,
     - destinos: Dicionário {nome: (lon, lat)} com todos os destinos.
     - labels_clusters: Dicionário {nome: cluster_id} que mapeia destinos a clusters.
     - czoonoses_coords: Tupla (lat, lon) com as coordenadas do CZO.
+    - compacto: se True, as rotas são simplificadas (Douglas-Peucker) e gravadas
+      numa única camada GeoJSON, e os destinos numa única camada agrupada
+      (ver export_functions); o HTML fica bem menor.
+    - zoom_detalhe: zoom até o qual a simplificação não é visível.
     """
+    import folium
+    import matplotlib.pyplot as plt
+    import numpy as np
+
     # 1. Configuração inicial do mapa
     map_center = czoonoses_coords
     mapa = folium.Map(location=map_center, zoom_start=12, tiles="CartoDB positron")
@@ -414,40 +414,51 @@ def plotar_mapa_com_rotas(rotas_salvas, node_coords, destinos, labels_clusters,
     cores = [plt.cm.tab10(i) for i in np.linspace(0, 1, num_clusters)]
     mapa_cores = {i: f'#{int(c[0]*255):02x}{int(c[1]*255):02x}{int(c[2]*255):02x}' for i, c in enumerate(cores)}
 
-    # 2. Desenhar as rotas no mapa
-    for cluster_id, (rota, distancia) in rotas_salvas.items():
-        if not rota:
-            continue
+    if compacto:
+        from export_functions import adicionar_camadas_compactas
 
-        # Converte a lista de nós da rota em uma lista de coordenadas (lat, lon)
-        rota_coords = [(node_coords[node][0], node_coords[node][1]) for node in rota if node in node_coords]
-        
-        cor_cluster = mapa_cores.get(cluster_id, '#000000') # Preto como cor padrão
+        rotas = [(rota, {'cor': mapa_cores.get(cluster_id, '#000000'),
+                         'popup': f"<b>Cluster {cluster_id + 1}</b><br>Distância: {distancia / 1000:.2f} km"})
+                 for cluster_id, (rota, distancia) in rotas_salvas.items() if rota]
+        pontos = [(lat, lon, mapa_cores.get(labels_clusters[nome], '#000000'),
+                   f"<b>{nome}</b><br>Cluster: {labels_clusters[nome] + 1}")
+                  for nome, (lon, lat) in destinos.items() if labels_clusters.get(nome) is not None]
+        adicionar_camadas_compactas(mapa, rotas, node_coords, pontos, zoom_detalhe)
+    else:
+        # 2. Desenhar as rotas no mapa
+        for cluster_id, (rota, distancia) in rotas_salvas.items():
+            if not rota:
+                continue
 
-        # Cria a linha da rota
-        folium.PolyLine(
-            locations=rota_coords,
-            color=cor_cluster,
-            weight=3,
-            opacity=0.8,
-            popup=f"<b>Cluster {cluster_id + 1}</b><br>Distância: {distancia / 1000:.2f} km"
-        ).add_to(mapa)
+            # Converte a lista de nós da rota em uma lista de coordenadas (lat, lon)
+            rota_coords = [(node_coords[node][0], node_coords[node][1]) for node in rota if node in node_coords]
 
-    # 3. Adicionar os marcadores dos pontos de destino
-    for nome, (lon, lat) in destinos.items():
-        cluster_id = labels_clusters.get(nome)
-        if cluster_id is not None:
-            cor_ponto = mapa_cores.get(cluster_id, '#000000')
-            folium.CircleMarker(
-                location=(lat, lon),
-                radius=5,
-                color=cor_ponto,
-                fill=True,
-                fill_color=cor_ponto,
-                fill_opacity=1,
-                popup=f"<b>{nome}</b><br>Cluster: {cluster_id + 1}"
+            cor_cluster = mapa_cores.get(cluster_id, '#000000') # Preto como cor padrão
+
+            # Cria a linha da rota
+            folium.PolyLine(
+                locations=rota_coords,
+                color=cor_cluster,
+                weight=3,
+                opacity=0.8,
+                popup=f"<b>Cluster {cluster_id + 1}</b><br>Distância: {distancia / 1000:.2f} km"
             ).add_to(mapa)
 
+        # 3. Adicionar os marcadores dos pontos de destino
+        for nome, (lon, lat) in destinos.items():
+            cluster_id = labels_clusters.get(nome)
+            if cluster_id is not None:
+                cor_ponto = mapa_cores.get(cluster_id, '#000000')
+                folium.CircleMarker(
+                    location=(lat, lon),
+                    radius=5,
+                    color=cor_ponto,
+                    fill=True,
+                    fill_color=cor_ponto,
+                    fill_opacity=1,
+                    popup=f"<b>{nome}</b><br>Cluster: {cluster_id + 1}"
+                ).add_to(mapa)
+
     # 4. Adicionar o marcador do Centro de Zoonoses
     folium.Marker(
         location=czoonoses_coords,
@@ -463,12 +474,19 @@ def plotar_mapa_com_rotas(rotas_salvas, node_coords, destinos, labels_clusters,
 
     
 def plotar_mapa_rotas_operadores(
-    rotas_por_operador, node_coords, destinos, czoonoses_coords
+    rotas_por_operador, node_coords, destinos, czoonoses_coords,
+    compacto=False, zoom_detalhe=16
 ):
     """
     Plota em Folium uma rota por operador, cada uma com cor distinta,
     e marcadores dos destinos coloridos pelo operador.
+
+    Com compacto=True, rotas simplificadas numa camada GeoJSON e destinos numa
+    camada agrupada (ver plotar_mapa_com_rotas).
     """
+    import folium
+    import matplotlib.pyplot as plt
+
     # Obtém paleta Tab10 pela nova API
     cmap = plt.colormaps['tab10']
     # Tenta extrair cores diretamente, senão gera via amostragem
@@ -494,34 +512,45 @@ def plotar_mapa_rotas_operadores(
         for nome in info['destinos']:
             dest2op[nome] = op
 
-    # Desenha cada rota com sua cor
-    for op, info in rotas_por_operador.items():
-        cor = cores[(op-1) % len(cores)]
-        coords = [
-            (node_coords[n][0], node_coords[n][1])
-            for n in info['rota_nodes'] if n in node_coords
-        ]
-        folium.PolyLine(
-            locations=coords,
-            color=cor,
-            weight=3,
-            opacity=0.8,
-            popup=f"Operador {op} — {info['dist_m']/1000:.2f} km"
-        ).add_to(mapa)
+    if compacto:
+        from export_functions import adicionar_camadas_compactas
+
+        rotas = [(info['rota_nodes'], {'cor': cores[(op-1) % len(cores)],
+                                       'popup': f"Operador {op} — {info['dist_m']/1000:.2f} km"})
+                 for op, info in rotas_por_operador.items()]
+        pontos = [(lat, lon, cores[(dest2op[nome]-1) % len(cores)] if dest2op.get(nome) else '#000000',
+                   f"{nome}<br>Operador {dest2op.get(nome)}")
+                  for nome, (lon, lat) in destinos.items()]
+        adicionar_camadas_compactas(mapa, rotas, node_coords, pontos, zoom_detalhe)
+    else:
+        # Desenha cada rota com sua cor
+        for op, info in rotas_por_operador.items():
+            cor = cores[(op-1) % len(cores)]
+            coords = [
+                (node_coords[n][0], node_coords[n][1])
+                for n in info['rota_nodes'] if n in node_coords
+            ]
+            folium.PolyLine(
+                locations=coords,
+                color=cor,
+                weight=3,
+                opacity=0.8,
+                popup=f"Operador {op} — {info['dist_m']/1000:.2f} km"
+            ).add_to(mapa)
 
-    # Pontos de destino coloridos por operador
-    for nome,(lon,lat) in destinos.items():
-        op = dest2op.get(nome)
-        cor = cores[(op-1) % len(cores)] if op else '#000000'
-        folium.CircleMarker(
-            location=(lat, lon),
-            radius=5,
-            color=cor,
-            fill=True,
-            fill_color=cor,
-            fill_opacity=1,
-            popup=f"{nome}<br>Operador {op}"
-        ).add_to(mapa)
+        # Pontos de destino coloridos por operador
+        for nome,(lon,lat) in destinos.items():
+            op = dest2op.get(nome)
+            cor = cores[(op-1) % len(cores)] if op else '#000000'
+            folium.CircleMarker(
+                location=(lat, lon),
+                radius=5,
+                color=cor,
+                fill=True,
+                fill_color=cor,
+                fill_opacity=1,
+                popup=f"{nome}<br>Operador {op}"
+            ).add_to(mapa)
 
     # Marcador do CZO
     folium.Marker(
@@ -0,0 +1,211 @@
+"""
+Renderização estática em lote (PNG) sem backend interativo.
+
+A rede viária é rasterizada uma única vez para uma bounding box fixa e guardada
+em cache; cada imagem de rotas é a base rasterizada mais as rotas desenhadas por
+cima, e as imagens são gravadas em paralelo por processos. Usa apenas
+matplotlib.figure.Figure + FigureCanvasAgg (nunca pyplot), então funciona em
+servidores sem display.
+"""
+
+import os
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Base rasterizada usada pelos workers
+_BASE = None
+_EXTENT = None
+
+
+# Função para extrair os segmentos da rede viária como um array (m x 2 x 2) de (lon, lat)
+def segmentos_rede(graph, node_coords, bounds=None):
+    """
+    Segmentos (lon, lat) das arestas do grafo, cada via de mão dupla uma vez só.
+    Com bounds (min_lat, min_lon, max_lat, max_lon), mantém apenas os segmentos
+    com as duas pontas dentro da área, como nas funções de plot.
+    """
+    pares = set()
+    for node, vizinhos in graph.items():
+        if node not in node_coords:
+            continue
+        for neighbor, _, _ in vizinhos:
+            if neighbor in node_coords and (neighbor, node) not in pares:
+                pares.add((node, neighbor))
+
+    if not pares:
+        return np.empty((0, 2, 2))
+    pares = list(pares)
+    origem = np.array([node_coords[u] for u, _ in pares], dtype=np.float64)[:, ::-1]
+    destino = np.array([node_coords[v] for _, v in pares], dtype=np.float64)[:, ::-1]
+    segmentos = np.stack([origem, destino], axis=1)
+
+    if bounds is not None:
+        min_lat, min_lon, max_lat, max_lon = bounds
+        lon, lat = segmentos[:, :, 0], segmentos[:, :, 1]
+        dentro = ((lat >= min_lat) & (lat <= max_lat) & (lon >= min_lon) & (lon <= max_lon)).all(axis=1)
+        segmentos = segmentos[dentro]
+    return segmentos
+
+
+def _extent(bounds):
+    min_lat, min_lon, max_lat, max_lon = bounds
+    return (min_lon, max_lon, min_lat, max_lat)
+
+
+def _tamanho_figura(bounds, largura_px, dpi):
+    # Proporção da área corrigida pela latitude (graus de longitude encolhem)
+    min_lat, min_lon, max_lat, max_lon = bounds
+    razao = (max_lat - min_lat) / ((max_lon - min_lon) * np.cos(np.radians((min_lat + max_lat) / 2)))
+    altura_px = int(round(largura_px * razao))
+    return largura_px / dpi, altura_px / dpi
+
+
+# Função para rasterizar a rede viária (com cache em disco)
+def rasterizar_base(graph, node_coords, bounds, largura_px=2000, dpi=100, cor='#808080',
+                    espessura=0.4, pasta_cache='cache'):
+    """
+    Desenha a rede viária numa imagem RGBA cobrindo exatamente `bounds`.
+    A imagem fica em cache (.npy) identificada pelos limites, pela resolução e
+    pelo conjunto de segmentos, então só é refeita se o grafo mudar.
+
+    Retorna:
+    - array (altura x largura x 4) uint8
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.collections import LineCollection
+
+    segmentos = segmentos_rede(graph, node_coords, bounds)
+    arquivo = None
+    if pasta_cache is not None:
+        h = hashlib.sha1(repr((tuple(bounds), largura_px, dpi, cor, espessura)).encode())
+        h.update(np.ascontiguousarray(segmentos).tobytes())
+        arquivo = os.path.join(pasta_cache, f"base_{h.hexdigest()[:12]}.npy")
+        if os.path.exists(arquivo):
+            print(f"Base da rede viária carregada do cache: {arquivo}")
+            return np.load(arquivo)
+
+    fig = Figure(figsize=_tamanho_figura(bounds, largura_px, dpi), dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_axis_off()
+    ax.add_collection(LineCollection(segmentos, colors=cor, linewidths=espessura))
+    min_lon, max_lon, min_lat, max_lat = _extent(bounds)
+    ax.set_xlim(min_lon, max_lon)
+    ax.set_ylim(min_lat, max_lat)
+    canvas.draw()
+    base = np.asarray(canvas.buffer_rgba()).copy()
+    print(f"Rede viária rasterizada: {len(segmentos)} segmentos, {base.shape[1]}x{base.shape[0]} px")
+
+    if arquivo is not None:
+        os.makedirs(pasta_cache, exist_ok=True)
+        np.save(arquivo, base)
+    return base
+
+
+# Função para montar um trabalho de renderização a partir das rotas planejadas
+def trabalho_rotas(arquivo, rotas_salvas, node_coords, destinos=None, labels_clusters=None,
+                   czoonoses=None, titulo=None, clusters=None):
+    """
+    Converte rotas {cluster_id: (rota, distancia)} (como as de routes_functions)
+    em um trabalho para renderizar_em_lote, já com as coordenadas, para que os
+    workers não precisem do grafo.
+
+    Parâmetros:
+    - arquivo: PNG de saída
+    - clusters: se informado, só esses clusters entram na imagem
+    """
+    from matplotlib import colormaps
+
+    cmap = colormaps['tab10']
+    linhas, pontos = [], []
+    for cluster_id, (rota, distancia) in sorted(rotas_salvas.items()):
+        if clusters is not None and cluster_id not in clusters:
+            continue
+        coords = np.array([node_coords[n] for n in rota if n in node_coords], dtype=np.float64)
+        if len(coords) > 1:
+            linhas.append((coords[:, ::-1], cmap(cluster_id % 10),
+                           f"Cluster {cluster_id + 1} ({distancia / 1000:.2f} km)"))
+
+    if destinos and labels_clusters:
+        for nome, (lon, lat) in destinos.items():
+            cluster_id = labels_clusters.get(nome)
+            if cluster_id is not None and (clusters is None or cluster_id in clusters):
+                pontos.append((lon, lat, cmap(cluster_id % 10)))
+
+    return {'arquivo': arquivo, 'linhas': linhas, 'pontos': pontos, 'titulo': titulo,
+            'destaque': (czoonoses[1], czoonoses[0]) if czoonoses else None}
+
+
+def _iniciar_worker(base, extent):
+    global _BASE, _EXTENT
+    _BASE, _EXTENT = base, extent
+
+
+def _renderizar(trabalho, dpi=100):
+    # Executada nos workers: base + rotas + pontos -> PNG
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    altura, largura = _BASE.shape[:2]
+    fig = Figure(figsize=(largura / dpi, altura / dpi), dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_axis_off()
+    ax.imshow(_BASE, extent=_EXTENT, interpolation='nearest', aspect='auto')
+
+    for coords, cor, rotulo in trabalho['linhas']:
+        ax.plot(coords[:, 0], coords[:, 1], color=cor, linewidth=2.5, label=rotulo)
+    if trabalho['pontos']:
+        lon, lat, cores = zip(*trabalho['pontos'])
+        ax.scatter(lon, lat, c=list(cores), s=40, edgecolors='black', linewidths=0.8, zorder=3)
+    if trabalho.get('destaque'):
+        ax.plot(*trabalho['destaque'], 'r*', markersize=20, markeredgecolor='darkred', zorder=4)
+
+    ax.set_xlim(_EXTENT[0], _EXTENT[1])
+    ax.set_ylim(_EXTENT[2], _EXTENT[3])
+    if trabalho.get('titulo'):
+        ax.text(0.01, 0.99, trabalho['titulo'], transform=ax.transAxes, va='top', fontsize=16,
+                weight='bold', bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.8))
+    if trabalho['linhas']:
+        ax.legend(loc='lower right', fontsize=10)
+
+    pasta = os.path.dirname(trabalho['arquivo'])
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    fig.savefig(trabalho['arquivo'], dpi=dpi)
+    return trabalho['arquivo']
+
+
+# Função para renderizar vários mapas de rotas em paralelo
+def renderizar_em_lote(graph, node_coords, bounds, trabalhos, workers=None, largura_px=2000, dpi=100,
+                       pasta_cache='cache'):
+    """
+    Gera um PNG por trabalho (ver trabalho_rotas) sobre a mesma base rasterizada
+    da rede viária.
+
+    Parâmetros:
+    - bounds: limites fixos (min_lat, min_lon, max_lat, max_lon) de todas as imagens
+    - trabalhos: lista de dicionários com 'arquivo', 'linhas', 'pontos',
+      'titulo' e 'destaque'
+    - workers: processos (padrão: número de CPUs; 1 renderiza no processo atual)
+
+    Retorna:
+    - lista com os arquivos gerados
+    """
+    base = rasterizar_base(graph, node_coords, bounds, largura_px, dpi, pasta_cache=pasta_cache)
+    extent = _extent(bounds)
+    workers = min(workers or os.cpu_count() or 1, max(len(trabalhos), 1))
+
+    if workers <= 1:
+        _iniciar_worker(base, extent)
+        arquivos = [_renderizar(t, dpi) for t in trabalhos]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_worker,
+                                 initargs=(base, extent)) as pool:
+            arquivos = list(pool.map(_renderizar, trabalhos, [dpi] * len(trabalhos)))
+
+    print(f"{len(arquivos)} imagens geradas")
+    return arquivos
@@ -1,16 +1,19 @@
 import random
-import heapq
-from aux_functions import (
-    a_star,
-    encontrar_no_mais_proximo
-)
+from graph_functions import a_star
+from snap_functions import ajustar_destinos_ao_grafo
+from compartilhado.roteamento import obter_motor, extrair_subgrafo, reconstruir_caminho
 
 # Função para traçar a rota usando o algoritmo a_star
-def tracar_rota_cluster_tsp_a_star(cluster_alvo_id, destinos, labels_clusters, czoonoses_coords, graph, node_coords):
+def tracar_rota_cluster_tsp_a_star(cluster_alvo_id, destinos, labels_clusters, czoonoses_coords, graph, node_coords, tabela=None,
+                                   motor='a_star'):
     """
     Traça uma rota otimizada (usando a heurística do vizinho mais próximo) que começa
     no Centro de Zoonoses, visita todos os pontos de um cluster específico e retorna ao CZO.
+
+    tabela: destinos já ajustados ao grafo (ver snap_functions); calculada se None.
+    motor: motor ponto a ponto usado em cada par de paradas (padrão: A*)
     """
+    buscar = a_star if motor == 'a_star' else obter_motor(motor).caminho
     print(f"\nIniciando o planejamento da rota para o Cluster {cluster_alvo_id + 1}...")
 
     # 1. Identificar os destinos específicos deste cluster
@@ -25,28 +28,23 @@ def tracar_rota_cluster_tsp_a_star(cluster_alvo_id, destinos, labels_clusters, c
 
     print(f"Destinos do cluster: {list(destinos_do_cluster.keys())}")
 
-    # Encontrar o nó do CZO
-    no_czoonoses = encontrar_no_mais_proximo(node_coords, czoonoses_coords[0], czoonoses_coords[1])
+    if tabela is None:
+        tabela = ajustar_destinos_ao_grafo(graph, node_coords, destinos, czoonoses_coords)
+
+    # Nó do CZO
+    no_czoonoses = tabela['no_deposito']
     
-    # 2. Mapear cada destino para seu nó mais próximo e verificar conectividade
+    # 2. Obter o nó de cada destino e sua conectividade a partir da tabela
     destinos_para_nos = {}
     destinos_inalcancaveis = []
     
-    for nome, (lon, lat) in destinos_do_cluster.items():
-        no_destino = encontrar_no_mais_proximo(node_coords, lat, lon)
-        
-        # Verificar se o nó tem conexões (não está isolado)
-        if no_destino and no_destino in graph and len(graph[no_destino]) > 0:
-            # Testar conectividade fazendo uma busca rápida
-            caminho_teste, dist_teste = a_star(graph, no_czoonoses, no_destino, node_coords)
-            if caminho_teste:  # Se conseguiu encontrar um caminho
-                destinos_para_nos[nome] = no_destino
-            else:
-                destinos_inalcancaveis.append(nome)
-                print(f"AVISO: '{nome}' não é alcançável pela rede viária disponível.")
+    for nome in destinos_do_cluster:
+        info = tabela['destinos'][nome]
+        if info['alcancavel']:
+            destinos_para_nos[nome] = info['no']
         else:
             destinos_inalcancaveis.append(nome)
-            print(f"AVISO: '{nome}' está mapeado para um nó isolado ou inexistente.")
+            print(f"AVISO: '{nome}' não é alcançável pela rede viária disponível.")
     
     if not destinos_para_nos:
         print(f"Nenhum destino do Cluster {cluster_alvo_id + 1} é alcançável. Rota não gerada.")
@@ -65,7 +63,7 @@ def tracar_rota_cluster_tsp_a_star(cluster_alvo_id, destinos, labels_clusters, c
 
         # Encontrar o destino mais próximo do ponto atual
         for nome_destino, no_destino in destinos_restantes.items():
-            caminho, distancia = a_star(graph, ponto_atual, no_destino, node_coords)
+            caminho, distancia = buscar(graph, ponto_atual, no_destino, node_coords)
             if caminho and distancia < distancia_minima:
                 distancia_minima = distancia
                 destino_mais_proximo = nome_destino
@@ -87,7 +85,7 @@ def tracar_rota_cluster_tsp_a_star(cluster_alvo_id, destinos, labels_clusters, c
 
     # 4. Retornar ao Centro de Zoonoses
     print("  - Todos os pontos alcançáveis visitados. Retornando ao CZO...")
-    caminho_final, distancia_final = a_star(graph, ponto_atual, no_czoonoses, node_coords)
+    caminho_final, distancia_final = buscar(graph, ponto_atual, no_czoonoses, node_coords)
     
     if caminho_final:
         rota_completa.extend(caminho_final[1:])
@@ -106,326 +104,183 @@ def tracar_rota_cluster_tsp_a_star(cluster_alvo_id, destinos, labels_clusters, c
     return rota_completa, distancia_total
 
 
-def planejar_rotas_para_todos_os_clusters_a_star(destinos, labels_clusters, czoonoses_coords, graph, node_coords):
-    """
-    Itera sobre todos os clusters, traça uma rota para cada um usando a função
-    tracar_rota_cluster_tsp e salva todas as rotas geradas.
-
-    Parâmetros:
-    - Todos os parâmetros necessários para a função tracar_rota_cluster_tsp.
-
-    Retorna:
-    - Um dicionário onde as chaves são os IDs dos clusters e os valores são
-      tuplas contendo (rota_completa, distancia_total_metros) para aquele cluster.
-      Ex: {0: (rota_cluster_0, dist_0), 1: (rota_cluster_1, dist_1), ...}
-    """
-    print("\n\n=== INICIANDO PLANEJAMENTO DE ROTAS PARA TODOS OS CLUSTERS ===")
-    
-    todas_as_rotas = {}
-    
-    # Encontra todos os IDs de cluster únicos e os ordena
-    ids_clusters_unicos = sorted(set(labels_clusters.values()))
-    
-    # Itera sobre cada cluster para planejar sua rota
-    for cluster_id in ids_clusters_unicos:
-        rota, distancia = tracar_rota_cluster_tsp_a_star(
-            cluster_alvo_id=cluster_id,
-            destinos=destinos,
-            labels_clusters=labels_clusters,
-            czoonoses_coords=czoonoses_coords,
-            graph=graph,
-            node_coords=node_coords
-        )
-        
-        # Salva a rota e a distância no dicionário se a rota foi gerada com sucesso
-        if rota:
-            todas_as_rotas[cluster_id] = (rota, distancia)
-            
-    print("\n=== PLANEJAMENTO DE TODAS AS ROTAS CONCLUÍDO ===")
-    return todas_as_rotas
-
 def extrair_subgrafo_por_cluster(cluster_nodes, node_coords, graph, margem=0.005):
     """
     Extrai de 'graph' apenas os nós e arestas que caem no bbox que envolve
     cluster_nodes (lat/lon em node_coords) com uma pequena margem.
     """
-    # calcula bbox
-    lats = [node_coords[n][0] for n in cluster_nodes]
-    lons = [node_coords[n][1] for n in cluster_nodes]
-    min_lat, max_lat = min(lats)-margem, max(lats)+margem
-    min_lon, max_lon = min(lons)-margem, max(lons)+margem
-
-    # filtra nós no bbox
-    nodes_ok = {
-        n for n,(lat,lon) in node_coords.items()
-        if min_lat <= lat <= max_lat and min_lon <= lon <= max_lon
-    }
-
-    # monta subgrafo
-    sub = {}
-    for n in nodes_ok:
-        sub[n] = [(v,w,s) for (v,w,s) in graph[n] if v in nodes_ok]
-    return sub
+    return extrair_subgrafo(cluster_nodes, node_coords, graph, margem)
 
 
 def dijkstra_tradicional_distancias(graph, source):
     """
-    Roda o seu Dijkstra tradicional (sem heap) a partir de 'source'
-    e retorna dois dicts: dist[n] e pred[n].
+    Dijkstra tradicional (sem heap) a partir de 'source' (motor 'trad');
+    retorna dist e pred dos nós alcançados.
     """
-    dist = {n: float('inf') for n in graph}
-    dist[source] = 0
-    pred = {n: None for n in graph}
-    visitados = set()
-
-    while True:
-        u, best = None, float('inf')
-        for n, d in dist.items():
-            if n not in visitados and d < best:
-                u, best = n, d
-        if u is None:
-            break
-        visitados.add(u)
-        for v, w, _ in graph[u]:
-            if v not in visitados and dist[u] + w < dist[v]:
-                dist[v] = dist[u] + w
-                pred[v] = u
+    return obter_motor('trad').arvore(graph, source)
 
-    return dist, pred
 
+def dijkstra_min_heap(graph, source):
+    """
+    Dijkstra com min-heap (motor 'heap'); retorna dist e pred dos nós
+    alcançados.
+    """
+    return obter_motor('heap').arvore(graph, source)
 
-def tracar_rota_cluster_tsp_dijkstra_trad(
+
+def tracar_rota_cluster_tsp_arvore(
+    motor,
     cluster_alvo_id,
     destinos,
     labels_clusters,
     czoonoses_coords,
     graph,
-    node_coords
+    node_coords,
+    tabela=None,
+    margem_dinamica=True
 ):
     """
-    Traça rota NN+retorno para o cluster usando Dijkstra tradicional
-    em subgrafo reduzido.
+    Traça rota NN+retorno para o cluster com árvores de caminhos mínimos
+    (uma por parada) do motor informado, num subgrafo reduzido em volta do
+    cluster. Se algum ponto não for alcançável no subgrafo, a árvore é refeita
+    no grafo completo.
+
+    Parâmetros:
+    - motor: nome de um motor registrado (ex.: 'trad', 'heap')
+    - margem_dinamica: margem do subgrafo proporcional à extensão do cluster
+      (senão, 0.005 grau fixo)
     """
-    # 1) mapeia nós do CZO e destinos do cluster
-    start = encontrar_no_mais_proximo(node_coords, *czoonoses_coords)
-    nomes = [n for n,c in labels_clusters.items() if c==cluster_alvo_id]
-    destinos_nodes = [
-        encontrar_no_mais_proximo(node_coords, lat, lon)
-        for n in nomes for (lon,lat) in [destinos[n]]
-    ]
-    cluster_nodes = [start] + destinos_nodes
-
-    # 2) extrai subgrafo restrito
-    sub_graph = extrair_subgrafo_por_cluster(cluster_nodes, node_coords, graph)
-
-    # 3) inicializa rota e estado
+    arvore = obter_motor(motor).arvore
+    if tabela is None:
+        tabela = ajustar_destinos_ao_grafo(graph, node_coords, destinos, czoonoses_coords)
+
+    # 1) nó do depósito e destinos do cluster (já ajustados na tabela)
+    start = tabela['no_deposito']
+    nomes = [n for n, c in labels_clusters.items() if c == cluster_alvo_id]
+    dest_nodes = [tabela['destinos'][n]['no'] for n in nomes]
+    cluster_nodes = [start] + dest_nodes
+
+    # 2) margem e sub-grafo
+    margem = 0.005
+    if margem_dinamica:
+        lats = [node_coords[n][0] for n in cluster_nodes]
+        lons = [node_coords[n][1] for n in cluster_nodes]
+        margem = max(max(lats) - min(lats), max(lons) - min(lons)) * 0.5 + 0.005
+    subg = extrair_subgrafo(cluster_nodes, node_coords, graph, margem)
+
+    def arvore_com_fallback(origem, alvos):
+        dist, pred = arvore(subg, origem)
+        if any(a not in dist for a in alvos):
+            dist, pred = arvore(graph, origem)
+        return dist, pred
+
+    # 3) Nearest-Neighbor com uma árvore one-to-all por parada
     rota = [start]
     atual = start
     total = 0.0
-    restantes = set(destinos_nodes)
+    restantes = set(dest_nodes)
 
-    # 4) Nearest-Neighbor usando Dijkstra one-to-all
     while restantes:
-        dist_map, pred_map = dijkstra_tradicional_distancias(sub_graph, atual)
-        vizinho = min(restantes, key=lambda n: dist_map.get(n, float('inf')))
-        dmin = dist_map[vizinho]
-
-        # reconstrói caminho
-        caminho = []
-        cur = vizinho
-        while cur is not None:
-            caminho.append(cur)
-            cur = pred_map[cur]
-        caminho.reverse()
-
-        # anexa e atualiza
-        rota.extend(caminho[1:])
-        total += dmin
-        atual = vizinho
-        restantes.remove(vizinho)
-
-    # 5) volta ao CZO
-    dist_map, pred_map = dijkstra_tradicional_distancias(sub_graph, atual)
-    retorno = []
-    cur = start
-    # reconstrói de atual → start
-    path_back = []
-    node = atual
-    while node is not None:
-        path_back.append(node)
-        node = pred_map[node]
-    path_back.reverse()
-
-    rota.extend(path_back[1:])
-    total += dist_map[start]
+        dist_map, pred_map = arvore_com_fallback(atual, restantes)
+        viz = min(restantes, key=lambda n: dist_map.get(n, float('inf')))
+        if viz not in dist_map:
+            print(f"AVISO: {len(restantes)} destino(s) do Cluster {cluster_alvo_id + 1} sem caminho")
+            break
+
+        rota.extend(reconstruir_caminho(pred_map, viz)[1:])
+        total += dist_map[viz]
+        atual = viz
+        restantes.remove(viz)
+
+    # 4) volta ao depósito
+    dist_map, pred_map = arvore_com_fallback(atual, (start,))
+    if start in dist_map:
+        rota.extend(reconstruir_caminho(pred_map, start)[1:])
+        total += dist_map[start]
+    else:
+        print("AVISO: Não foi possível traçar a rota de volta para o CZO.")
 
     print(f"Cluster {cluster_alvo_id+1}: {len(rota)} nós, {total/1000:.2f} km")
     return rota, total
 
 
-def planejar_rotas_para_todos_os_clusters_dijkstra_trad(destinos, labels_clusters, czoonoses_coords, graph, node_coords):
+def tracar_rota_cluster_tsp_dijkstra_trad(cluster_alvo_id, destinos, labels_clusters, czoonoses_coords, graph, node_coords, tabela=None):
     """
-    Itera sobre todos os clusters, traça uma rota para cada um usando a função
-    tracar_rota_cluster_tsp e salva todas as rotas geradas.
+    Traça rota NN+retorno para o cluster usando Dijkstra tradicional
+    em subgrafo reduzido.
+    """
+    return tracar_rota_cluster_tsp_arvore('trad', cluster_alvo_id, destinos, labels_clusters,
+                                          czoonoses_coords, graph, node_coords, tabela,
+                                          margem_dinamica=False)
+
+
+def tracar_rota_cluster_tsp_dijkstra_min_heap(cluster_alvo_id, destinos, labels_clusters, czoonoses_coords, graph, node_coords, tabela=None):
+    """
+    Traça rota NN+retorno para o cluster usando Dijkstra com min-heap
+    em subgrafo reduzido com margem dinâmica e fallback.
+    """
+    return tracar_rota_cluster_tsp_arvore('heap', cluster_alvo_id, destinos, labels_clusters,
+                                          czoonoses_coords, graph, node_coords, tabela)
+
+
+def planejar_rotas_para_todos_os_clusters(motor, destinos, labels_clusters, czoonoses_coords, graph, node_coords, tabela=None):
+    """
+    Planeja a rota de cada cluster com o motor de roteamento escolhido pelo
+    nome. Motores ponto a ponto (A*) fazem uma busca por par de paradas; os
+    demais usam uma árvore de caminhos mínimos por parada.
 
     Parâmetros:
-    - Todos os parâmetros necessários para a função tracar_rota_cluster_tsp.
+    - motor: nome de um motor registrado ('a_star', 'trad', 'heap', ...)
+    - tabela: destinos já ajustados ao grafo; calculada uma única vez se None.
 
     Retorna:
-    - Um dicionário onde as chaves são os IDs dos clusters e os valores são
-      tuplas contendo (rota_completa, distancia_total_metros) para aquele cluster.
-      Ex: {0: (rota_cluster_0, dist_0), 1: (rota_cluster_1, dist_1), ...}
+    - {cluster_id: (rota_completa, distancia_total_metros)}
     """
-    print("\n\n=== INICIANDO PLANEJAMENTO DE ROTAS PARA TODOS OS CLUSTERS ===")
-    
+    motor_escolhido = obter_motor(motor)
+    print(f"\n\n=== INICIANDO PLANEJAMENTO DE ROTAS ({motor_escolhido.descricao}) ===")
+
+    if tabela is None:
+        tabela = ajustar_destinos_ao_grafo(graph, node_coords, destinos, czoonoses_coords)
+
     todas_as_rotas = {}
-    
-    # Encontra todos os IDs de cluster únicos e os ordena
-    ids_clusters_unicos = sorted(set(labels_clusters.values()))
-    
-    # Itera sobre cada cluster para planejar sua rota
-    for cluster_id in ids_clusters_unicos:
-        rota, distancia = tracar_rota_cluster_tsp_dijkstra_trad(
-            cluster_alvo_id=cluster_id,
-            destinos=destinos,
-            labels_clusters=labels_clusters,
-            czoonoses_coords=czoonoses_coords,
-            graph=graph,
-            node_coords=node_coords
-        )
-        
-        # Salva a rota e a distância no dicionário se a rota foi gerada com sucesso
+    for cluster_id in sorted(set(labels_clusters.values())):
+        if motor_escolhido.ponto_a_ponto:
+            rota, distancia = tracar_rota_cluster_tsp_a_star(
+                cluster_id, destinos, labels_clusters, czoonoses_coords, graph, node_coords, tabela,
+                motor=motor_escolhido.nome
+            )
+        else:
+            rota, distancia = tracar_rota_cluster_tsp_arvore(
+                motor_escolhido.nome, cluster_id, destinos, labels_clusters, czoonoses_coords,
+                graph, node_coords, tabela, margem_dinamica=motor_escolhido.nome != 'trad'
+            )
         if rota:
             todas_as_rotas[cluster_id] = (rota, distancia)
-            
+
     print("\n=== PLANEJAMENTO DE TODAS AS ROTAS CONCLUÍDO ===")
     return todas_as_rotas
 
-def dijkstra_min_heap(graph, source):
-    """
-    Dijkstra com min-heap (O(E + V log V)),
-    retornando (dist, pred) para todo nó.
-    """
-    dist = {n: float('inf') for n in graph}
-    dist[source] = 0
-    pred = {n: None for n in graph}
-    visited = set()
-    heap = [(0, source)]
-
-    while heap:
-        d_u, u = heapq.heappop(heap)
-        if u in visited:
-            continue
-        visited.add(u)
-        for v, w, _ in graph[u]:
-            nd = d_u + w
-            if nd < dist[v]:
-                dist[v] = nd
-                pred[v] = u
-                heapq.heappush(heap, (nd, v))
-    return dist, pred
-
-def tracar_rota_cluster_tsp_dijkstra_min_heap(cluster_alvo_id, destinos, labels_clusters, czoonoses_coords, graph, node_coords):
-    """
-    Traça rota NN+retorno para o cluster usando Dijkstra com min-heap
-    em subgrafo reduzido com margem dinâmica e fallback.
-    """
-    # 1) nó do depósito e destinos do cluster
-    start = encontrar_no_mais_proximo(node_coords, *czoonoses_coords)
-    nomes = [n for n, c in labels_clusters.items() if c == cluster_alvo_id]
-    dest_nodes = [
-        encontrar_no_mais_proximo(node_coords, lat, lon)
-        for n in nomes for (lon, lat) in [destinos[n]]
-    ]
-    cluster_nodes = [start] + dest_nodes
-
-    # 2) margem dinâmica
-    lats = [node_coords[n][0] for n in cluster_nodes]
-    lons = [node_coords[n][1] for n in cluster_nodes]
-    span_lat = max(lats) - min(lats)
-    span_lon = max(lons) - min(lons)
-    margem = max(span_lat, span_lon) * 0.5 + 0.005
-
-    # 3) extrai sub-grafo
-    subg = extrair_subgrafo_por_cluster(cluster_nodes, node_coords, graph, margem)
-
-    # 4) Nearest-Neighbor usando Dijkstra min-heap one-to-all
-    rota = [start]
-    atual = start
-    total = 0.0
-    restantes = set(dest_nodes)
 
-    while restantes:
-        dist_map, pred_map = dijkstra_min_heap(subg, atual)
-        viz = min(restantes, key=lambda n: dist_map.get(n, float('inf')))
-        dmin = dist_map[viz]
-
-        # reconstrói caminho até viz
-        caminho = []
-        cur = viz
-        while cur is not None:
-            caminho.append(cur)
-            cur = pred_map[cur]
-        caminho.reverse()
-
-        rota.extend(caminho[1:])
-        total += dmin
-        atual = viz
-        restantes.remove(viz)
+def planejar_rotas_para_todos_os_clusters_a_star(destinos, labels_clusters, czoonoses_coords, graph, node_coords, tabela=None):
+    return planejar_rotas_para_todos_os_clusters('a_star', destinos, labels_clusters, czoonoses_coords,
+                                                 graph, node_coords, tabela)
 
-    # 5) volta ao depósito
-    dist_map, pred_map = dijkstra_min_heap(subg, atual)
-    if dist_map.get(start, float('inf')) == float('inf'):
-        # fallback no grafo completo
-        full_dist, full_pred = dijkstra_min_heap(graph, atual)
-        d_back = full_dist[start]
-        caminho_back = []
-        cur = start
-        while cur is not None:
-            caminho_back.append(cur)
-            cur = full_pred[cur]
-        caminho_back.reverse()
-    else:
-        d_back = dist_map[start]
-        caminho_back = []
-        cur = start
-        while cur is not None:
-            caminho_back.append(cur)
-            cur = pred_map[cur]
-        caminho_back.reverse()
 
-    rota.extend(caminho_back[1:])
-    total += d_back
+def planejar_rotas_para_todos_os_clusters_dijkstra_trad(destinos, labels_clusters, czoonoses_coords, graph, node_coords, tabela=None):
+    return planejar_rotas_para_todos_os_clusters('trad', destinos, labels_clusters, czoonoses_coords,
+                                                 graph, node_coords, tabela)
 
-    print(f"Cluster {cluster_alvo_id+1}: {len(rota)} nós, {total/1000:.2f} km")
-    return rota, total
 
-def planejar_rotas_para_todos_os_clusters_min_heap(destinos, labels_clusters, czoonoses_coords, graph, node_coords):
-    """
-    Itera sobre todos os clusters e chama
-    tracar_rota_cluster_tsp_dijkstra_min_heap para cada um.
-    """
-    print("\n=== INICIANDO PLANEJAMENTO DE ROTAS (min-heap) ===")
-    rotas = {}
-    for cid in sorted(set(labels_clusters.values())):
-        rota, dist = tracar_rota_cluster_tsp_dijkstra_min_heap(
-            cluster_alvo_id=cid,
-            destinos=destinos,
-            labels_clusters=labels_clusters,
-            czoonoses_coords=czoonoses_coords,
-            graph=graph,
-            node_coords=node_coords
-        )
-        if rota:
-            rotas[cid] = (rota, dist)
-    print("=== PLANEJAMENTO CONCLUÍDO ===")
-    return rotas
+def planejar_rotas_para_todos_os_clusters_min_heap(destinos, labels_clusters, czoonoses_coords, graph, node_coords, tabela=None):
+    return planejar_rotas_para_todos_os_clusters('heap', destinos, labels_clusters, czoonoses_coords,
+                                                 graph, node_coords, tabela)
 
 
 def gerar_rotas_aleatorias_a_star(
     destinos, czoonoses_coords, graph, node_coords,
-    num_operadores=10, seed=42
+    num_operadores=10, seed=42, tabela=None, motor='a_star'
 ):
+    buscar = a_star if motor == 'a_star' else obter_motor(motor).caminho
     random.seed(seed)
     nomes = list(destinos.keys())
     random.shuffle(nomes)
@@ -435,23 +290,24 @@ def gerar_rotas_aleatorias_a_star(
         grupos[i % num_operadores].append(nome)
 
     resultado = {}
-    start = encontrar_no_mais_proximo(node_coords, *czoonoses_coords)
+    if tabela is None:
+        tabela = ajustar_destinos_ao_grafo(graph, node_coords, destinos, czoonoses_coords)
+    start = tabela['no_deposito']
 
     for op_id, grupo in enumerate(grupos, 1):
         rota = [start]
         total = 0.0
         atual = start
         for nome in grupo:
-            lon, lat = destinos[nome]
-            dest_node = encontrar_no_mais_proximo(node_coords, lat, lon)
-            path, dist = a_star(graph, atual, dest_node, node_coords)
+            dest_node = tabela['destinos'][nome]['no']
+            path, dist = buscar(graph, atual, dest_node, node_coords)
             if not path:
                 print(f"[Op{op_id}] falha em {nome}")
                 continue
             rota.extend(path[1:])
             total += dist
             atual = dest_node
-        back, dback = a_star(graph, atual, start, node_coords)
+        back, dback = buscar(graph, atual, start, node_coords)
         if back:
             rota.extend(back[1:])
             total += dback
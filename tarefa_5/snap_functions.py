@@ -0,0 +1,123 @@
+import os
+import json
+import pickle
+import hashlib
+
+from graph_functions import chave_grafo, distancias_a_partir_de
+from compartilhado.roteamento.snap import IndiceNos
+
+# Função para ajustar (snap) todos os destinos ao grafo de uma só vez
+def ajustar_destinos_ao_grafo(graph, node_coords, destinos, czoonoses_coords):
+    """
+    Associa cada destino ao nó mais próximo do grafo em uma única consulta a uma
+    KD-tree e verifica, com um só Dijkstra a partir do Centro de Zoonoses, quais
+    destinos são alcançáveis pela rede viária.
+
+    Parâmetros:
+    - graph: grafo da rede viária
+    - node_coords: dicionário {no: (lat, lon)}
+    - destinos: dicionário {nome: (lon, lat)} ou DestinosColunares
+    - czoonoses_coords: tupla (lat, lon) do CZO
+
+    Retorna:
+    - tabela: dicionário com
+        'no_deposito': nó do grafo mais próximo do CZO
+        'destinos': {nome: {'lon', 'lat', 'no', 'dist_snap_m',
+                            'alcancavel', 'dist_deposito_m'}}
+    """
+    import numpy as np
+
+    if hasattr(destinos, 'lonlat'):
+        # DestinosColunares: visões das colunas, sem conversão para dicionário
+        nomes, lonlat = destinos.nomes, destinos.lonlat
+    else:
+        nomes = list(destinos)
+        lonlat = np.array([destinos[nome] for nome in nomes], dtype=np.float64).reshape(-1, 2)
+
+    # Ajusta o depósito e todos os destinos em uma única consulta à KD-tree
+    lats = np.concatenate([[czoonoses_coords[0]], lonlat[:, 1]])
+    lons = np.concatenate([[czoonoses_coords[1]], lonlat[:, 0]])
+    nos, dists_snap = IndiceNos(node_coords).ajustar(lats, lons)
+
+    no_deposito = nos[0]
+    dist_deposito = distancias_a_partir_de(graph, no_deposito)
+
+    tabela_destinos = {}
+    for i, nome in enumerate(nomes):
+        no = nos[i + 1]
+        alcancavel = no in dist_deposito and len(graph.get(no, [])) > 0
+        tabela_destinos[nome] = {
+            'lon': float(lonlat[i, 0]),
+            'lat': float(lonlat[i, 1]),
+            'no': no,
+            'dist_snap_m': float(dists_snap[i + 1]),
+            'alcancavel': alcancavel,
+            'dist_deposito_m': dist_deposito.get(no, float('infinity'))
+        }
+
+    n_alcancaveis = sum(1 for d in tabela_destinos.values() if d['alcancavel'])
+    print(f"Destinos ajustados ao grafo: {len(tabela_destinos)} "
+          f"({n_alcancaveis} alcançáveis a partir do CZO)")
+
+    return {'no_deposito': no_deposito, 'destinos': tabela_destinos}
+
+# Gera uma chave que identifica o conjunto de destinos e o depósito
+def _chave_destinos(destinos, czoonoses_coords):
+    if hasattr(destinos, 'lonlat'):
+        # DestinosColunares: hash direto dos buffers das colunas
+        h = hashlib.sha1(json.dumps([list(czoonoses_coords), destinos.bairros]).encode())
+        h.update(destinos.codigos_bairro.tobytes())
+        h.update(destinos.lonlat.tobytes())
+        return h.hexdigest()[:12]
+
+    conteudo = json.dumps(
+        [list(czoonoses_coords), sorted((nome, list(c)) for nome, c in destinos.items())]
+    )
+    return hashlib.sha1(conteudo.encode()).hexdigest()[:12]
+
+# Gera uma impressão digital do grafo: o mesmo bbox com dados novos do OSM
+# tem outros nós, e a tabela antiga apontaria para nós que não existem mais
+def _chave_conteudo_grafo(graph, node_coords):
+    import numpy as np
+
+    ids = np.sort(np.fromiter(node_coords.keys(), dtype=np.int64, count=len(node_coords)))
+    n_arestas = sum(len(vizinhos) for vizinhos in graph.values())
+    h = hashlib.sha1(repr((len(ids), n_arestas)).encode())
+    h.update(ids.tobytes())
+    return h.hexdigest()[:12]
+
+# Função para carregar a tabela de destinos do cache ou calculá-la
+def carregar_tabela_destinos(graph, node_coords, destinos, czoonoses_coords,
+                             bounds=None, pasta_cache='cache'):
+    """
+    Retorna a tabela de destinos ajustados ao grafo (ver ajustar_destinos_ao_grafo),
+    salvando-a ao lado do grafo em cache. Se bounds não for informado, a tabela é
+    apenas calculada, sem persistência.
+
+    Parâmetros:
+    - graph, node_coords, destinos, czoonoses_coords: ver ajustar_destinos_ao_grafo
+    - bounds: limites usados para criar o grafo (identificam o cache do grafo)
+    - pasta_cache: pasta do cache (a mesma de carregar_grafo_com_cache)
+
+    A chave do arquivo inclui a impressão digital do grafo (nós e número de
+    arestas), então um grafo baixado de novo para o mesmo bbox gera outra tabela.
+    """
+    if bounds is None:
+        return ajustar_destinos_ao_grafo(graph, node_coords, destinos, czoonoses_coords)
+
+    arquivo = os.path.join(
+        pasta_cache,
+        f"destinos_{chave_grafo(bounds)}_{_chave_conteudo_grafo(graph, node_coords)}_"
+        f"{_chave_destinos(destinos, czoonoses_coords)}.pkl"
+    )
+    if os.path.exists(arquivo):
+        print(f"Carregando tabela de destinos do cache: {arquivo}")
+        with open(arquivo, 'rb') as f:
+            return pickle.load(f)
+
+    tabela = ajustar_destinos_ao_grafo(graph, node_coords, destinos, czoonoses_coords)
+    os.makedirs(pasta_cache, exist_ok=True)
+    with open(arquivo, 'wb') as f:
+        pickle.dump(tabela, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    return tabela
@@ -0,0 +1,74 @@
+"""
+Mede o tempo de importação do núcleo de roteamento (graph_functions e
+geo_functions) em um processo Python novo e falha se ele ultrapassar o
+orçamento ou se alguma biblioteca pesada for carregada junto.
+
+Uso:
+$ python verificar_importacao.py            # orçamento padrão de 0.3 s
+$ python verificar_importacao.py --orcamento 0.5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+MODULOS_NUCLEO = ["graph_functions", "geo_functions", "io_functions"]
+BIBLIOTECAS_PESADAS = ["sklearn", "osmnx", "matplotlib", "requests", "folium", "numpy"]
+
+SCRIPT_MEDICAO = """
+import sys, time
+inicio = time.perf_counter()
+import {modulos}
+duracao = time.perf_counter() - inicio
+pesadas = [m for m in {pesadas!r} if m in sys.modules]
+print(duracao)
+print(",".join(pesadas))
+"""
+
+
+def medir_tempo_importacao(modulos=MODULOS_NUCLEO, repeticoes=5):
+    """
+    Importa os módulos em processos novos e retorna o menor tempo observado
+    (em segundos) e a lista de bibliotecas pesadas que foram carregadas.
+    """
+    script = SCRIPT_MEDICAO.format(modulos=", ".join(modulos), pesadas=BIBLIOTECAS_PESADAS)
+    pasta = os.path.dirname(os.path.abspath(__file__))
+
+    tempos = []
+    pesadas = []
+    for _ in range(repeticoes):
+        saida = subprocess.run(
+            [sys.executable, "-c", script], cwd=pasta,
+            capture_output=True, text=True, check=True
+        ).stdout.split("\n")
+        tempos.append(float(saida[0]))
+        pesadas = [m for m in saida[1].split(",") if m]
+
+    return min(tempos), pesadas
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Verifica o tempo de importação do núcleo de roteamento'
+    )
+    parser.add_argument(
+        '--orcamento', type=float, default=0.3,
+        help='Tempo máximo de importação em segundos (padrão: 0.3)'
+    )
+    args = parser.parse_args()
+
+    tempo, pesadas = medir_tempo_importacao()
+    print(f"Tempo de importação de {', '.join(MODULOS_NUCLEO)}: {tempo * 1000:.1f} ms")
+
+    if pesadas:
+        print(f"ERRO: bibliotecas pesadas carregadas na importação: {', '.join(pesadas)}")
+        sys.exit(1)
+    if tempo > args.orcamento:
+        print(f"ERRO: tempo de importação acima do orçamento de {args.orcamento * 1000:.0f} ms")
+        sys.exit(1)
+    print("Importação dentro do orçamento.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import time
+
+import numpy as np
+
+
+class UniaoBusca:
+    """
+    Estrutura union-find (conjuntos disjuntos) guardada em listas indexadas por
+    inteiros 0..n-1, com compressão de caminho e união por rank.
+    """
+
+    def __init__(self, n):
+        self.pai = list(range(n))
+        self.rank = [0] * n
+        self.componentes = n
+
+    def encontrar(self, x):
+        pai = self.pai
+        # Primeira passada: achar a raiz
+        raiz = x
+        while pai[raiz] != raiz:
+            raiz = pai[raiz]
+        # Segunda passada: compressão de caminho
+        while pai[x] != raiz:
+            pai[x], x = raiz, pai[x]
+        return raiz
+
+    def unir(self, a, b):
+        """Une os conjuntos de a e b. Retorna False se já estavam no mesmo conjunto."""
+        ra, rb = self.encontrar(a), self.encontrar(b)
+        if ra == rb:
+            return False
+        if self.rank[ra] < self.rank[rb]:
+            ra, rb = rb, ra
+        self.pai[rb] = ra
+        if self.rank[ra] == self.rank[rb]:
+            self.rank[ra] += 1
+        self.componentes -= 1
+        return True
+
+
+def kruskal(n, origem, destino, peso):
+    """
+    Algoritmo de Kruskal sobre arestas em arrays.
+
+    Parâmetros:
+    - n: número de vértices (identificados por 0..n-1)
+    - origem, destino: arrays de inteiros com as pontas de cada aresta
+    - peso: array com o peso de cada aresta
+
+    Retorna:
+    - escolhidas: lista com os índices (nos arrays de entrada) das arestas da MST
+      (uma floresta geradora se o grafo for desconexo)
+    - total: soma dos pesos das arestas escolhidas
+    """
+    uf = UniaoBusca(n)
+    ordem = np.argsort(peso, kind='stable')
+    origem = np.asarray(origem)[ordem].tolist()
+    destino = np.asarray(destino)[ordem].tolist()
+    ordem = ordem.tolist()
+
+    escolhidas = []
+    total = 0.0
+    for k, u, v in zip(ordem, origem, destino):
+        if uf.unir(u, v):
+            escolhidas.append(k)
+            total += float(peso[k])
+            if uf.componentes == 1:
+                break
+
+    return escolhidas, total
+
+
+def projetar_xy(lon, lat):
+    """Projeção equiretangular local (metros) centrada na latitude média."""
+    R = 6371000
+    lon, lat = np.asarray(lon, dtype=np.float64), np.asarray(lat, dtype=np.float64)
+    lat0 = np.radians(lat.mean())
+    return np.column_stack([R * np.radians(lon) * np.cos(lat0), R * np.radians(lat)])
+
+
+def arestas_candidatas(xy, modo='delaunay', k=5):
+    """
+    Gera pares candidatos (i, j), i < j, para a MST a partir das coordenadas
+    projetadas. A MST euclidiana está contida na triangulação de Delaunay, e
+    rotas viárias costumam seguir a geometria, então poucos pares bastam.
+
+    Parâmetros:
+    - xy: array (P x 2) com coordenadas projetadas em metros
+    - modo: 'delaunay' (scipy.spatial.Delaunay) ou 'knn' (k vizinhos mais próximos)
+    - k: número de vizinhos no modo 'knn'
+
+    Retorna:
+    - array (m x 2) de pares únicos de índices
+    """
+    from scipy.spatial import Delaunay, cKDTree
+    from scipy.spatial import QhullError
+
+    P = len(xy)
+    pares = set()
+
+    if modo == 'delaunay' and P >= 4:
+        try:
+            tri = Delaunay(xy)
+            for simplex in tri.simplices:
+                a, b, c = sorted(int(x) for x in simplex)
+                pares.update({(a, b), (a, c), (b, c)})
+        except QhullError:
+            # Pontos colineares ou degenerados: cair para k vizinhos
+            modo = 'knn'
+    elif modo == 'delaunay':
+        modo = 'knn'
+
+    if modo == 'knn':
+        kk = min(k + 1, P)
+        _, vizinhos = cKDTree(xy).query(xy, k=kk)
+        vizinhos = np.asarray(vizinhos).reshape(P, kk)
+        for i in range(P):
+            for j in vizinhos[i, 1:]:
+                j = int(j)
+                if j != i:
+                    pares.add((min(i, j), max(i, j)))
+    elif modo != 'delaunay':
+        raise ValueError(f"Modo de poda desconhecido: {modo}")
+
+    return np.array(sorted(pares), dtype=np.int64).reshape(-1, 2)
+
+
+def mst_praias_podada(grafo, praia_nodes, modo='delaunay', k=5, weight='length', validar=False):
+    """
+    Calcula a MST entre as praias consultando distâncias viárias apenas para os
+    pares candidatos (Delaunay ou k vizinhos sobre coordenadas projetadas).
+
+    Parâmetros:
+    - grafo: grafo viário não-direcionado com atributos 'x' (lon) e 'y' (lat) nos nós
+    - praia_nodes: lista dos nós do grafo mais próximos das praias
+    - modo, k: ver arestas_candidatas
+    - weight: atributo de peso das arestas do grafo
+    - validar: se True, calcula também a MST exata sobre o grafo completo e compara
+
+    Retorna:
+    - mst_edges: lista [(u, v, {'weight', 'caminho'}), ...], no formato de plotar_mst_praias
+    - total: comprimento total da MST em metros
+    - estatisticas: dicionário com consultas feitas/evitadas, tempos e validação
+    """
+    from mst_praias import matriz_distancias_praias
+
+    P = len(praia_nodes)
+    xy = projetar_xy([grafo.nodes[n]['x'] for n in praia_nodes],
+                     [grafo.nodes[n]['y'] for n in praia_nodes])
+
+    inicio = time.perf_counter()
+    pares = arestas_candidatas(xy, modo=modo, k=k)
+    dist, caminhos = matriz_distancias_praias(grafo, praia_nodes, weight=weight,
+                                              pares=[tuple(p) for p in pares.tolist()])
+
+    # Arestas candidatas com caminho viário existente
+    pesos = dist[pares[:, 0], pares[:, 1]]
+    validas = np.isfinite(pesos)
+    origem, destino, pesos = pares[validas, 0], pares[validas, 1], pesos[validas]
+
+    escolhidas, total = kruskal(P, origem, destino, pesos)
+    tempo_podada = time.perf_counter() - inicio
+
+    mst_edges = []
+    for e in escolhidas:
+        u, v = praia_nodes[origem[e]], praia_nodes[destino[e]]
+        mst_edges.append((u, v, {'weight': float(pesos[e]), 'caminho': caminhos[(u, v)]}))
+
+    total_pares = P * (P - 1) // 2
+    estatisticas = {
+        'praias': P,
+        'pares_totais': total_pares,
+        'consultas_viarias': len(pares),
+        'consultas_evitadas': total_pares - len(pares),
+        'arestas_mst': len(mst_edges),
+        'tempo_s': tempo_podada
+    }
+
+    print(f"Pares candidatos ({modo}): {len(pares)} de {total_pares} "
+          f"({total_pares - len(pares)} consultas viárias evitadas)")
+    if len(mst_edges) < P - 1:
+        print(f"⚠️ As arestas candidatas não conectam todas as praias: "
+              f"floresta com {len(mst_edges)} arestas")
+
+    if validar:
+        estatisticas.update(validar_contra_exato(grafo, praia_nodes, total, weight=weight))
+
+    return mst_edges, total, estatisticas
+
+
+def validar_contra_exato(grafo, praia_nodes, total_podado, weight='length'):
+    """
+    Calcula a MST exata sobre o grafo completo entre as praias (todas as P²
+    distâncias viárias) e compara com o total obtido com poda.
+    """
+    from mst_praias import matriz_distancias_praias
+
+    P = len(praia_nodes)
+    inicio = time.perf_counter()
+    dist, _ = matriz_distancias_praias(grafo, praia_nodes, weight=weight)
+    i, j = np.triu_indices(P, k=1)
+    pesos = dist[i, j]
+    validas = np.isfinite(pesos)
+    _, total_exato = kruskal(P, i[validas], j[validas], pesos[validas])
+    tempo_exato = time.perf_counter() - inicio
+
+    diferenca = total_podado - total_exato
+    print(f"MST exata: {total_exato:.1f} m | MST podada: {total_podado:.1f} m | "
+          f"diferença: {diferenca:.1f} m ({100 * diferenca / total_exato if total_exato else 0:.2f}%)")
+
+    return {
+        'total_exato': total_exato,
+        'diferenca_m': diferenca,
+        'igual_ao_exato': bool(abs(diferenca) <= 1e-6 * max(total_exato, 1.0)),
+        'tempo_exato_s': tempo_exato
+    }
@@ -0,0 +1,324 @@
+import os
+import heapq
+import pickle
+import hashlib
+
+import numpy as np
+import networkx as nx
+import matplotlib.pyplot as plt
+
+
+def to_undirected_multigraph(G):
+    """
+    Converte um MultiDiGraph direcionado em um MultiGraph não-direcionado,
+    preservando atributos dos nós e arestas.
+    """
+    H = nx.MultiGraph()
+    # Copiar nós e seus atributos
+    for n, data in G.nodes(data=True):
+        H.add_node(n, **data)
+
+    # Copiar arestas e seus atributos, sem direcionamento
+    for u, v, data in G.edges(data=True):
+        # Em um MultiGraph, se já existir uma aresta u-v, esta será adicionada como mais uma aresta paralela
+        H.add_edge(u, v, **data)
+
+    # Copiar atributos do grafo
+    H.graph.update(G.graph)
+    return H
+
+
+def _lista_adjacencia(grafo, weight='length'):
+    """
+    Monta uma lista de adjacência {u: [(v, peso), ...]} usando, entre arestas
+    paralelas, a de menor peso (o mesmo critério do nx.shortest_path).
+    """
+    adj = {}
+    for u, vizinhos in grafo.adj.items():
+        lista = []
+        for v, dados in vizinhos.items():
+            if grafo.is_multigraph():
+                peso = min(d.get(weight, 1) for d in dados.values())
+            else:
+                peso = dados.get(weight, 1)
+            lista.append((v, peso))
+        adj[u] = lista
+    return adj
+
+
+def _dijkstra_um_para_muitos(adj, origem, alvos):
+    """
+    Dijkstra com min-heap a partir de origem que para assim que todos os alvos
+    forem assentados. Retorna (dist, pred) apenas dos nós explorados.
+    """
+    dist = {origem: 0}
+    pred = {origem: None}
+    visitados = set()
+    restantes = set(alvos)
+    heap = [(0, origem)]
+
+    while heap and restantes:
+        d_u, u = heapq.heappop(heap)
+        if u in visitados:
+            continue
+        visitados.add(u)
+        restantes.discard(u)
+        for v, w in adj.get(u, []):
+            nd = d_u + w
+            if nd < dist.get(v, float('inf')):
+                dist[v] = nd
+                pred[v] = u
+                heapq.heappush(heap, (nd, v))
+
+    return dist, pred
+
+
+def _chave_cache(grafo, praia_nodes, weight):
+    # A matriz em cache é indexada pela ordem de praia_nodes, então a ordem entra
+    # na chave; os pesos das arestas também, para não reaproveitar distâncias de
+    # um grafo que mudou sem mudar de tamanho
+    h = hashlib.sha1(repr((tuple(praia_nodes), weight)).encode())
+    for u, v, peso in grafo.edges(data=weight):
+        h.update(repr((u, v, peso)).encode())
+    return h.hexdigest()[:12]
+
+
+def matriz_distancias_praias(grafo, praia_nodes, weight='length', pasta_cache=None, pares=None):
+    """
+    Calcula as distâncias pela rede viária (e os caminhos) entre as praias com
+    uma busca de Dijkstra por praia, que termina quando todas as outras praias
+    forem alcançadas. Substitui as P² chamadas de nx.shortest_path.
+
+    Parâmetros:
+    - grafo: grafo viário (networkx, não-direcionado)
+    - praia_nodes: lista dos nós do grafo mais próximos das praias
+    - weight: atributo de peso das arestas
+    - pasta_cache: se informada, distâncias e caminhos são salvos/lidos dessa pasta
+    - pares: opcional, lista de pares (i, j) de índices de praias; se informada,
+      apenas esses pares são calculados (ver kruskal.py) e nada é salvo em cache
+
+    Retorna:
+    - dist: matriz numpy (P x P) em metros; np.inf onde não há caminho
+      (ou onde o par não foi pedido)
+    - caminhos: dicionário {(u, v): [u, ..., v]} com u, v nós de praia
+    """
+    arquivo = None
+    if pasta_cache is not None and pares is None:
+        arquivo = os.path.join(pasta_cache, f"distancias_praias_{_chave_cache(grafo, praia_nodes, weight)}.pkl")
+        if os.path.exists(arquivo):
+            print(f"📦 Carregando distâncias entre praias do cache: {arquivo}")
+            with open(arquivo, 'rb') as f:
+                return pickle.load(f)
+
+    adj = _lista_adjacencia(grafo, weight)
+    P = len(praia_nodes)
+    dist = np.full((P, P), np.inf)
+    np.fill_diagonal(dist, 0)
+    caminhos = {}
+
+    # Cada par é calculado uma única vez, a partir do menor índice (grafo não-direcionado)
+    alvos_por_origem = {i: [] for i in range(P)}
+    if pares is None:
+        for i in range(P):
+            alvos_por_origem[i] = list(range(i + 1, P))
+    else:
+        for i, j in pares:
+            if i != j:
+                alvos_por_origem[min(i, j)].append(max(i, j))
+
+    for i, origem in enumerate(praia_nodes):
+        indices_alvo = sorted(set(alvos_por_origem[i]))
+        alvos = [praia_nodes[j] for j in indices_alvo]
+        if not alvos:
+            continue
+
+        d, pred = _dijkstra_um_para_muitos(adj, origem, alvos)
+        for j, alvo in zip(indices_alvo, alvos):
+            if alvo not in d:
+                continue
+            dist[i, j] = dist[j, i] = d[alvo]
+
+            caminho = []
+            atual = alvo
+            while atual is not None:
+                caminho.append(atual)
+                atual = pred[atual]
+            caminho.reverse()
+            caminhos[(origem, alvo)] = caminho
+            caminhos[(alvo, origem)] = caminho[::-1]
+
+    if arquivo is not None:
+        os.makedirs(pasta_cache, exist_ok=True)
+        with open(arquivo, 'wb') as f:
+            pickle.dump((dist, caminhos), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    return dist, caminhos
+
+
+def construir_grafo_interesse(praia_nodes, dist, caminhos):
+    """
+    Constrói o grafo completo entre as praias, com o peso igual à distância pela
+    rede e o caminho viário guardado no atributo 'caminho' de cada aresta.
+    """
+    G_interest = nx.Graph()
+    P = len(praia_nodes)
+    for i in range(P):
+        for j in range(i + 1, P):
+            if np.isfinite(dist[i, j]):
+                u, v = praia_nodes[i], praia_nodes[j]
+                G_interest.add_edge(u, v, weight=float(dist[i, j]), caminho=caminhos[(u, v)])
+    return G_interest
+
+
+def calcular_mst(G_interest):
+    """
+    Calcula a MST do grafo entre as praias (Kruskal) e seu comprimento total.
+
+    Retorna:
+    - mst_edges: lista [(u, v, dados), ...] em que dados contém 'weight' e 'caminho'
+    - total: comprimento total da MST em metros
+    """
+    from kruskal import kruskal
+
+    nos = list(G_interest.nodes)
+    indice = {no: i for i, no in enumerate(nos)}
+    arestas = list(G_interest.edges(data=True))
+    origem = np.array([indice[u] for u, v, d in arestas], dtype=np.int64)
+    destino = np.array([indice[v] for u, v, d in arestas], dtype=np.int64)
+    peso = np.array([d['weight'] for u, v, d in arestas], dtype=np.float64)
+
+    escolhidas, total = kruskal(len(nos), origem, destino, peso)
+    mst_edges = [arestas[k] for k in escolhidas]
+    return mst_edges, total
+
+
+def _pontos_praias(pois):
+    # Substituir geometrias que não são Point por seus centroides
+    pois['geometry'] = pois['geometry'].apply(
+        lambda g: g.centroid if g.geom_type != 'Point' else g
+    )
+    # Filtrar apenas as praias com geometria válida
+    return pois[pois.geometry.type == 'Point']
+
+
+def plotar_mapa_com_pois(grafo, pois, margem=0.01):
+    """
+    Plota o grafo com as praias extraídas do OSM, ajustando a área de visualização automaticamente.
+    """
+    import osmnx as ox
+
+    print("🔍 Preparando dados para o plot...")
+
+    praia = _pontos_praias(pois)
+
+    if praia.empty:
+        print("⚠️ Nenhuma praia com geometria válida foi encontrada para plotar.")
+        return
+
+    # Coordenadas das praias
+    lats = praia.geometry.y
+    lons = praia.geometry.x
+
+    # Calcular limites do mapa
+    min_lat, max_lat = lats.min() - margem, lats.max() + margem
+    min_lon, max_lon = lons.min() - margem, lons.max() + margem
+
+    print(f"🗺️ Plotando mapa de Natal com {len(praia)} praias...")
+    fig, ax = plt.subplots(figsize=(16, 12))
+
+    # Plotar o grafo
+    ox.plot_graph(
+        grafo,
+        ax=ax,
+        node_size=0,
+        edge_color='gray',
+        edge_linewidth=0.5,
+        show=False,
+        close=False
+    )
+
+    # Plotar as praias
+    praia.plot(
+        ax=ax,
+        color='darkred',
+        markersize=40,
+        marker='o',
+        alpha=0.8,
+        label=f'praias ({len(praia)})'
+    )
+
+    # Ajustes visuais
+    ax.set_xlim(min_lon, max_lon)
+    ax.set_ylim(min_lat, max_lat)
+    ax.set_title("Mapa praias de Natal - RN", fontsize=16)
+    ax.set_xlabel("Longitude")
+    ax.set_ylabel("Latitude")
+    ax.grid(True, linestyle='--', alpha=0.3)
+    ax.legend(loc='upper left')
+
+    plt.tight_layout()
+    plt.show()
+
+
+def plotar_mst_praias(grafo, pois, mst_edges, praia_nodes, margem=0.01):
+    """
+    Plota o grafo da cidade com as praias e destaca as rotas da MST em vermelho.
+
+    - grafo: grafo viário (networkx.MultiDiGraph)
+    - pois: GeoDataFrame com praias
+    - mst_edges: lista de arestas da MST, formato [(u,v,d), ...]; se d tiver o
+      atributo 'caminho' (ver calcular_mst), o caminho é reaproveitado
+    - praia_nodes: lista dos nós do grafo mais próximos das praias
+    """
+    import osmnx as ox
+
+    praia = _pontos_praias(pois)
+
+    if praia.empty:
+        print("⚠️ Nenhuma praia válida para plotar.")
+        return
+
+    lats = praia.geometry.y
+    lons = praia.geometry.x
+
+    min_lat, max_lat = lats.min() - margem, lats.max() + margem
+    min_lon, max_lon = lons.min() - margem, lons.max() + margem
+
+    print(f"🗺️ Plotando mapa com {len(praia)} praias e MST...")
+
+    fig, ax = plt.subplots(figsize=(16, 12), dpi=100)
+
+    # Plotar grafo base
+    ox.plot_graph(
+        grafo,
+        ax=ax,
+        node_size=0,
+        edge_color='gray',
+        edge_linewidth=0.5,
+        show=False,
+        close=False
+    )
+
+    # Plotar MST em vermelho, reaproveitando os caminhos já calculados
+    for (u, v, d) in mst_edges:
+        route = d.get('caminho') or nx.shortest_path(grafo, u, v, weight='length')
+        x = [grafo.nodes[n]['x'] for n in route]
+        y = [grafo.nodes[n]['y'] for n in route]
+        ax.plot(x, y, color='red', linewidth=2, zorder=4)
+
+    # Plotar praias em azul
+    poi_x = [grafo.nodes[n]['x'] for n in praia_nodes]
+    poi_y = [grafo.nodes[n]['y'] for n in praia_nodes]
+    ax.scatter(poi_x, poi_y, c='blue', s=80, zorder=5, edgecolor='black', label='praias')
+
+    # Ajustes visuais
+    ax.set_xlim(min_lon, max_lon)
+    ax.set_ylim(min_lat, max_lat)
+    ax.set_title("Mapa praias de Natal - RN com MST", fontsize=16)
+    ax.set_xlabel("Longitude")
+    ax.set_ylabel("Latitude")
+    ax.grid(True, linestyle='--', alpha=0.3)
+    ax.legend(loc='upper left')
+
+    plt.tight_layout()
+    plt.show()
@@ -0,0 +1,226 @@
+import os
+import pickle
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+RAIO_TERRA_KM = 6371.0
+
+# Matriz esparsa usada pelos workers do Dijkstra
+_MATRIZ = None
+
+
+def distancia_haversine_km(lat1, lon1, lat2, lon2):
+    """Distância de grande círculo (km) entre arrays de coordenadas em graus."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(x, dtype=np.float64)) for x in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * RAIO_TERRA_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def comprimentos_rotas(grafo):
+    """Comprimento de grande círculo (km) de cada rota do GrafoVoos; NaN sem coordenadas."""
+    return distancia_haversine_km(grafo.latitude[grafo.origem], grafo.longitude[grafo.origem],
+                                  grafo.latitude[grafo.destino], grafo.longitude[grafo.destino])
+
+
+def _iniciar_worker(matriz):
+    global _MATRIZ
+    _MATRIZ = matriz
+
+
+def _dijkstra_fontes(fontes):
+    from scipy.sparse.csgraph import dijkstra
+
+    return dijkstra(_MATRIZ, directed=True, indices=fontes, return_predecessors=True)
+
+
+def caminhos_minimos(origem, destino, pesos, n, workers=None):
+    """
+    Caminhos mínimos entre todos os pares com um Dijkstra por fonte
+    (scipy.sparse.csgraph), com as fontes divididas entre processos.
+
+    Retorna:
+    - dist: matriz (n x n) de distâncias (np.inf se inalcançável)
+    - pred: matriz (n x n) de predecessores (-9999 se não há)
+    """
+    from scipy.sparse import csr_matrix
+
+    matriz = csr_matrix((pesos, (origem, destino)), shape=(n, n))
+    workers = min(workers or os.cpu_count() or 1, n)
+    if workers <= 1 or n < 2:
+        _iniciar_worker(matriz)
+        return _dijkstra_fontes(np.arange(n))
+
+    blocos = np.array_split(np.arange(n), workers * 2)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_worker, initargs=(matriz,)) as pool:
+        partes = list(pool.map(_dijkstra_fontes, blocos))
+    return np.vstack([d for d, _ in partes]), np.vstack([p for _, p in partes])
+
+
+def _dependencia_hubs(dist, pred):
+    # Para cada fonte s, quantos destinos têm cada nó como escala no caminho
+    # mínimo: é o número de descendentes do nó na árvore de caminhos mínimos de s
+    # (em empates, vale o predecessor escolhido pelo scipy)
+    n = dist.shape[0]
+    contagem = np.zeros(n)
+    for s in range(n):
+        alcancaveis = np.flatnonzero(np.isfinite(dist[s]))
+        ordem = alcancaveis[np.argsort(dist[s, alcancaveis])[::-1]]
+        descendentes = np.zeros(n)
+        for v in ordem.tolist():
+            p = pred[s, v]
+            if p >= 0 and p != s:
+                descendentes[p] += descendentes[v] + 1
+        contagem += descendentes
+    return contagem
+
+
+def _chave_cache(grafo):
+    h = hashlib.sha1()
+    h.update('|'.join(grafo.aeroportos.tolist()).encode())
+    for arr in (grafo.latitude, grafo.longitude, grafo.origem, grafo.destino, grafo.voos):
+        h.update(np.ascontiguousarray(arr).tobytes())
+    return h.hexdigest()[:12]
+
+
+class AnaliseMalha:
+    """
+    Análise da malha aérea ponderada: comprimentos de grande círculo das rotas,
+    caminhos mínimos entre todos os pares (em km e em número de voos/escalas),
+    desvio em relação à linha reta e dependência de hubs.
+
+    As matrizes são calculadas uma vez e guardadas em cache (pickle identificado
+    pelo conteúdo do grafo); consultas seguintes são leituras das matrizes.
+
+    Parâmetros:
+    - grafo: GrafoVoos (ver grafo_voos.py)
+    - workers: processos para os Dijkstras (padrão: número de CPUs)
+    - pasta_cache: pasta do cache (None desativa)
+    """
+
+    def __init__(self, grafo, workers=None, pasta_cache='cache'):
+        self.grafo = grafo
+        self.indice = {icao: i for i, icao in enumerate(grafo.aeroportos.tolist())}
+        self.comprimento_km = comprimentos_rotas(grafo)
+
+        arquivo = None
+        if pasta_cache is not None:
+            arquivo = os.path.join(pasta_cache, f"malha_{_chave_cache(grafo)}.pkl")
+            if os.path.exists(arquivo):
+                print(f"Carregando análise da malha do cache: {arquivo}")
+                with open(arquivo, 'rb') as f:
+                    self.__dict__.update(pickle.load(f))
+                return
+
+        self._calcular(workers)
+
+        if arquivo is not None:
+            os.makedirs(pasta_cache, exist_ok=True)
+            with open(arquivo, 'wb') as f:
+                pickle.dump({k: getattr(self, k) for k in
+                             ('dist_km', 'pred_km', 'saltos', 'pred_saltos', 'direta_km', 'dependencia_hub')},
+                            f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _calcular(self, workers):
+        g = self.grafo
+        n = g.n_nos
+        sem_laco = g.origem != g.destino
+
+        # Distância: só rotas com as duas coordenadas conhecidas
+        com_coords = sem_laco & np.isfinite(self.comprimento_km)
+        descartadas = int(sem_laco.sum() - com_coords.sum())
+        if descartadas:
+            print(f"Aviso: {descartadas} rotas sem coordenadas ficaram fora das distâncias em km")
+        comprimentos = np.maximum(self.comprimento_km[com_coords], 1e-6)
+        self.dist_km, self.pred_km = caminhos_minimos(
+            g.origem[com_coords], g.destino[com_coords], comprimentos, n, workers)
+
+        # Número de voos (saltos)
+        self.saltos, self.pred_saltos = caminhos_minimos(
+            g.origem[sem_laco], g.destino[sem_laco], np.ones(int(sem_laco.sum())), n, workers)
+
+        self.direta_km = distancia_haversine_km(g.latitude[:, None], g.longitude[:, None],
+                                                g.latitude[None, :], g.longitude[None, :])
+        self.dependencia_hub = _dependencia_hubs(self.saltos, self.pred_saltos)
+
+    # Consultas
+    def distancia(self, origem, destino, modo='km'):
+        i, j = self.indice[origem], self.indice[destino]
+        return float((self.dist_km if modo == 'km' else self.saltos)[i, j])
+
+    def caminho(self, origem, destino, modo='km'):
+        """Sequência de aeroportos do caminho mínimo (lista vazia se inalcançável)."""
+        pred = self.pred_km if modo == 'km' else self.pred_saltos
+        i, j = self.indice[origem], self.indice[destino]
+        if i != j and pred[i, j] < 0:
+            return []
+        caminho = [j]
+        while caminho[-1] != i:
+            caminho.append(pred[i, caminho[-1]])
+        return [self.grafo.aeroportos[k] for k in reversed(caminho)]
+
+    def desvio(self, origem, destino):
+        """Razão entre a distância pela malha e a distância em linha reta."""
+        i, j = self.indice[origem], self.indice[destino]
+        return float(self.dist_km[i, j] / self.direta_km[i, j])
+
+    def _matriz_desvio(self):
+        n = self.grafo.n_nos
+        validos = np.isfinite(self.dist_km) & (self.direta_km > 0) & ~np.eye(n, dtype=bool)
+        desvio = np.full((n, n), np.nan)
+        desvio[validos] = self.dist_km[validos] / self.direta_km[validos]
+        return desvio
+
+    def tabela_rotas(self):
+        """Rotas com número de voos, empresas e comprimento em km."""
+        tabela = self.grafo.tabela_arestas()
+        tabela['distancia_km'] = self.comprimento_km
+        return tabela
+
+    def tabela_aeroportos(self):
+        """
+        Métricas por aeroporto: voos, grau, desvio médio das viagens que partem
+        dele, número médio de voos até os demais e dependência como hub (fração
+        dos pares origem-destino cujo caminho mínimo faz escala nele).
+        """
+        g = self.grafo
+        n = g.n_nos
+        tabela = g.tabela_nos()
+        sem_laco = g.origem != g.destino
+        tabela['grau'] = (np.bincount(g.origem[sem_laco], minlength=n)
+                          + np.bincount(g.destino[sem_laco], minlength=n))
+
+        desvio = self._matriz_desvio()
+        validos = np.isfinite(desvio).sum(axis=1)
+        tabela['desvio_medio'] = np.divide(np.nansum(desvio, axis=1), validos,
+                                           out=np.full(n, np.nan), where=validos > 0)
+
+        saltos = np.where(np.isfinite(self.saltos) & ~np.eye(n, dtype=bool), self.saltos, np.nan)
+        alcancaveis = np.isfinite(saltos).sum(axis=1)
+        tabela['alcancaveis'] = alcancaveis
+        tabela['saltos_medios'] = np.divide(np.nansum(saltos, axis=1), alcancaveis,
+                                            out=np.full(n, np.nan), where=alcancaveis > 0)
+
+        pares = int(np.isfinite(saltos).sum())
+        tabela['dependencia_hub'] = self.dependencia_hub / pares if pares else 0.0
+        return tabela
+
+    def resumo(self):
+        """Indicadores globais da malha."""
+        n = self.grafo.n_nos
+        fora_diagonal = ~np.eye(n, dtype=bool)
+        saltos = self.saltos[fora_diagonal]
+        desvio = self._matriz_desvio()
+        desvio = desvio[np.isfinite(desvio)]
+
+        return {
+            'aeroportos': n,
+            'rotas': int((self.grafo.origem != self.grafo.destino).sum()),
+            'voos': int(self.grafo.voos.sum()),
+            'pares_alcancaveis': float(np.isfinite(saltos).mean()) if len(saltos) else 0.0,
+            'eficiencia_global': float(np.mean(np.where(np.isfinite(saltos), 1.0 / saltos, 0.0))) if len(saltos) else 0.0,
+            'saltos_medios': float(saltos[np.isfinite(saltos)].mean()) if np.isfinite(saltos).any() else float('nan'),
+            'desvio_medio': float(desvio.mean()) if len(desvio) else float('nan'),
+            'desvio_mediano': float(np.median(desvio)) if len(desvio) else float('nan'),
+        }
@@ -0,0 +1,183 @@
+import os
+import random
+import heapq
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from kcore import GrafoCSR
+
+# CSR anexado em cada worker: (indptr, indices, pesos) como memoryviews
+_CSR = None
+_MEMORIAS = []
+
+
+def _brandes_fontes(fontes, ponderado):
+    """
+    Algoritmo de Brandes a partir de um subconjunto de fontes sobre o CSR do
+    worker. Retorna o vetor parcial de dependências (soma sobre as fontes).
+    """
+    indptr, indices, pesos = _CSR
+    n = len(indptr) - 1
+    cb = [0.0] * n
+    infinito = float('inf')
+
+    for s in fontes:
+        S = []
+        P = [[] for _ in range(n)]
+        sigma = [0] * n
+        sigma[s] = 1
+
+        if not ponderado:
+            # Busca em largura
+            dist = [-1] * n
+            dist[s] = 0
+            fila = deque([s])
+            while fila:
+                v = fila.popleft()
+                S.append(v)
+                dv, sv = dist[v] + 1, sigma[v]
+                for w in indices[indptr[v]:indptr[v + 1]]:
+                    if dist[w] < 0:
+                        dist[w] = dv
+                        fila.append(w)
+                    if dist[w] == dv:
+                        sigma[w] += sv
+                        P[w].append(v)
+        else:
+            # Dijkstra; sigma[v] está completo quando v sai do heap (pesos > 0)
+            visto = [infinito] * n
+            assentado = [False] * n
+            visto[s] = 0.0
+            heap = [(0.0, s)]
+            while heap:
+                dv, v = heapq.heappop(heap)
+                if assentado[v]:
+                    continue
+                assentado[v] = True
+                S.append(v)
+                sv = sigma[v]
+                for k in range(indptr[v], indptr[v + 1]):
+                    w = indices[k]
+                    if assentado[w]:
+                        continue
+                    nd = dv + pesos[k]
+                    if nd < visto[w]:
+                        visto[w] = nd
+                        heapq.heappush(heap, (nd, w))
+                        sigma[w] = sv
+                        P[w] = [v]
+                    elif nd == visto[w]:
+                        sigma[w] += sv
+                        P[w].append(v)
+
+        # Acumulação das dependências em ordem decrescente de distância
+        delta = [0.0] * n
+        while S:
+            w = S.pop()
+            coef = (1.0 + delta[w]) / sigma[w]
+            for v in P[w]:
+                delta[v] += sigma[v] * coef
+            if w != s:
+                cb[w] += delta[w]
+
+    return np.array(cb)
+
+
+def _anexar_csr(especificacoes):
+    # Inicializador dos workers: anexa os blocos de memória compartilhada sem copiar
+    global _CSR
+    visoes = []
+    for nome, dtype, tamanho in especificacoes:
+        if nome is None:
+            visoes.append(None)
+            continue
+        # Os workers compartilham o resource_tracker do processo principal, que
+        # remove os blocos no final (ver betweenness_paralela)
+        memoria = shared_memory.SharedMemory(name=nome)
+        _MEMORIAS.append(memoria)
+        visoes.append(memoryview(np.ndarray(tamanho, dtype=dtype, buffer=memoria.buf)))
+    _CSR = tuple(visoes)
+
+
+def _compartilhar(arrays):
+    # Copia cada array para um bloco de memória compartilhada
+    memorias, especificacoes = [], []
+    for arr in arrays:
+        if arr is None:
+            especificacoes.append((None, None, 0))
+            continue
+        memoria = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+        np.ndarray(arr.shape, dtype=arr.dtype, buffer=memoria.buf)[:] = arr
+        memorias.append(memoria)
+        especificacoes.append((memoria.name, arr.dtype.str, len(arr)))
+    return memorias, especificacoes
+
+
+def betweenness_paralela(grafo, ponderado=False, normalizado=True, workers=None, k=None, seed=42):
+    """
+    Centralidade de intermediação (Brandes) com as fontes divididas entre
+    processos. O grafo fica em um CSR em memória compartilhada, só para leitura,
+    e cada worker devolve o vetor parcial de dependências das suas fontes, que
+    são somados no final. Os valores seguem a mesma escala do
+    nx.betweenness_centrality.
+
+    Parâmetros:
+    - grafo: GrafoCompacto (ver gexf_stream.ler_gexf_compacto)
+    - ponderado: se True, usa o peso das arestas como distância (Dijkstra);
+      se False, conta saltos (busca em largura)
+    - normalizado: divide por (n-1)(n-2), como o NetworkX
+    - workers: número de processos (padrão: número de CPUs)
+    - k: se informado, usa k fontes sorteadas (estimativa) em vez de todas
+    - seed: semente do sorteio das fontes
+
+    Retorna:
+    - dicionário {no: intermediação}
+    """
+    n = grafo.n_nos
+    csr = GrafoCSR.de_arestas(grafo.rotulos, grafo.origem, grafo.destino,
+                              grafo.peso if ponderado else None, simetrico=not grafo.dirigido)
+    if ponderado and csr.pesos is not None and len(csr.pesos) and csr.pesos.min() <= 0:
+        raise ValueError("A intermediação ponderada exige pesos positivos")
+
+    fontes = list(range(n))
+    if k is not None and k < n:
+        fontes = random.Random(seed).sample(fontes, k)
+
+    workers = min(workers or os.cpu_count() or 1, max(len(fontes), 1))
+    if workers <= 1:
+        global _CSR
+        _CSR = (memoryview(csr.indptr), memoryview(csr.indices),
+                memoryview(csr.pesos) if csr.pesos is not None else None)
+        cb = _brandes_fontes(fontes, ponderado)
+    else:
+        # Blocos pequenos equilibram a carga entre os processos
+        tamanho_bloco = max(1, len(fontes) // (workers * 4))
+        blocos = [fontes[i:i + tamanho_bloco] for i in range(0, len(fontes), tamanho_bloco)]
+        memorias, especificacoes = _compartilhar([csr.indptr, csr.indices, csr.pesos])
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_anexar_csr,
+                                     initargs=(especificacoes,)) as pool:
+                cb = np.zeros(n)
+                for parcial in pool.map(_brandes_fontes, blocos, [ponderado] * len(blocos)):
+                    cb += parcial
+        finally:
+            for memoria in memorias:
+                memoria.close()
+                memoria.unlink()
+
+    # Mesma escala do NetworkX
+    escala = None
+    if normalizado:
+        if n > 2:
+            escala = 1.0 / ((n - 1) * (n - 2))
+    elif not grafo.dirigido:
+        escala = 0.5
+    if escala is not None:
+        if k is not None and k < n:
+            escala *= n / k
+        cb = cb * escala
+
+    return dict(zip(grafo.rotulos, cb.tolist()))
@@ -0,0 +1,161 @@
+import os
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pandas as pd
+
+ARQUIVO_CIDADES = 'código_ICAO_para_aeroportos.csv'
+ARQUIVO_COORDENADAS = 'coordenadas_aeroportos.csv'
+
+# Aeródromos que o Nominatim não encontra, corrigidos manualmente
+COORDENADAS_MANUAIS = {
+    'SNCL': ('Bahia', -13.3854682, -38.9187099),
+}
+
+
+class ResolvedorAeroportos:
+    """
+    Resolve códigos ICAO em coordenadas (latitude, longitude) usando um arquivo
+    local como cache. Apenas códigos que ainda não estão no arquivo são
+    consultados no Nominatim, agrupados por cidade; depois da primeira
+    resolução tudo funciona offline.
+
+    Parâmetros:
+    - arquivo_cidades: CSV com as colunas ICAO e Cidade
+    - arquivo_coordenadas: CSV de cache com ICAO, Cidade, latitude e longitude
+    """
+
+    def __init__(self, arquivo_cidades=ARQUIVO_CIDADES, arquivo_coordenadas=ARQUIVO_COORDENADAS):
+        self.arquivo_coordenadas = arquivo_coordenadas
+
+        self.cidades = {}
+        if os.path.exists(arquivo_cidades):
+            cidades = pd.read_csv(arquivo_cidades, dtype=str)
+            self.cidades = dict(zip(cidades['ICAO'], cidades['Cidade']))
+
+        if os.path.exists(arquivo_coordenadas):
+            self.coordenadas = pd.read_csv(arquivo_coordenadas, dtype={'ICAO': str, 'Cidade': str})
+        else:
+            self.coordenadas = pd.DataFrame(columns=['ICAO', 'Cidade', 'latitude', 'longitude'])
+
+        manuais = pd.DataFrame(
+            [(icao, cidade, lat, lon) for icao, (cidade, lat, lon) in COORDENADAS_MANUAIS.items()],
+            columns=['ICAO', 'Cidade', 'latitude', 'longitude']
+        )
+        self._atualizar(manuais)
+
+    def _atualizar(self, novas):
+        # Novas linhas substituem as existentes com o mesmo ICAO
+        tabela = pd.concat([self.coordenadas, novas], ignore_index=True)
+        self.coordenadas = tabela.drop_duplicates('ICAO', keep='last').reset_index(drop=True)
+
+    def salvar(self):
+        self.coordenadas.to_csv(self.arquivo_coordenadas, index=False)
+
+    def conhecidos(self):
+        return set(self.coordenadas['ICAO'])
+
+    def semear_de_gexf(self, arquivo_gexf):
+        """
+        Importa as coordenadas já resolvidas de um GEXF (atributos latitude e
+        longitude dos nós, como em voos_grafo.gexf). Nós com NaN são ignorados.
+        """
+        titulos, linhas = {}, []
+        for _, elem in ET.iterparse(arquivo_gexf):
+            tag = elem.tag.rsplit('}', 1)[-1]
+            if tag == 'attribute':
+                titulos[elem.get('id')] = elem.get('title')
+            elif tag == 'node':
+                valores = {titulos.get(a.get('for')): a.get('value') for a in elem.iter() if a.tag.endswith('attvalue')}
+                icao = elem.get('id')
+                linhas.append((icao, self.cidades.get(icao),
+                               float(valores.get('latitude', 'nan')), float(valores.get('longitude', 'nan'))))
+                elem.clear()
+
+        novas = pd.DataFrame(linhas, columns=['ICAO', 'Cidade', 'latitude', 'longitude'])
+        novas = novas.dropna(subset=['latitude', 'longitude'])
+        novas = novas[~novas['ICAO'].isin(COORDENADAS_MANUAIS)]
+        self._atualizar(novas)
+        print(f"Coordenadas importadas de {arquivo_gexf}: {len(novas)}")
+
+    def resolver(self, codigos, online=True, pausa=1.0):
+        """
+        Garante que todos os códigos estejam na tabela, consultando o Nominatim
+        apenas para os desconhecidos (uma consulta por cidade). Códigos não
+        encontrados ficam com NaN e não são consultados de novo.
+
+        Parâmetros:
+        - codigos: iterável de códigos ICAO (pode ter repetições)
+        - online: se False, não faz consultas nem altera a tabela
+        - pausa: intervalo mínimo entre consultas, em segundos
+
+        Retorna:
+        - DataFrame com ICAO, Cidade, latitude e longitude (todos os códigos conhecidos)
+        """
+        desconhecidos = sorted(set(pd.unique(pd.Series(list(codigos), dtype=object).dropna())) - self.conhecidos())
+        if not desconhecidos:
+            return self.tabela()
+
+        por_cidade = {}
+        for icao in desconhecidos:
+            por_cidade.setdefault(self.cidades.get(icao), []).append(icao)
+
+        print(f"Códigos ICAO desconhecidos: {len(desconhecidos)} "
+              f"({len(por_cidade)} cidades{' a consultar' if online else ', modo offline'})")
+
+        coordenadas_cidade = {}
+        if online:
+            from geopy.geocoders import Nominatim
+            from geopy.extra.rate_limiter import RateLimiter
+
+            geolocator = Nominatim(user_agent="busca_coordenadas_aeroportos_csv_1.0")
+            geocode = RateLimiter(geolocator.geocode, min_delay_seconds=pausa, swallow_exceptions=True)
+            for cidade in por_cidade:
+                if cidade is None:
+                    continue
+                location = geocode(f"{cidade}, Brasil", timeout=10)
+                if location:
+                    coordenadas_cidade[cidade] = (location.latitude, location.longitude)
+                else:
+                    print(f"AVISO: Coordenadas não encontradas para {cidade} ({', '.join(por_cidade[cidade])})")
+
+        if online:
+            linhas = []
+            for cidade, icaos in por_cidade.items():
+                lat, lon = coordenadas_cidade.get(cidade, (np.nan, np.nan))
+                linhas.extend((icao, cidade, lat, lon) for icao in icaos)
+            self._atualizar(pd.DataFrame(linhas, columns=['ICAO', 'Cidade', 'latitude', 'longitude']))
+            self.salvar()
+
+        return self.tabela()
+
+    def tabela(self):
+        return self.coordenadas.copy()
+
+    def anexar_coordenadas(self, voos, coluna_origem='ICAO Aeródromo Origem',
+                           coluna_destino='ICAO Aeródromo Destino'):
+        """
+        Acrescenta latitude/longitude de origem e destino aos voos com uma única
+        tabela de consulta (substitui os dois merges do notebook): os códigos são
+        fatorados e apenas os valores únicos são procurados na tabela.
+        """
+        tabela = self.coordenadas.set_index('ICAO')
+        coords = tabela[['latitude', 'longitude']].to_numpy(dtype=np.float64)
+        coords = np.vstack([coords, [np.nan, np.nan]])  # posição -1: código desconhecido
+
+        def posicoes(serie):
+            if isinstance(serie.dtype, pd.CategoricalDtype):
+                codigos, unicos = serie.cat.codes.to_numpy(), serie.cat.categories
+            else:
+                codigos, unicos = pd.factorize(serie)
+            posicao_unicos = np.append(tabela.index.get_indexer(unicos), -1)
+            return posicao_unicos[codigos]  # código -1 (NaN) cai na última posição
+
+        resultado = voos.copy()
+        origem = coords[posicoes(voos[coluna_origem])]
+        destino = coords[posicoes(voos[coluna_destino])]
+        resultado['latitude_origem'] = origem[:, 0]
+        resultado['longitude_origem'] = origem[:, 1]
+        resultado['latitude_destino'] = destino[:, 0]
+        resultado['longitude_destino'] = destino[:, 1]
+        return resultado
@@ -1,79 +1,139 @@
-import networkx as nx
 import argparse
 import os
 
-def calcular_kcore_e_exportar(arquivo_entrada, arquivo_saida=None):
+from kcore import decomposicao_kcore, NucleoIncremental
+from gexf_stream import ler_gexf_compacto, escrever_gexf_com_atributos
+from metricas import METRICAS, calcular_metricas, imprimir_tabela_tempos
+
+def calcular_cores(grafo):
+    """
+    Calcula o número de core de cada nó com o motor em arrays (kcore.py).
+    Equivale a nx.core_number, inclusive em grafos direcionados (grau de entrada + saída).
+
+    Args:
+        grafo (GrafoCompacto): Grafo lido com ler_gexf_compacto
+
+    Returns:
+        tuple: (dicionário {nó: core}, NucleoIncremental pronto para atualizações)
+    """
+    csr = grafo.csr()
+    cores = decomposicao_kcore(csr)
+    return dict(zip(csr.rotulos, cores.tolist())), NucleoIncremental(csr, cores)
+
+def atualizar_kcore(nucleo, existentes, dirigido, arestas_novas=(), arestas_removidas=()):
+    """
+    Atualiza os números de core depois de inserir/remover arestas, sem
+    recalcular a decomposição inteira.
+
+    Args:
+        nucleo (NucleoIncremental): Estado devolvido por calcular_cores
+        existentes (set): Arestas atuais (ver GrafoCompacto.pares); é atualizado
+        dirigido (bool): Se as arestas têm orientação
+        arestas_novas (iterable): Pares (u, v) a inserir
+        arestas_removidas (iterable): Pares (u, v) a remover
+
+    Returns:
+        tuple: (nós cujo core mudou, lista das arestas efetivamente inseridas)
+    """
+    def chave(u, v):
+        return (u, v) if dirigido else frozenset((u, v))
+
+    alterados = set()
+    for u, v in arestas_removidas:
+        if chave(u, v) in existentes:
+            existentes.discard(chave(u, v))
+            alterados |= nucleo.remover_aresta(u, v)
+
+    inseridas = []
+    for u, v in arestas_novas:
+        if u != v and chave(u, v) not in existentes:
+            existentes.add(chave(u, v))
+            alterados |= nucleo.inserir_aresta(u, v)
+            inseridas.append((u, v))
+
+    return alterados, inseridas
+
+def imprimir_distribuicao_cores(core_numbers):
+    """Imprime o core mínimo/máximo e quantos nós há em cada core."""
+    max_core = max(core_numbers.values())
+    min_core = min(core_numbers.values())
+    print(f"K-core calculado: mínimo = {min_core}, máximo = {max_core}")
+    
+    # Conta quantos nós estão em cada core
+    core_distribution = {}
+    for core_value in core_numbers.values():
+        core_distribution[core_value] = core_distribution.get(core_value, 0) + 1
+    
+    print("Distribuição dos cores:")
+    for core, count in sorted(core_distribution.items()):
+        print(f"  Core {core}: {count} nós")
+
+def calcular_kcore_e_exportar(arquivo_entrada, arquivo_saida=None, arquivo_adicional=None):
     """
     Calcula o k-core de um grafo e adiciona o atributo 'core' a cada nó.
+
+    O grafo é lido em fluxo para uma estrutura compacta (sem laços e com arestas
+    paralelas combinadas) e o arquivo de saída é uma cópia do original com o
+    atributo 'core' acrescentado, sem montar grafos NetworkX em memória.
     
     Args:
         arquivo_entrada (str): Caminho para o arquivo .gexf de entrada
         arquivo_saida (str): Caminho para o arquivo .gexf de saída (opcional)
+        arquivo_adicional (str): .gexf com arestas novas (ex.: mais um mês de voos),
+            inseridas com atualização incremental dos cores (opcional)
+
+    Returns:
+        dict: {nó: core}, ou None em caso de erro
     """
     
     try:
         # Carrega o grafo do arquivo GEXF
         print(f"Carregando grafo de: {arquivo_entrada}")
-        G = nx.read_gexf(arquivo_entrada)
-        
-        print(f"Grafo carregado com {G.number_of_nodes()} nós e {G.number_of_edges()} arestas")
+        grafo = ler_gexf_compacto(arquivo_entrada)
 
-        # Remove laços (arestas de um nó para ele mesmo)
-        self_loops = list(nx.selfloop_edges(G))
-        if self_loops:
-            print(f"Detectado e removendo {len(self_loops)} laços (self-loops)...")
-            G.remove_edges_from(self_loops) # NOVA LINHA (versão mais detalhada)
-        
-        # Verifica se é um multigrafo e converte para grafo simples se necessário
-        if G.is_multigraph():
-            print("Detectado multigrafo. Convertendo para grafo simples...")
-            # Preserva os atributos dos nós
-            G_simple = nx.Graph()
-            G_simple.add_nodes_from(G.nodes(data=True))
-            
-            # Adiciona arestas (remove duplicatas automaticamente)
-            for u, v, data in G.edges(data=True):
-                if not G_simple.has_edge(u, v):
-                    G_simple.add_edge(u, v, **data)
-                # Se a aresta já existe, podemos somar pesos ou manter o primeiro
-                elif 'weight' in data and 'weight' in G_simple[u][v]:
-                    G_simple[u][v]['weight'] += data.get('weight', 1)
-            
-            G = G_simple
-            print(f"Grafo convertido: {G.number_of_nodes()} nós e {G.number_of_edges()} arestas")
+        if grafo.lacos:
+            print(f"Detectado e removendo {grafo.lacos} laços (self-loops)...")
+        if grafo.multigrafo:
+            print("Detectado multigrafo. Arestas paralelas combinadas em um grafo simples (pesos somados)")
+
+        print(f"Grafo carregado com {grafo.n_nos} nós e {grafo.n_arestas} arestas")
         
         # Calcula o k-core de cada nó
         print("Calculando k-core...")
-        core_numbers = nx.core_number(G)
-        
-        # Adiciona o atributo 'core' a cada nó
-        nx.set_node_attributes(G, core_numbers, 'core')
-        
-        # Estatísticas do k-core
-        max_core = max(core_numbers.values())
-        min_core = min(core_numbers.values())
-        print(f"K-core calculado: mínimo = {min_core}, máximo = {max_core}")
-        
-        # Conta quantos nós estão em cada core
-        core_distribution = {}
-        for core_value in core_numbers.values():
-            core_distribution[core_value] = core_distribution.get(core_value, 0) + 1
+        core_numbers, nucleo = calcular_cores(grafo)
+
+        # Insere as arestas do arquivo adicional atualizando só os cores afetados
+        novos_nos, inseridas = [], []
+        if arquivo_adicional:
+            print(f"Inserindo arestas de: {arquivo_adicional}")
+            adicional = ler_gexf_compacto(arquivo_adicional)
+            rotulos = adicional.rotulos
+            novos_nos = [no for no in rotulos if no not in core_numbers]
+            arestas = [(rotulos[i], rotulos[j])
+                       for i, j in zip(adicional.origem.tolist(), adicional.destino.tolist())]
+            alterados, inseridas = atualizar_kcore(nucleo, grafo.pares(), grafo.dirigido, arestas)
+            for no in novos_nos:
+                nucleo.adicionar_no(no)
+            core_numbers = dict(nucleo.core)
+            print(f"Cores atualizados incrementalmente: {len(inseridas)} arestas inseridas, "
+                  f"{len(alterados)} nós mudaram")
         
-        print("Distribuição dos cores:")
-        for core, count in sorted(core_distribution.items()):
-            print(f"  Core {core}: {count} nós")
+        imprimir_distribuicao_cores(core_numbers)
         
         # Define o arquivo de saída
         if arquivo_saida is None:
             nome_base = os.path.splitext(arquivo_entrada)[0]
             arquivo_saida = f"{nome_base}_kcore.gexf"
         
-        # Exporta o grafo modificado
+        # Exporta o grafo original com o atributo 'core' (e as arestas inseridas, se houver)
         print(f"Exportando grafo modificado para: {arquivo_saida}")
-        nx.write_gexf(G, arquivo_saida)
+        escrever_gexf_com_atributos(
+            arquivo_entrada, arquivo_saida, {'core': core_numbers}, {'core': 'integer'},
+            novos_nos=novos_nos, novas_arestas=[(u, v, 1.0) for u, v in inseridas]
+        )
         
         print("Processo concluído com sucesso!")
-        return G
+        return core_numbers
         
     except FileNotFoundError:
         print(f"Erro: Arquivo '{arquivo_entrada}' não encontrado.")
@@ -82,11 +142,70 @@ def calcular_kcore_e_exportar(arquivo_entrada, arquivo_saida=None):
         print(f"Erro durante o processamento: {e}")
         return None
 
+def calcular_metricas_e_exportar(arquivo_entrada, arquivo_saida=None, metricas=('core',),
+                                 workers=None, amostra_betweenness=None, betweenness_ponderada=False):
+    """
+    Calcula várias métricas de nós com uma única leitura do grafo e grava todas
+    como atributos em um só arquivo GEXF.
+    
+    Args:
+        arquivo_entrada (str): Caminho para o arquivo .gexf de entrada
+        arquivo_saida (str): Caminho para o arquivo .gexf de saída (opcional)
+        metricas (list): Métricas a calcular (ver metricas.METRICAS)
+        workers (int): Processos para as métricas caras (padrão: número de CPUs)
+        amostra_betweenness (int): Número de fontes amostradas na intermediação
+            (padrão: exata até metricas.LIMITE_BETWEENNESS_EXATO nós)
+        betweenness_ponderada (bool): Usa o peso das arestas como distância na intermediação
+
+    Returns:
+        dict: {metrica: {nó: valor}}, ou None em caso de erro
+    """
+    
+    try:
+        print(f"Carregando grafo de: {arquivo_entrada}")
+        grafo = ler_gexf_compacto(arquivo_entrada)
+        if grafo.lacos:
+            print(f"Detectado e removendo {grafo.lacos} laços (self-loops)...")
+        if grafo.multigrafo:
+            print("Detectado multigrafo. Arestas paralelas combinadas em um grafo simples (pesos somados)")
+        print(f"Grafo carregado com {grafo.n_nos} nós e {grafo.n_arestas} arestas")
+
+        print(f"Calculando métricas: {', '.join(metricas)}")
+        valores, tempos = calcular_metricas(
+            grafo, list(metricas), workers=workers,
+            opcoes={'amostra_betweenness': amostra_betweenness,
+                    'betweenness_ponderada': betweenness_ponderada}
+        )
+        imprimir_tabela_tempos(tempos)
+
+        if 'core' in valores:
+            imprimir_distribuicao_cores(valores['core'])
+
+        if arquivo_saida is None:
+            nome_base = os.path.splitext(arquivo_entrada)[0]
+            sufixo = 'kcore' if list(metricas) == ['core'] else 'metricas'
+            arquivo_saida = f"{nome_base}_{sufixo}.gexf"
+
+        print(f"Exportando grafo com {len(valores)} atributos para: {arquivo_saida}")
+        escrever_gexf_com_atributos(
+            arquivo_entrada, arquivo_saida, valores, {nome: METRICAS[nome][1] for nome in valores}
+        )
+
+        print("Processo concluído com sucesso!")
+        return valores
+
+    except FileNotFoundError:
+        print(f"Erro: Arquivo '{arquivo_entrada}' não encontrado.")
+        return None
+    except Exception as e:
+        print(f"Erro durante o processamento: {e}")
+        return None
+
 def main():
     """Função principal com interface de linha de comando"""
     
     parser = argparse.ArgumentParser(
-        description='Calcula k-core de um grafo GEXF e adiciona atributo core aos nós'
+        description='Calcula k-core (e outras métricas) de um grafo GEXF e adiciona os atributos aos nós'
     )
     parser.add_argument(
         'arquivo_entrada', 
@@ -96,11 +215,39 @@ def main():
         '-o', '--output', 
         help='Caminho para o arquivo .gexf de saída (opcional)'
     )
+    parser.add_argument(
+        '-a', '--adicionar',
+        help='Arquivo .gexf com arestas novas para atualizar os cores incrementalmente (opcional)'
+    )
+    parser.add_argument(
+        '-m', '--metricas', default='core',
+        help=f"Métricas separadas por vírgula: {','.join(METRICAS)} (padrão: core)"
+    )
+    parser.add_argument(
+        '-w', '--workers', type=int,
+        help='Processos para as métricas caras (padrão: número de CPUs)'
+    )
+    parser.add_argument(
+        '--amostra-betweenness', type=int,
+        help='Número de fontes amostradas para a intermediação (padrão: exata em grafos pequenos)'
+    )
+    parser.add_argument(
+        '--betweenness-ponderada', action='store_true',
+        help='Usa o peso das arestas como distância na intermediação (padrão: número de saltos)'
+    )
     
     args = parser.parse_args()
+    metricas = [m.strip() for m in args.metricas.split(',') if m.strip()]
     
     # Executa o processamento
-    calcular_kcore_e_exportar(args.arquivo_entrada, args.output)
+    if args.adicionar:
+        if metricas != ['core']:
+            print("Aviso: --adicionar atualiza apenas o core; as demais métricas foram ignoradas")
+        calcular_kcore_e_exportar(args.arquivo_entrada, args.output, args.adicionar)
+    else:
+        calcular_metricas_e_exportar(args.arquivo_entrada, args.output, metricas,
+                                     args.workers, args.amostra_betweenness,
+                                     args.betweenness_ponderada)
 
 if __name__ == "__main__":
     main()
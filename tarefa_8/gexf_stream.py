@@ -0,0 +1,283 @@
+import xml.etree.ElementTree as ET
+from xml.sax import make_parser
+from xml.sax.handler import ContentHandler
+from xml.sax.saxutils import XMLGenerator
+
+import numpy as np
+
+from kcore import GrafoCSR
+
+
+def _local(tag):
+    # Remove o namespace: '{http://www.gexf.net/1.2draft}node' -> 'node'
+    return tag.rsplit('}', 1)[-1]
+
+
+class GrafoCompacto:
+    """
+    Grafo lido de um GEXF em forma compacta: rótulos dos nós e arrays com as
+    pontas e o peso de cada aresta, já sem laços e sem arestas paralelas.
+
+    Segue as mesmas regras do core_calc com NetworkX:
+    - grafo simples direcionado: as arestas mantêm a orientação
+    - multigrafo (alguma aresta repetida): vira grafo simples não-direcionado,
+      com os pesos das arestas paralelas somados
+
+    Atributos:
+    - rotulos: lista com o id de cada nó no GEXF (índice = posição)
+    - origem, destino: arrays numpy de índices
+    - peso: array numpy com o peso somado de cada aresta (1 por aresta sem 'weight')
+    - dirigido, multigrafo: características do arquivo original
+    - lacos: número de laços descartados
+    """
+
+    def __init__(self, rotulos, origem, destino, peso, dirigido, multigrafo, lacos=0):
+        self.rotulos = rotulos
+        self.origem = origem
+        self.destino = destino
+        self.peso = peso
+        self.dirigido = dirigido
+        self.multigrafo = multigrafo
+        self.lacos = lacos
+
+    @property
+    def n_nos(self):
+        return len(self.rotulos)
+
+    @property
+    def n_arestas(self):
+        return len(self.origem)
+
+    def csr(self):
+        return GrafoCSR.de_arestas(self.rotulos, self.origem, self.destino, self.peso)
+
+    def para_networkx(self):
+        """Monta um nx.DiGraph/nx.Graph com o atributo 'weight' (para métricas do NetworkX)."""
+        import networkx as nx
+
+        G = nx.DiGraph() if self.dirigido else nx.Graph()
+        G.add_nodes_from(self.rotulos)
+        rotulos = self.rotulos
+        G.add_weighted_edges_from(
+            (rotulos[i], rotulos[j], w)
+            for i, j, w in zip(self.origem.tolist(), self.destino.tolist(), self.peso.tolist())
+        )
+        return G
+
+    def pares(self):
+        """Conjunto de arestas existentes como pares de rótulos (sem ordem se não-direcionado)."""
+        rotulos = self.rotulos
+        pares = zip(self.origem.tolist(), self.destino.tolist())
+        if self.dirigido:
+            return {(rotulos[i], rotulos[j]) for i, j in pares}
+        return {frozenset((rotulos[i], rotulos[j])) for i, j in pares}
+
+
+def ler_gexf_compacto(arquivo):
+    """
+    Lê um GEXF com iterparse, sem montar um grafo NetworkX: cada nó e aresta é
+    descartado da árvore XML logo após ser lido, e arestas paralelas são somadas
+    em um dicionário {(i, j): peso} durante a leitura.
+
+    Parâmetros:
+    - arquivo: caminho do .gexf
+
+    Retorna:
+    - GrafoCompacto
+    """
+    indice = {}
+    rotulos = []
+    pesos = {}
+    dirigido = True
+    multigrafo = False
+    lacos = 0
+
+    def no(rotulo):
+        i = indice.get(rotulo)
+        if i is None:
+            i = indice[rotulo] = len(rotulos)
+            rotulos.append(rotulo)
+        return i
+
+    for evento, elem in ET.iterparse(arquivo, events=('start', 'end')):
+        tag = _local(elem.tag)
+        if evento == 'start':
+            if tag == 'graph':
+                dirigido = elem.get('defaultedgetype', 'undirected') == 'directed'
+            continue
+
+        if tag == 'node':
+            no(elem.get('id'))
+            elem.clear()
+        elif tag == 'edge':
+            i, j = no(elem.get('source')), no(elem.get('target'))
+            peso = float(elem.get('weight', 1))
+            elem.clear()
+            if i == j:
+                lacos += 1
+                continue
+            chave = (i, j) if dirigido or i < j else (j, i)
+            if chave in pesos:
+                multigrafo = True
+                pesos[chave] += peso
+            else:
+                pesos[chave] = peso
+
+    # Multigrafo direcionado: o core_calc trata como grafo simples não-direcionado
+    if multigrafo and dirigido:
+        pares_sem_ordem = {}
+        for (i, j), peso in pesos.items():
+            chave = (i, j) if i < j else (j, i)
+            pares_sem_ordem[chave] = pares_sem_ordem.get(chave, 0) + peso
+        pesos = pares_sem_ordem
+        dirigido = False
+
+    m = len(pesos)
+    origem = np.fromiter((i for i, _ in pesos), dtype=np.int64, count=m)
+    destino = np.fromiter((j for _, j in pesos), dtype=np.int64, count=m)
+    peso = np.fromiter(pesos.values(), dtype=np.float64, count=m)
+
+    return GrafoCompacto(rotulos, origem, destino, peso, dirigido, multigrafo, lacos)
+
+
+class _InjetorAtributos(ContentHandler):
+    """
+    Repassa os eventos SAX do GEXF original para um XMLGenerator, acrescentando
+    a declaração dos novos atributos de nó e um <attvalue> por nó.
+    """
+
+    def __init__(self, saida, valores, tipos, novos_nos=(), novas_arestas=()):
+        super().__init__()
+        self.gerador = XMLGenerator(saida, encoding='utf-8', short_empty_elements=True)
+        self.valores = valores
+        self.tipos = tipos
+        self.novos_nos = novos_nos
+        self.novas_arestas = novas_arestas
+        self.arestas_lidas = 0
+        self.ids = {}
+        self.bloco_nos = False
+        self.declarados = False
+        self.no_atual = None
+        self.tem_attvalues = False
+        self.ignorando = 0
+
+    def _declarar(self):
+        # Atributos já existentes com o mesmo título são reaproveitados (e sobrescritos)
+        for titulo in self.valores:
+            if titulo not in self.ids:
+                self.ids[titulo] = titulo
+                self.gerador.startElement('attribute', {
+                    'id': titulo, 'title': titulo, 'type': self.tipos.get(titulo, 'double')
+                })
+                self.gerador.endElement('attribute')
+        self.declarados = True
+
+    def _injetar_valores(self):
+        for titulo, valores in self.valores.items():
+            if self.no_atual in valores:
+                self.gerador.startElement('attvalue', {
+                    'for': self.ids[titulo], 'value': str(valores[self.no_atual])
+                })
+                self.gerador.endElement('attvalue')
+
+    def startDocument(self):
+        self.gerador.startDocument()
+
+    def endDocument(self):
+        self.gerador.endDocument()
+
+    def startElement(self, nome, atributos):
+        if self.ignorando:
+            self.ignorando += 1
+            return
+        tag = nome.split(':')[-1]
+
+        if tag == 'attributes' and atributos.get('class') == 'node':
+            self.bloco_nos = True
+        elif tag == 'attribute' and self.bloco_nos and atributos.get('title') in self.valores:
+            self.ids[atributos.get('title')] = atributos.get('id')
+        elif tag == 'nodes' and not self.declarados:
+            # Não havia bloco de atributos de nó: criar um antes de <nodes>
+            self.gerador.startElement('attributes', {'class': 'node', 'mode': 'static'})
+            self._declarar()
+            self.gerador.endElement('attributes')
+        elif tag == 'node':
+            self.no_atual = atributos.get('id')
+            self.tem_attvalues = False
+        elif tag == 'attvalues' and self.no_atual is not None:
+            self.tem_attvalues = True
+        elif tag == 'attvalue' and self.no_atual is not None:
+            if atributos.get('for') in {self.ids.get(t) for t in self.valores}:
+                # Valor antigo de um atributo que será reescrito
+                self.ignorando = 1
+                return
+
+        self.gerador.startElement(nome, atributos)
+
+    def endElement(self, nome):
+        if self.ignorando:
+            self.ignorando -= 1
+            return
+        tag = nome.split(':')[-1]
+
+        if tag == 'attributes' and self.bloco_nos:
+            self._declarar()
+            self.bloco_nos = False
+        elif tag == 'attvalues' and self.no_atual is not None:
+            self._injetar_valores()
+        elif tag == 'node':
+            if not self.tem_attvalues:
+                self.gerador.startElement('attvalues', {})
+                self._injetar_valores()
+                self.gerador.endElement('attvalues')
+            self.no_atual = None
+        elif tag == 'nodes':
+            for no in self.novos_nos:
+                self.gerador.startElement('node', {'id': no, 'label': no})
+                self.no_atual = no
+                self.startElement('attvalues', {})
+                self.endElement('attvalues')
+                self.gerador.endElement('node')
+            self.no_atual = None
+        elif tag == 'edge':
+            self.arestas_lidas += 1
+        elif tag == 'edges':
+            for k, (u, v, peso) in enumerate(self.novas_arestas):
+                self.gerador.startElement('edge', {
+                    'source': u, 'target': v, 'id': str(self.arestas_lidas + k), 'weight': str(peso)
+                })
+                self.gerador.endElement('edge')
+
+        self.gerador.endElement(nome)
+
+    def characters(self, conteudo):
+        if not self.ignorando:
+            self.gerador.characters(conteudo)
+
+    def ignorableWhitespace(self, conteudo):
+        self.characters(conteudo)
+
+    def processingInstruction(self, alvo, dados):
+        self.gerador.processingInstruction(alvo, dados)
+
+
+def escrever_gexf_com_atributos(arquivo_entrada, arquivo_saida, valores, tipos=None,
+                                novos_nos=(), novas_arestas=()):
+    """
+    Copia o GEXF de entrada para a saída em fluxo (SAX), adicionando atributos
+    aos nós. Nós, arestas e demais atributos passam sem alteração, inclusive
+    laços e arestas paralelas do arquivo original.
+
+    Parâmetros:
+    - arquivo_entrada, arquivo_saida: caminhos dos .gexf
+    - valores: dicionário {titulo: {id_do_no: valor}}, ex.: {'core': {'SBSV': 29}}
+    - tipos: dicionário {titulo: tipo GEXF} ('integer', 'double', ...); padrão 'double'
+    - novos_nos: ids de nós a acrescentar ao final de <nodes>
+    - novas_arestas: tuplas (origem, destino, peso) a acrescentar ao final de <edges>
+    """
+    parser = make_parser()
+    with open(arquivo_saida, 'w', encoding='utf-8') as saida:
+        parser.setContentHandler(
+            _InjetorAtributos(saida, valores, tipos or {}, list(novos_nos), list(novas_arestas))
+        )
+        parser.parse(arquivo_entrada)
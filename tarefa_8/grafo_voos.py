@@ -0,0 +1,370 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+COLUNA_EMPRESA = 'ICAO Empresa Aérea'
+COLUNA_TIPO_LINHA = 'Código Tipo Linha'
+COLUNA_ORIGEM = 'ICAO Aeródromo Origem'
+COLUNA_DESTINO = 'ICAO Aeródromo Destino'
+
+
+def agregar_rotas(voos, apenas_nacionais=True):
+    """
+    Conta os voos de cada rota por empresa com um único groupby.
+
+    Parâmetros:
+    - voos: DataFrame com as colunas da ANAC (origem, destino, empresa e tipo de linha)
+    - apenas_nacionais: mantém só as linhas com 'Código Tipo Linha' == 'N'
+
+    Retorna:
+    - DataFrame com as colunas origem, destino, empresa e voos
+    """
+    if apenas_nacionais and COLUNA_TIPO_LINHA in voos.columns:
+        voos = voos[voos[COLUNA_TIPO_LINHA] == 'N']
+
+    rotas = (
+        voos.groupby([COLUNA_ORIGEM, COLUNA_DESTINO, COLUNA_EMPRESA], sort=False, observed=True)
+        .size()
+        .reset_index(name='voos')
+    )
+    rotas.columns = ['origem', 'destino', 'empresa', 'voos']
+    return rotas
+
+
+class GrafoVoos:
+    """
+    Malha aérea em arrays: uma entrada por aeroporto e uma por par
+    (origem, destino), com o número de voos e de empresas em cada rota.
+
+    Atributos:
+    - aeroportos: array com os códigos ICAO (índice = posição)
+    - latitude, longitude: arrays float (NaN quando a coordenada é desconhecida)
+    - origem, destino: arrays de índices das rotas
+    - voos: número de voos de cada rota (peso das arestas)
+    - empresas: número de empresas que operam cada rota
+    - rotas_empresa: DataFrame com os voos por (origem, destino, empresa)
+    """
+
+    def __init__(self, aeroportos, latitude, longitude, origem, destino, voos, empresas,
+                 rotas_empresa=None):
+        self.aeroportos = np.asarray(aeroportos, dtype=object)
+        self.latitude = np.asarray(latitude, dtype=np.float64)
+        self.longitude = np.asarray(longitude, dtype=np.float64)
+        self.origem = np.asarray(origem, dtype=np.int64)
+        self.destino = np.asarray(destino, dtype=np.int64)
+        self.voos = np.asarray(voos, dtype=np.int64)
+        self.empresas = np.asarray(empresas, dtype=np.int64)
+        self.rotas_empresa = rotas_empresa
+
+    @property
+    def n_nos(self):
+        return len(self.aeroportos)
+
+    @property
+    def n_arestas(self):
+        return len(self.origem)
+
+    def tabela_nos(self):
+        """DataFrame com ICAO, coordenadas e voos de saída/chegada de cada aeroporto."""
+        return pd.DataFrame({
+            'ICAO': self.aeroportos,
+            'latitude': self.latitude,
+            'longitude': self.longitude,
+            'voos_saida': np.bincount(self.origem, weights=self.voos, minlength=self.n_nos).astype(np.int64),
+            'voos_chegada': np.bincount(self.destino, weights=self.voos, minlength=self.n_nos).astype(np.int64),
+        })
+
+    def tabela_arestas(self):
+        """DataFrame com origem, destino, voos e empresas de cada rota."""
+        return pd.DataFrame({
+            'origem': self.aeroportos[self.origem],
+            'destino': self.aeroportos[self.destino],
+            'voos': self.voos,
+            'empresas': self.empresas,
+        })
+
+    def para_networkx(self):
+        """nx.DiGraph com latitude/longitude nos nós e weight (voos) e empresas nas arestas."""
+        import networkx as nx
+
+        G = nx.DiGraph()
+        G.add_nodes_from(
+            (icao, {'latitude': lat, 'longitude': lon})
+            for icao, lat, lon in zip(self.aeroportos.tolist(), self.latitude.tolist(), self.longitude.tolist())
+        )
+        G.add_edges_from(
+            (self.aeroportos[i], self.aeroportos[j], {'weight': v, 'empresas': e})
+            for i, j, v, e in zip(self.origem.tolist(), self.destino.tolist(),
+                                  self.voos.tolist(), self.empresas.tolist())
+        )
+        return G
+
+    def para_compacto(self):
+        """GrafoCompacto (sem laços) para o core_calc e as métricas da tarefa 8."""
+        from gexf_stream import GrafoCompacto
+
+        sem_laco = self.origem != self.destino
+        return GrafoCompacto(self.aeroportos.tolist(), self.origem[sem_laco], self.destino[sem_laco],
+                             self.voos[sem_laco].astype(np.float64), True, False,
+                             int((~sem_laco).sum()))
+
+    def salvar_gexf(self, arquivo):
+        """
+        Grava o grafo em GEXF 1.2 escrevendo o XML em fluxo, no mesmo formato do
+        nx.write_gexf (atributos latitude/longitude nos nós), com o peso das
+        arestas igual ao número de voos e o atributo 'empresas'.
+        """
+        from xml.sax.saxutils import XMLGenerator
+
+        def valor(x):
+            return 'NaN' if np.isnan(x) else repr(float(x))
+
+        with open(arquivo, 'w', encoding='utf-8') as f:
+            xml = XMLGenerator(f, encoding='utf-8', short_empty_elements=True)
+            xml.startDocument()
+            xml.startElement('gexf', {
+                'xmlns': 'http://www.gexf.net/1.2draft',
+                'xmlns:xsi': 'http://www.w3.org/2001/XMLSchema-instance',
+                'xsi:schemaLocation': 'http://www.gexf.net/1.2draft http://www.gexf.net/1.2draft/gexf.xsd',
+                'version': '1.2'
+            })
+            xml.characters('\n  ')
+            xml.startElement('graph', {'defaultedgetype': 'directed', 'mode': 'static', 'name': ''})
+
+            xml.characters('\n    ')
+            xml.startElement('attributes', {'class': 'node', 'mode': 'static'})
+            for id_, titulo in (('0', 'latitude'), ('1', 'longitude')):
+                xml.characters('\n      ')
+                xml.startElement('attribute', {'id': id_, 'title': titulo, 'type': 'double'})
+                xml.endElement('attribute')
+            xml.characters('\n    ')
+            xml.endElement('attributes')
+
+            xml.characters('\n    ')
+            xml.startElement('attributes', {'class': 'edge', 'mode': 'static'})
+            xml.characters('\n      ')
+            xml.startElement('attribute', {'id': '2', 'title': 'empresas', 'type': 'long'})
+            xml.endElement('attribute')
+            xml.characters('\n    ')
+            xml.endElement('attributes')
+
+            xml.characters('\n    ')
+            xml.startElement('nodes', {})
+            for icao, lat, lon in zip(self.aeroportos.tolist(), self.latitude, self.longitude):
+                xml.characters('\n      ')
+                xml.startElement('node', {'id': icao, 'label': icao})
+                xml.startElement('attvalues', {})
+                xml.startElement('attvalue', {'for': '0', 'value': valor(lat)})
+                xml.endElement('attvalue')
+                xml.startElement('attvalue', {'for': '1', 'value': valor(lon)})
+                xml.endElement('attvalue')
+                xml.endElement('attvalues')
+                xml.endElement('node')
+            xml.characters('\n    ')
+            xml.endElement('nodes')
+
+            xml.characters('\n    ')
+            xml.startElement('edges', {})
+            arestas = zip(self.origem.tolist(), self.destino.tolist(), self.voos.tolist(), self.empresas.tolist())
+            for k, (i, j, v, e) in enumerate(arestas):
+                xml.characters('\n      ')
+                xml.startElement('edge', {
+                    'source': self.aeroportos[i], 'target': self.aeroportos[j],
+                    'id': str(k), 'weight': str(v)
+                })
+                xml.startElement('attvalues', {})
+                xml.startElement('attvalue', {'for': '2', 'value': str(e)})
+                xml.endElement('attvalue')
+                xml.endElement('attvalues')
+                xml.endElement('edge')
+            xml.characters('\n    ')
+            xml.endElement('edges')
+
+            xml.characters('\n  ')
+            xml.endElement('graph')
+            xml.characters('\n')
+            xml.endElement('gexf')
+            xml.endDocument()
+
+    def salvar_binario(self, arquivo):
+        """Grava os arrays do grafo em um .npz compactado."""
+        np.savez_compressed(
+            arquivo, aeroportos=self.aeroportos.astype(str), latitude=self.latitude,
+            longitude=self.longitude, origem=self.origem, destino=self.destino,
+            voos=self.voos, empresas=self.empresas
+        )
+
+    @classmethod
+    def carregar_binario(cls, arquivo):
+        """Lê um grafo gravado com salvar_binario (sem a tabela por empresa)."""
+        with np.load(arquivo, allow_pickle=False) as dados:
+            return cls(dados['aeroportos'].tolist(), dados['latitude'], dados['longitude'],
+                       dados['origem'], dados['destino'], dados['voos'], dados['empresas'])
+
+    @classmethod
+    def de_gexf(cls, arquivo):
+        """
+        Lê um GEXF da malha aérea (como voos_grafo.gexf) em fluxo. Usa os
+        atributos latitude/longitude dos nós, o peso das arestas como número de
+        voos (1 se ausente) e o atributo 'empresas', se existir. Arestas
+        repetidas são somadas.
+        """
+        import xml.etree.ElementTree as ET
+
+        titulos = {}
+        indice, aeroportos, latitude, longitude = {}, [], [], []
+        rotas = {}
+
+        def no(icao):
+            i = indice.get(icao)
+            if i is None:
+                i = indice[icao] = len(aeroportos)
+                aeroportos.append(icao)
+                latitude.append(np.nan)
+                longitude.append(np.nan)
+            return i
+
+        for _, elem in ET.iterparse(arquivo):
+            tag = elem.tag.rsplit('}', 1)[-1]
+            if tag == 'attribute':
+                titulos[elem.get('id')] = elem.get('title')
+            elif tag == 'node':
+                i = no(elem.get('id'))
+                for a in elem.iter():
+                    if a.tag.endswith('attvalue'):
+                        titulo = titulos.get(a.get('for'))
+                        if titulo == 'latitude':
+                            latitude[i] = float(a.get('value'))
+                        elif titulo == 'longitude':
+                            longitude[i] = float(a.get('value'))
+                elem.clear()
+            elif tag == 'edge':
+                chave = (no(elem.get('source')), no(elem.get('target')))
+                empresas = 0
+                for a in elem.iter():
+                    if a.tag.endswith('attvalue') and titulos.get(a.get('for')) == 'empresas':
+                        empresas = int(float(a.get('value')))
+                voos, emp = rotas.get(chave, (0, 0))
+                rotas[chave] = (voos + int(float(elem.get('weight', 1))), max(emp, empresas))
+                elem.clear()
+
+        pares = list(rotas)
+        return cls(aeroportos, latitude, longitude,
+                   [i for i, _ in pares], [j for _, j in pares],
+                   [rotas[p][0] for p in pares], [rotas[p][1] for p in pares])
+
+
+def construir_grafo_voos(voos, aeroportos=None, apenas_nacionais=True):
+    """
+    Monta a malha aérea a partir da tabela de voos da ANAC com operações em
+    bloco: groupby para contar os voos por (origem, destino, empresa), códigos
+    dos aeroportos convertidos para índices com pd.factorize e coordenadas
+    associadas com um único reindex.
+
+    Parâmetros:
+    - voos: DataFrame com as colunas da ANAC (ver agregar_rotas)
+    - aeroportos: DataFrame opcional com as colunas ICAO, latitude e longitude
+    - apenas_nacionais: mantém só os voos nacionais ('Código Tipo Linha' == 'N')
+
+    Retorna:
+    - GrafoVoos
+    """
+    rotas_empresa = agregar_rotas(voos, apenas_nacionais)
+
+    # Pares (origem, destino): total de voos e número de empresas
+    rotas = (
+        rotas_empresa.groupby(['origem', 'destino'], sort=False, observed=True)
+        .agg(voos=('voos', 'sum'), empresas=('empresa', 'nunique'))
+        .reset_index()
+    )
+
+    # Índices dos aeroportos na ordem em que aparecem nos voos (origem, depois destino)
+    if apenas_nacionais and COLUNA_TIPO_LINHA in voos.columns:
+        voos = voos[voos[COLUNA_TIPO_LINHA] == 'N']
+    intercalados = np.column_stack([
+        voos[COLUNA_ORIGEM].to_numpy(dtype=object), voos[COLUNA_DESTINO].to_numpy(dtype=object)
+    ]).ravel()
+    codigos = pd.unique(intercalados)
+    indice = pd.Index(codigos)
+    origem = indice.get_indexer(rotas['origem'].to_numpy(dtype=object))
+    destino = indice.get_indexer(rotas['destino'].to_numpy(dtype=object))
+
+    latitude = np.full(len(codigos), np.nan)
+    longitude = np.full(len(codigos), np.nan)
+    if aeroportos is not None:
+        coordenadas = (
+            aeroportos.drop_duplicates('ICAO').set_index('ICAO')[['latitude', 'longitude']]
+            .reindex(codigos)
+        )
+        latitude = coordenadas['latitude'].to_numpy(dtype=np.float64)
+        longitude = coordenadas['longitude'].to_numpy(dtype=np.float64)
+
+    return GrafoVoos(codigos, latitude, longitude, origem, destino,
+                     rotas['voos'].to_numpy(), rotas['empresas'].to_numpy(), rotas_empresa)
+
+
+def grafo_por_iterrows(voos_completo):
+    """
+    Versão original do notebook (uma chamada add_node/add_edge por voo), mantida
+    como referência para comparação de tempo. Espera as colunas latitude_origem,
+    longitude_origem, latitude_destino e longitude_destino já associadas.
+    """
+    import networkx as nx
+
+    G = nx.DiGraph()
+    for index, row in voos_completo.iterrows():
+        origin_icao = row[COLUNA_ORIGEM]
+        dest_icao = row[COLUNA_DESTINO]
+        if origin_icao not in G:
+            G.add_node(origin_icao, latitude=row['latitude_origem'], longitude=row['longitude_origem'])
+        if dest_icao not in G:
+            G.add_node(dest_icao, latitude=row['latitude_destino'], longitude=row['longitude_destino'])
+        G.add_edge(origin_icao, dest_icao)
+    return G
+
+
+def comparar_com_iterrows(voos, aeroportos, arquivo_gexf=None):
+    """
+    Mede o tempo de ponta a ponta (filtro, merges de coordenadas, construção do
+    grafo e, se informado, gravação do GEXF) da versão com iterrows e da versão
+    vetorizada, e confere se os dois grafos têm os mesmos nós e arestas.
+
+    Retorna:
+    - dicionário com os tempos em segundos e o resultado da conferência
+    """
+    import networkx as nx
+
+    coordenadas = aeroportos[['ICAO', 'latitude', 'longitude']]
+
+    inicio = time.perf_counter()
+    nacionais = voos[voos[COLUNA_TIPO_LINHA] == 'N']
+    voos_completo = (
+        nacionais
+        .merge(coordenadas, left_on=COLUNA_ORIGEM, right_on='ICAO', how='left')
+        .rename(columns={'latitude': 'latitude_origem', 'longitude': 'longitude_origem'})
+        .drop('ICAO', axis=1)
+        .merge(coordenadas, left_on=COLUNA_DESTINO, right_on='ICAO', how='left')
+        .rename(columns={'latitude': 'latitude_destino', 'longitude': 'longitude_destino'})
+        .drop('ICAO', axis=1)
+    )
+    G = grafo_por_iterrows(voos_completo)
+    if arquivo_gexf:
+        nx.write_gexf(G, arquivo_gexf)
+    tempo_iterrows = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    grafo = construir_grafo_voos(voos, aeroportos)
+    if arquivo_gexf:
+        grafo.salvar_gexf(arquivo_gexf)
+    tempo_vetorizado = time.perf_counter() - inicio
+
+    arestas = set(zip(grafo.aeroportos[grafo.origem].tolist(), grafo.aeroportos[grafo.destino].tolist()))
+    iguais = set(G.nodes) == set(grafo.aeroportos.tolist()) and set(G.edges) == arestas
+
+    print(f"Voos: {len(voos)} | aeroportos: {grafo.n_nos} | rotas: {grafo.n_arestas}")
+    print(f"iterrows:   {tempo_iterrows:.2f} s")
+    print(f"vetorizado: {tempo_vetorizado:.2f} s ({tempo_iterrows / max(tempo_vetorizado, 1e-9):.0f}x mais rápido)")
+    print(f"Mesmos nós e arestas: {'sim' if iguais else 'não'}")
+
+    return {'iterrows_s': tempo_iterrows, 'vetorizado_s': tempo_vetorizado, 'mesmo_grafo': iguais}
@@ -0,0 +1,154 @@
+import os
+import glob
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# Colunas usadas na análise e seus tipos (códigos ICAO como categorias)
+COLUNAS_VOOS = ['ICAO Empresa Aérea', 'Número Voo', 'Código Tipo Linha',
+                'ICAO Aeródromo Origem', 'ICAO Aeródromo Destino']
+TIPOS_VOOS = {
+    'ICAO Empresa Aérea': 'category',
+    'Número Voo': 'string',
+    'Código Tipo Linha': 'category',
+    'ICAO Aeródromo Origem': 'category',
+    'ICAO Aeródromo Destino': 'category',
+}
+ARQUIVO_INDICE = 'indice_voos.json'
+TAMANHO_BLOCO_HASH = 1 << 20
+
+
+def listar_arquivos_mensais(pasta='.'):
+    """Arquivos .csv cujo nome começa com o número do mês (01 a 12), como no notebook."""
+    arquivos = []
+    for caminho in sorted(glob.glob(os.path.join(pasta, '*.csv'))):
+        nome = os.path.basename(caminho)
+        if nome[0:2].isdigit() and 1 <= int(nome[0:2]) <= 12:
+            arquivos.append(caminho)
+    return arquivos
+
+
+def _hash_arquivo(caminho):
+    h = hashlib.sha1()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(TAMANHO_BLOCO_HASH), b''):
+            h.update(bloco)
+    return h.hexdigest()[:16]
+
+
+def _hash_com_indice(caminho, indice):
+    # Reaproveita o hash se tamanho e data de modificação não mudaram
+    info = os.stat(caminho)
+    chave = os.path.abspath(caminho)
+    registro = indice.get(chave)
+    if registro and registro['tamanho'] == info.st_size and registro['mtime'] == info.st_mtime:
+        return registro['hash']
+    h = _hash_arquivo(caminho)
+    indice[chave] = {'tamanho': info.st_size, 'mtime': info.st_mtime, 'hash': h}
+    return h
+
+
+def _arquivo_cache(pasta_cache, h):
+    # Parquet quando o pyarrow está instalado; caso contrário, pickle
+    try:
+        import pyarrow  # noqa: F401
+        return os.path.join(pasta_cache, f"voos_{h}.parquet")
+    except ImportError:
+        return os.path.join(pasta_cache, f"voos_{h}.pkl")
+
+
+def _ler_cache(arquivo):
+    if arquivo.endswith('.parquet'):
+        return pd.read_parquet(arquivo)
+    return pd.read_pickle(arquivo)
+
+
+def ler_mes(caminho, arquivo_cache=None, encoding='utf-8'):
+    """
+    Lê um CSV mensal da ANAC apenas com as colunas de COLUNAS_VOOS e os tipos
+    de TIPOS_VOOS, acrescentando a coluna 'mes' (dois primeiros dígitos do nome
+    do arquivo). Se arquivo_cache for informado, grava o resultado nele.
+    """
+    df = pd.read_csv(caminho, sep=';', skiprows=1, usecols=COLUNAS_VOOS,
+                     dtype=TIPOS_VOOS, encoding=encoding)
+    df['mes'] = pd.Series(int(os.path.basename(caminho)[0:2]), index=df.index, dtype='int8')
+
+    if arquivo_cache is not None:
+        if arquivo_cache.endswith('.parquet'):
+            df.to_parquet(arquivo_cache, index=False)
+        else:
+            df.to_pickle(arquivo_cache)
+    return df
+
+
+def _ler_e_gravar(caminho, arquivo_cache, encoding):
+    # Executada nos workers: grava o cache e devolve só o caminho
+    ler_mes(caminho, arquivo_cache, encoding)
+    return arquivo_cache
+
+
+def _concatenar(partes):
+    # Une as categorias de cada mês para que as colunas continuem categóricas
+    from pandas.api.types import union_categoricals
+
+    if not partes:
+        return pd.DataFrame({c: pd.Series(dtype=t) for c, t in TIPOS_VOOS.items()})
+
+    colunas = {}
+    for coluna in partes[0].columns:
+        series = [p[coluna] for p in partes]
+        if all(isinstance(s.dtype, pd.CategoricalDtype) for s in series):
+            colunas[coluna] = pd.Series(union_categoricals([s.array for s in series]))
+        else:
+            colunas[coluna] = pd.concat(series, ignore_index=True)
+    return pd.DataFrame(colunas)
+
+
+def carregar_voos(pasta='.', arquivos=None, pasta_cache='cache', workers=None, encoding='utf-8'):
+    """
+    Carrega os voos de todos os meses. Cada CSV é lido uma única vez e guardado
+    em cache (Parquet, ou pickle sem pyarrow) identificado pelo hash do arquivo;
+    nas execuções seguintes só os meses novos ou alterados são lidos do CSV, e
+    esses são processados em paralelo.
+
+    Parâmetros:
+    - pasta: pasta com os CSVs mensais (usada se arquivos não for informado)
+    - arquivos: lista opcional de caminhos dos CSVs
+    - pasta_cache: pasta do cache
+    - workers: número de processos para ler os CSVs (padrão: número de CPUs)
+    - encoding: codificação dos CSVs
+
+    Retorna:
+    - DataFrame com COLUNAS_VOOS e 'mes', com os códigos ICAO como categorias
+    """
+    if arquivos is None:
+        arquivos = listar_arquivos_mensais(pasta)
+    os.makedirs(pasta_cache, exist_ok=True)
+
+    caminho_indice = os.path.join(pasta_cache, ARQUIVO_INDICE)
+    indice = {}
+    if os.path.exists(caminho_indice):
+        with open(caminho_indice, 'r', encoding='utf-8') as f:
+            indice = json.load(f)
+
+    caches = [_arquivo_cache(pasta_cache, _hash_com_indice(a, indice)) for a in arquivos]
+    with open(caminho_indice, 'w', encoding='utf-8') as f:
+        json.dump(indice, f, indent=2)
+
+    pendentes = [(a, c) for a, c in zip(arquivos, caches) if not os.path.exists(c)]
+    print(f"Arquivos mensais: {len(arquivos)} ({len(arquivos) - len(pendentes)} do cache, "
+          f"{len(pendentes)} para ler)")
+
+    if len(pendentes) > 1 and (workers or os.cpu_count() or 1) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count(), len(pendentes))) as pool:
+            list(pool.map(_ler_e_gravar, *zip(*pendentes), [encoding] * len(pendentes)))
+    else:
+        for caminho, arquivo_cache in pendentes:
+            _ler_e_gravar(caminho, arquivo_cache, encoding)
+
+    voos = _concatenar([_ler_cache(c) for c in caches])
+    print(f"Voos carregados: {len(voos)} linhas, "
+          f"{voos.memory_usage(deep=True).sum() / 2**20:.1f} MB em memória")
+    return voos
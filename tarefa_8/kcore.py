@@ -0,0 +1,266 @@
+from collections import deque
+
+import numpy as np
+
+
+class GrafoCSR:
+    """
+    Grafo em formato CSR (compressed sparse row) para a decomposição em k-cores.
+
+    A adjacência é simétrica e guarda multiplicidade: cada aresta (u, v) gera as
+    entradas u -> v e v -> u. Em um grafo direcionado, um par de voos de ida e
+    volta aparece duas vezes, o que reproduz o grau de entrada + saída usado pelo
+    nx.core_number em DiGraphs. Laços (u, u) são descartados.
+
+    Atributos:
+    - rotulos: lista com o rótulo (id do nó no GEXF) de cada índice 0..n-1
+    - indptr, indices: arrays numpy do CSR
+    - pesos: array numpy com o peso de cada entrada (ou None)
+    """
+
+    def __init__(self, rotulos, indptr, indices, pesos=None):
+        self.rotulos = list(rotulos)
+        self.indptr = indptr
+        self.indices = indices
+        self.pesos = pesos
+
+    @property
+    def n(self):
+        return len(self.rotulos)
+
+    def grau(self):
+        return np.diff(self.indptr)
+
+    def vizinhos(self, i):
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    @classmethod
+    def de_arestas(cls, rotulos, origem, destino, pesos=None, simetrico=True):
+        """
+        Constrói o CSR a partir de arrays de índices das pontas de cada aresta.
+
+        Parâmetros:
+        - rotulos: lista de rótulos dos nós (índice = posição)
+        - origem, destino: arrays de inteiros com as pontas de cada aresta
+        - pesos: array opcional com o peso de cada aresta
+        - simetrico: se False, guarda só a entrada origem -> destino (adjacência de saída)
+        """
+        n = len(rotulos)
+        origem = np.asarray(origem, dtype=np.int64)
+        destino = np.asarray(destino, dtype=np.int64)
+
+        sem_laco = origem != destino
+        origem, destino = origem[sem_laco], destino[sem_laco]
+
+        if simetrico:
+            linhas = np.concatenate([origem, destino])
+            colunas = np.concatenate([destino, origem])
+        else:
+            linhas, colunas = origem, destino
+        ordem = np.argsort(linhas, kind='stable')
+
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(linhas, minlength=n), out=indptr[1:])
+        indices = colunas[ordem]
+
+        pesos_csr = None
+        if pesos is not None:
+            pesos = np.asarray(pesos, dtype=np.float64)[sem_laco]
+            pesos_csr = (np.concatenate([pesos, pesos]) if simetrico else pesos)[ordem]
+
+        return cls(rotulos, indptr, indices, pesos_csr)
+
+    @classmethod
+    def de_networkx(cls, G, weight=None):
+        """Constrói o CSR a partir de um grafo NetworkX (Graph ou DiGraph)."""
+        rotulos = list(G.nodes)
+        indice = {no: i for i, no in enumerate(rotulos)}
+        arestas = list(G.edges(data=weight, default=1)) if weight else list(G.edges())
+        origem = np.fromiter((indice[e[0]] for e in arestas), dtype=np.int64, count=len(arestas))
+        destino = np.fromiter((indice[e[1]] for e in arestas), dtype=np.int64, count=len(arestas))
+        pesos = None
+        if weight:
+            pesos = np.fromiter((e[2] for e in arestas), dtype=np.float64, count=len(arestas))
+        return cls.de_arestas(rotulos, origem, destino, pesos)
+
+
+def decomposicao_kcore(grafo):
+    """
+    Calcula o número de core de cada nó com o algoritmo de Batagelj-Zaversnik
+    (ordenação por baldes), em O(V + E).
+
+    Parâmetros:
+    - grafo: GrafoCSR
+
+    Retorna:
+    - array numpy com o core de cada nó (mesma ordem de grafo.rotulos)
+    """
+    n = grafo.n
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    indptr = grafo.indptr.tolist()
+    indices = grafo.indices.tolist()
+    grau = grafo.grau().tolist()
+    max_grau = max(grau)
+
+    # Baldes: início de cada grau no vetor de nós ordenados
+    inicio_balde = [0] * (max_grau + 1)
+    for g in grau:
+        inicio_balde[g] += 1
+    acumulado = 0
+    for g in range(max_grau + 1):
+        quantidade = inicio_balde[g]
+        inicio_balde[g] = acumulado
+        acumulado += quantidade
+
+    ordem = [0] * n
+    posicao = [0] * n
+    proxima = inicio_balde[:]
+    for v in range(n):
+        posicao[v] = proxima[grau[v]]
+        ordem[posicao[v]] = v
+        proxima[grau[v]] += 1
+
+    for i in range(n):
+        v = ordem[i]
+        grau_v = grau[v]
+        for k in range(indptr[v], indptr[v + 1]):
+            u = indices[k]
+            grau_u = grau[u]
+            if grau_u > grau_v:
+                # Move u para o início do seu balde e encolhe o balde
+                pos_u = posicao[u]
+                pos_w = inicio_balde[grau_u]
+                w = ordem[pos_w]
+                if u != w:
+                    ordem[pos_u], ordem[pos_w] = w, u
+                    posicao[u], posicao[w] = pos_w, pos_u
+                inicio_balde[grau_u] += 1
+                grau[u] = grau_u - 1
+
+    return np.array(grau, dtype=np.int64)
+
+
+class NucleoIncremental:
+    """
+    Mantém os números de core de um grafo enquanto arestas são inseridas ou
+    removidas, sem recalcular a decomposição inteira.
+
+    Usa o algoritmo de travessia do subcore: ao inserir/remover (u, v), só os
+    nós com core K = min(core(u), core(v)) conectados a u/v por nós de core K
+    podem mudar, e mudam no máximo uma unidade.
+
+    A adjacência guarda multiplicidade, com a mesma convenção do GrafoCSR:
+    inserir (u, v) e (v, u) conta duas vezes, como no DiGraph do NetworkX.
+    """
+
+    def __init__(self, grafo=None, cores=None):
+        self.adj = {}
+        self.core = {}
+        if grafo is not None:
+            if cores is None:
+                cores = decomposicao_kcore(grafo)
+            indptr, indices = grafo.indptr.tolist(), grafo.indices.tolist()
+            for i, rotulo in enumerate(grafo.rotulos):
+                vizinhos = self.adj.setdefault(rotulo, {})
+                for k in range(indptr[i], indptr[i + 1]):
+                    r = grafo.rotulos[indices[k]]
+                    vizinhos[r] = vizinhos.get(r, 0) + 1
+                self.core[rotulo] = int(cores[i])
+
+    def adicionar_no(self, no):
+        if no not in self.adj:
+            self.adj[no] = {}
+            self.core[no] = 0
+
+    def _subcore(self, raizes, K):
+        # Nós de core K alcançáveis a partir das raízes passando só por nós de core K
+        visitados = set(raizes)
+        fila = deque(raizes)
+        while fila:
+            w = fila.popleft()
+            for x in self.adj[w]:
+                if x not in visitados and self.core[x] == K:
+                    visitados.add(x)
+                    fila.append(x)
+        return visitados
+
+    def inserir_aresta(self, u, v):
+        """Insere a aresta (u, v) e retorna o conjunto de nós cujo core aumentou."""
+        if u == v:
+            return set()
+        self.adicionar_no(u)
+        self.adicionar_no(v)
+        self.adj[u][v] = self.adj[u].get(v, 0) + 1
+        self.adj[v][u] = self.adj[v].get(u, 0) + 1
+
+        K = min(self.core[u], self.core[v])
+        candidatos = self._subcore([w for w in (u, v) if self.core[w] == K], K)
+
+        # cd: quantas entradas de vizinhos ainda podem sustentar core K + 1
+        cd = {}
+        for w in candidatos:
+            cd[w] = sum(m for x, m in self.adj[w].items() if self.core[x] >= K)
+
+        fila = deque(w for w in candidatos if cd[w] <= K)
+        removidos = set(fila)
+        while fila:
+            w = fila.popleft()
+            for x, m in self.adj[w].items():
+                if x in candidatos and x not in removidos:
+                    cd[x] -= m
+                    if cd[x] <= K:
+                        removidos.add(x)
+                        fila.append(x)
+
+        promovidos = candidatos - removidos
+        for w in promovidos:
+            self.core[w] = K + 1
+        return promovidos
+
+    def remover_aresta(self, u, v):
+        """Remove uma ocorrência da aresta (u, v) e retorna os nós cujo core diminuiu."""
+        if u == v or v not in self.adj.get(u, {}):
+            return set()
+        for a, b in ((u, v), (v, u)):
+            self.adj[a][b] -= 1
+            if self.adj[a][b] == 0:
+                del self.adj[a][b]
+
+        K = min(self.core[u], self.core[v])
+        if K == 0:
+            return set()
+        candidatos = self._subcore([w for w in (u, v) if self.core[w] == K], K)
+
+        # mcd: entradas de vizinhos com core >= K (suporte para continuar no K-core)
+        mcd = {}
+        for w in candidatos:
+            mcd[w] = sum(m for x, m in self.adj[w].items() if self.core[x] >= K)
+
+        fila = deque(w for w in candidatos if mcd[w] < K)
+        rebaixados = set(fila)
+        while fila:
+            w = fila.popleft()
+            for x, m in self.adj[w].items():
+                if x in candidatos and x not in rebaixados:
+                    mcd[x] -= m
+                    if mcd[x] < K:
+                        rebaixados.add(x)
+                        fila.append(x)
+
+        for w in rebaixados:
+            self.core[w] = K - 1
+        return rebaixados
+
+    def inserir_arestas(self, arestas):
+        alterados = set()
+        for u, v in arestas:
+            alterados |= self.inserir_aresta(u, v)
+        return alterados
+
+    def remover_arestas(self, arestas):
+        alterados = set()
+        for u, v in arestas:
+            alterados |= self.remover_aresta(u, v)
+        return alterados
@@ -0,0 +1,133 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from kcore import decomposicao_kcore
+
+# Acima deste número de nós a intermediação é estimada com amostragem de fontes
+LIMITE_BETWEENNESS_EXATO = 5000
+AMOSTRA_BETWEENNESS_PADRAO = 500
+
+
+def metrica_core(grafo, opcoes):
+    csr = grafo.csr()
+    return dict(zip(csr.rotulos, decomposicao_kcore(csr).tolist()))
+
+
+def metrica_grau(grafo, opcoes):
+    # Grau total (entrada + saída em grafos direcionados), como o "Grau" do Gephi
+    grau = np.bincount(grafo.origem, minlength=grafo.n_nos) + np.bincount(grafo.destino, minlength=grafo.n_nos)
+    return dict(zip(grafo.rotulos, grau.tolist()))
+
+
+def metrica_betweenness(grafo, opcoes):
+    # Brandes exato com as fontes divididas entre processos (ver betweenness.py)
+    from betweenness import betweenness_paralela
+
+    k = opcoes.get('amostra_betweenness')
+    if k is None and grafo.n_nos > LIMITE_BETWEENNESS_EXATO:
+        k = AMOSTRA_BETWEENNESS_PADRAO
+    return betweenness_paralela(grafo, ponderado=opcoes.get('betweenness_ponderada', False),
+                                workers=opcoes.get('workers'), k=k, seed=opcoes.get('seed', 42))
+
+
+def metrica_closeness(grafo, opcoes):
+    import networkx as nx
+
+    return nx.closeness_centrality(grafo.para_networkx())
+
+
+def metrica_pagerank(grafo, opcoes):
+    import networkx as nx
+
+    return nx.pagerank(grafo.para_networkx(), weight='weight')
+
+
+def metrica_eigenvector(grafo, opcoes):
+    import networkx as nx
+
+    # Iteração de potência (como no Gephi): funciona também em grafos desconexos
+    return nx.eigenvector_centrality(grafo.para_networkx(), max_iter=1000, weight='weight')
+
+
+# Registro das métricas: nome -> (função, tipo do atributo no GEXF, roda em processo separado)
+# A intermediação roda no processo principal porque já divide o trabalho entre workers
+METRICAS = {
+    'core': (metrica_core, 'integer', False),
+    'grau': (metrica_grau, 'integer', False),
+    'betweenness': (metrica_betweenness, 'double', False),
+    'closeness': (metrica_closeness, 'double', True),
+    'pagerank': (metrica_pagerank, 'double', True),
+    'eigenvector': (metrica_eigenvector, 'double', True),
+}
+
+
+def _executar_metrica(nome, grafo, opcoes):
+    # Executada no processo principal ou em um worker; devolve (valores, tempo, erro)
+    inicio = time.perf_counter()
+    try:
+        valores = METRICAS[nome][0](grafo, opcoes)
+        return valores, time.perf_counter() - inicio, None
+    except Exception as e:
+        return None, time.perf_counter() - inicio, str(e)
+
+
+def calcular_metricas(grafo, nomes, workers=None, opcoes=None):
+    """
+    Calcula várias métricas de nós sobre um grafo já carregado.
+
+    As métricas baratas (core, grau) rodam no processo principal; as caras
+    (centralidades) são distribuídas em processos separados, exceto a
+    intermediação, que usa os workers para dividir as fontes.
+
+    Parâmetros:
+    - grafo: GrafoCompacto (ver gexf_stream.ler_gexf_compacto)
+    - nomes: lista de métricas (chaves de METRICAS)
+    - workers: número de processos (padrão: número de CPUs); 1 roda tudo em sequência
+    - opcoes: dicionário com 'amostra_betweenness', 'betweenness_ponderada' e 'seed'
+
+    Retorna:
+    - valores: {metrica: {no: valor}} (apenas as que terminaram sem erro)
+    - tempos: lista de dicionários {'metrica', 'tempo_s', 'local', 'erro'}
+    """
+    opcoes = opcoes or {}
+    desconhecidas = [n for n in nomes if n not in METRICAS]
+    if desconhecidas:
+        raise ValueError(f"Métricas desconhecidas: {', '.join(desconhecidas)} "
+                         f"(disponíveis: {', '.join(METRICAS)})")
+
+    workers = workers or os.cpu_count() or 1
+    opcoes = {**opcoes, 'workers': workers}
+    caras = [n for n in nomes if METRICAS[n][2]] if workers > 1 else []
+    resultados = {}
+
+    pool = ProcessPoolExecutor(max_workers=min(workers, len(caras))) if caras else None
+    try:
+        futuros = {n: pool.submit(_executar_metrica, n, grafo, opcoes) for n in caras}
+        for nome in nomes:
+            if nome not in futuros:
+                resultados[nome] = (*_executar_metrica(nome, grafo, opcoes), 'principal')
+        for nome, futuro in futuros.items():
+            resultados[nome] = (*futuro.result(), 'worker')
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    valores, tempos = {}, []
+    for nome in nomes:
+        resultado, tempo, erro, local = resultados[nome]
+        if erro is None:
+            valores[nome] = resultado
+        tempos.append({'metrica': nome, 'tempo_s': tempo, 'local': local, 'erro': erro})
+    return valores, tempos
+
+
+def imprimir_tabela_tempos(tempos):
+    """Imprime o tempo gasto em cada métrica."""
+    print(f"\n{'Métrica':<14}{'Tempo (s)':>12}  {'Execução':<10}")
+    print("-" * 40)
+    for t in tempos:
+        situacao = f"erro: {t['erro']}" if t['erro'] else t['local']
+        print(f"{t['metrica']:<14}{t['tempo_s']:>12.3f}  {situacao}")
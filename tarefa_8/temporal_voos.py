@@ -0,0 +1,182 @@
+import numpy as np
+import pandas as pd
+
+from kcore import NucleoIncremental
+from grafo_voos import COLUNA_ORIGEM, COLUNA_DESTINO, COLUNA_TIPO_LINHA
+
+
+def _para_inteiro(valores):
+    # Datas viram nanossegundos; números ficam como estão
+    serie = pd.Series(valores)
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie.to_numpy(dtype='datetime64[ns]').astype(np.int64), True
+    return serie.to_numpy(dtype=np.int64), False
+
+
+class GrafoTemporal:
+    """
+    Arestas com carimbo de tempo guardadas em arrays ordenados pelo tempo:
+    uma entrada por (tempo, origem, destino) com o número de voos. Laços
+    (origem == destino) são descartados, como em kcore.GrafoCSR.
+
+    Uma janela [inicio, fim) é localizada com np.searchsorted e devolvida como
+    fatias (visões) dos arrays, sem cópia.
+
+    Atributos:
+    - rotulos: códigos ICAO (índice = posição)
+    - tempo, origem, destino, voos: arrays ordenados por tempo
+    - temporal_data: True se o tempo veio de datas (guardado em nanossegundos)
+    """
+
+    def __init__(self, rotulos, tempo, origem, destino, voos, temporal_data=False):
+        tempo, origem, destino, voos = (np.asarray(x, dtype=np.int64) for x in (tempo, origem, destino, voos))
+        sem_laco = origem != destino
+        ordem = np.flatnonzero(sem_laco)[np.argsort(tempo[sem_laco], kind='stable')]
+        self.rotulos = list(rotulos)
+        self.tempo = tempo[ordem]
+        self.origem = origem[ordem]
+        self.destino = destino[ordem]
+        self.voos = voos[ordem]
+        self.temporal_data = temporal_data
+
+    @classmethod
+    def de_voos(cls, voos, coluna_tempo='mes', apenas_nacionais=True):
+        """
+        Constrói o grafo temporal a partir da tabela de voos (ver
+        ingestao_voos.carregar_voos), contando os voos por (tempo, origem, destino).
+
+        Parâmetros:
+        - voos: DataFrame com origem, destino e a coluna de tempo
+        - coluna_tempo: 'mes' (padrão) ou uma coluna de datas, como 'Partida Prevista'
+        - apenas_nacionais: mantém só os voos com 'Código Tipo Linha' == 'N'
+        """
+        if apenas_nacionais and COLUNA_TIPO_LINHA in voos.columns:
+            voos = voos[voos[COLUNA_TIPO_LINHA] == 'N']
+
+        contagem = (
+            voos.groupby([coluna_tempo, COLUNA_ORIGEM, COLUNA_DESTINO], sort=False, observed=True)
+            .size()
+            .reset_index(name='voos')
+        )
+        codigos, rotulos = pd.factorize(
+            pd.concat([contagem[COLUNA_ORIGEM].astype(object), contagem[COLUNA_DESTINO].astype(object)],
+                      ignore_index=True)
+        )
+        n = len(contagem)
+        tempo, temporal_data = _para_inteiro(contagem[coluna_tempo])
+        return cls(rotulos.tolist(), tempo, codigos[:n], codigos[n:], contagem['voos'].to_numpy(),
+                   temporal_data)
+
+    def _limites(self, inicio, fim):
+        return (int(np.searchsorted(self.tempo, inicio, side='left')),
+                int(np.searchsorted(self.tempo, fim, side='left')))
+
+    def janela(self, inicio, fim):
+        """Visões (origem, destino, voos) das arestas com inicio <= tempo < fim."""
+        a, b = self._limites(inicio, fim)
+        return self.origem[a:b], self.destino[a:b], self.voos[a:b]
+
+    def _janelas(self, tamanho, passo, inicio=None, fim=None):
+        inicio = self.tempo[0] if inicio is None else inicio
+        fim = self.tempo[-1] + 1 if fim is None else fim
+        t = inicio
+        while t < fim:
+            yield t, t + tamanho
+            t += passo
+
+    def serie_temporal(self, tamanho=1, passo=1, inicio=None, fim=None):
+        """
+        Percorre janelas deslizantes [t, t + tamanho) com passo `passo` e calcula,
+        para cada uma, grau e core de cada aeroporto ativo, além de indicadores
+        de conectividade.
+
+        Grau e core são mantidos incrementalmente: ao mover a janela, só as rotas
+        que entram ou saem são inseridas/removidas no NucleoIncremental (kcore.py).
+        Uma rota (origem, destino) fica ativa enquanto houver voo nela dentro da
+        janela; o grau e o core seguem a convenção do core_calc (entrada + saída).
+
+        Parâmetros:
+        - tamanho, passo: na unidade da coluna de tempo (meses para 'mes'); para
+          datas, aceitam pd.Timedelta ou texto como '7D'
+        - inicio, fim: limites opcionais da série
+
+        Retorna:
+        - por_no: DataFrame (janela_inicio, janela_fim, aeroporto, grau, core)
+        - por_janela: DataFrame com nos_ativos, rotas, voos, componentes,
+          maior_componente e core_max de cada janela
+        """
+        from scipy.sparse import coo_matrix
+        from scipy.sparse.csgraph import connected_components
+
+        if len(self.tempo) == 0:
+            return pd.DataFrame(), pd.DataFrame()
+
+        if self.temporal_data:
+            tamanho, passo = pd.Timedelta(tamanho).value, pd.Timedelta(passo).value
+            inicio = pd.Timestamp(inicio).value if inicio is not None else None
+            fim = pd.Timestamp(fim).value if fim is not None else None
+
+        nucleo = NucleoIncremental()
+        ativas = {}  # (origem, destino) -> número de entradas de tempo na janela
+        a_atual = b_atual = None
+        linhas_no, linhas_janela = [], []
+        n = len(self.rotulos)
+
+        for t_ini, t_fim in self._janelas(tamanho, passo, inicio, fim):
+            a, b = self._limites(t_ini, t_fim)
+            if a_atual is None:
+                entram, saem = range(a, b), range(0)
+            else:
+                entram = range(max(b_atual, a), b)
+                saem = range(a_atual, min(a, b_atual))
+                if a >= b_atual:
+                    # Janelas sem sobreposição: sai tudo da anterior
+                    saem = range(a_atual, b_atual)
+                    entram = range(a, b)
+
+            for k in saem:
+                par = (int(self.origem[k]), int(self.destino[k]))
+                ativas[par] -= 1
+                if ativas[par] == 0:
+                    del ativas[par]
+                    nucleo.remover_aresta(*par)
+            for k in entram:
+                par = (int(self.origem[k]), int(self.destino[k]))
+                ativas[par] = ativas.get(par, 0) + 1
+                if ativas[par] == 1:
+                    nucleo.inserir_aresta(*par)
+            a_atual, b_atual = a, b
+
+            voos = self.voos[a:b]
+            if len(ativas):
+                pares = np.array(list(ativas), dtype=np.int64)
+                matriz = coo_matrix((np.ones(len(pares)), (pares[:, 0], pares[:, 1])), shape=(n, n))
+                _, rotulos_comp = connected_components(matriz, directed=True, connection='weak')
+                ativos = np.unique(pares)
+                tamanhos = np.bincount(rotulos_comp[ativos])
+                tamanhos = tamanhos[tamanhos > 0]
+            else:
+                ativos, tamanhos = np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+
+            inicio_rotulo = pd.Timestamp(t_ini) if self.temporal_data else t_ini
+            fim_rotulo = pd.Timestamp(t_fim) if self.temporal_data else t_fim
+            core_max = 0
+            for no in ativos.tolist():
+                grau = sum(nucleo.adj[no].values())
+                core = nucleo.core[no]
+                core_max = max(core_max, core)
+                linhas_no.append((inicio_rotulo, fim_rotulo, self.rotulos[no], grau, core))
+
+            linhas_janela.append({
+                'janela_inicio': inicio_rotulo,
+                'janela_fim': fim_rotulo,
+                'nos_ativos': len(ativos),
+                'rotas': len(ativas),
+                'voos': int(voos.sum()),
+                'componentes': len(tamanhos),
+                'maior_componente': int(tamanhos.max()) if len(tamanhos) else 0,
+                'core_max': core_max,
+            })
+
+        por_no = pd.DataFrame(linhas_no, columns=['janela_inicio', 'janela_fim', 'aeroporto', 'grau', 'core'])
+        return por_no, pd.DataFrame(linhas_janela)